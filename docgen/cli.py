@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
 from typing import Optional
 
@@ -18,7 +19,11 @@ except ImportError:  # pragma: no cover - optional UX
 from .config import DocGenConfig, default_config, load_config, resolve_config_path, write_config
 from .errors import ConfigError, DocGenError, ExitCode, UsageError
 from .logging import get_logger, setup_logging
+from .services.batch_service import BatchOptions, RepoResult, build_all, read_repos_file, write_report
 from .services.build_service import build_docs
+from .services.catalog_service import build_catalog
+from .services.revision_service import build_revision
+from .services.check_service import check_docs
 from .services.scan_service import scan_repo
 from .utils.paths import resolve_repo_path
 
@@ -128,6 +133,13 @@ def _resolve_config(repo_path: Path, config_path: Optional[Path]) -> DocGenConfi
     return load_config(repo_path, config_path, require_exists=require_exists)
 
 
+def _split_csv(value: Optional[str]) -> list[str] | None:
+    if not value:
+        return None
+    items = [item.strip() for item in value.split(",") if item.strip()]
+    return items or None
+
+
 @app.command()
 def init(
     repo: Optional[Path] = typer.Option(None, "--repo", "-r", help="Repository path"),
@@ -249,15 +261,55 @@ def build(
     repo: Optional[Path] = typer.Option(None, "--repo", "-r", help="Repository path"),
     config: Optional[Path] = typer.Option(None, "--config", "-c", help="Config file path"),
     dry_run: bool = typer.Option(False, "--dry-run", help="Do not write files"),
-    force: bool = typer.Option(False, "--force", help="Overwrite existing files"),
+    force: bool = typer.Option(
+        False, "--force", help="Overwrite existing files and skip the up-to-date check"
+    ),
     doxygen: bool = typer.Option(False, "--doxygen", help="Run Doxygen if Doxyfile exists"),
+    doxygen_shards: int = typer.Option(
+        1,
+        "--doxygen-shards",
+        min=1,
+        help="Split the Doxygen run by top-level component over N parallel processes",
+    ),
+    sections: Optional[str] = typer.Option(
+        None,
+        "--sections",
+        help="Only re-render these sections, e.g. readme.commands,architecture.overview",
+    ),
+    rev: Optional[str] = typer.Option(
+        None, "--rev", help="Build the docs of this git revision (no checkout); requires --out"
+    ),
+    out: Optional[Path] = typer.Option(None, "--out", "-o", help="Output directory for --rev"),
 ) -> None:
     """Build documentation."""
     try:
         repo_path = resolve_repo_path(repo)
-        config_data = _resolve_config(repo_path, config)
-
-        plan = build_docs(repo_path, config_data, dry_run=dry_run, force=force, doxygen=doxygen)
+        only_sections = _split_csv(sections)
+        if rev is not None or out is not None:
+            if rev is None or out is None:
+                raise UsageError("--rev and --out must be used together")
+            if doxygen:
+                raise UsageError("--doxygen cannot be combined with --rev")
+            plan = build_revision(
+                repo_path,
+                rev,
+                out.expanduser().resolve(),
+                config_path=config.expanduser().resolve() if config else None,
+                dry_run=dry_run,
+                force=force,
+                only_sections=only_sections,
+            )
+        else:
+            config_data = _resolve_config(repo_path, config)
+            plan = build_docs(
+                repo_path,
+                config_data,
+                dry_run=dry_run,
+                force=force,
+                doxygen=doxygen,
+                only_sections=only_sections,
+                doxygen_shards=doxygen_shards,
+            )
 
         if dry_run:
             typer.echo("Dry run. Files that would be generated:")
@@ -270,6 +322,8 @@ def build(
                 typer.echo(f"- {rel}")
             except ValueError:
                 typer.echo(f"- {path}")
+        if plan.up_to_date:
+            typer.echo("Up to date: nothing changed since the last build (use --force to rebuild).")
         typer.echo("Sections:")
         for target in plan.targets:
             report = plan.reports.get(target)
@@ -287,10 +341,138 @@ def build(
                 typer.echo(f"  - replaced: {', '.join(report.replaced)}")
             if report.unchanged:
                 typer.echo(f"  - unchanged: {', '.join(report.unchanged)}")
+            if report.skipped:
+                typer.echo(f"  - skipped (inputs unchanged): {', '.join(report.skipped)}")
+            if report.untouched:
+                typer.echo("  - untouched (content identical, not rewritten)")
+        if plan.module_pages:
+            pages = plan.module_pages
+            typer.echo(
+                f"Module pages: {len(pages.written)} written, {len(pages.unchanged)} unchanged, "
+                f"{len(pages.removed)} removed"
+            )
         if doxygen:
             if plan.doxygen_would_run and plan.doxygen_file:
                 typer.echo(f"Doxygen: would run using {plan.doxygen_file}")
             elif plan.doxygen_ran and plan.doxygen_file:
-                typer.echo(f"Doxygen: ran using {plan.doxygen_file}")
+                typer.echo(
+                    f"Doxygen: ran using {plan.doxygen_file} "
+                    f"({plan.doxygen_parsed_files} files parsed, {plan.doxygen_warnings} warnings)"
+                )
+            elif plan.doxygen_up_to_date:
+                typer.echo("Doxygen: up to date (inputs unchanged, not rerun)")
+    except Exception as exc:
+        _handle_error(exc)
+
+
+@app.command("build-all")
+def build_all_command(
+    repos_file: Path = typer.Option(..., "--repos-file", help="File listing one repository path per line"),
+    jobs: int = typer.Option(
+        os.cpu_count() or 1, "--jobs", "-j", min=1, help="Number of worker processes"
+    ),
+    config: Optional[Path] = typer.Option(
+        None, "--config", "-c", help="Config file for every repo (default: each repo's docgen.yaml)"
+    ),
+    report: Optional[Path] = typer.Option(None, "--report", help="Write the JSON report to this file"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Do not write files"),
+    force: bool = typer.Option(
+        False, "--force", help="Overwrite existing files and skip the up-to-date check"
+    ),
+    doxygen: bool = typer.Option(False, "--doxygen", help="Run Doxygen if Doxyfile exists"),
+    doxygen_shards: int = typer.Option(
+        1,
+        "--doxygen-shards",
+        min=1,
+        help="Split the Doxygen run by top-level component over N parallel processes",
+    ),
+) -> None:
+    """Build documentation for many repositories through a pool of warm workers."""
+    try:
+        repos = read_repos_file(repos_file.expanduser().resolve())
+        options = BatchOptions(
+            config_path=config.expanduser().resolve() if config else None,
+            dry_run=dry_run,
+            force=force,
+            doxygen=doxygen,
+            doxygen_shards=doxygen_shards,
+        )
+
+        def progress(result: RepoResult) -> None:
+            if result.ok:
+                state = "up to date" if result.up_to_date else "built"
+                typer.echo(f"- {result.repo}: {state} ({result.seconds:.2f}s)")
+            else:
+                typer.echo(f"- {result.repo}: FAILED ({result.error})")
+
+        batch = build_all(repos, options, jobs=jobs, progress=progress)
+        if report is not None:
+            write_report(report, batch)
     except Exception as exc:
         _handle_error(exc)
+        return
+
+    failed = len(batch.failed)
+    typer.echo(
+        f"{len(batch.results) - failed} succeeded, {failed} failed "
+        f"in {batch.seconds:.2f}s ({batch.jobs} jobs)"
+    )
+    if failed:
+        raise typer.Exit(code=ExitCode.BATCH)
+
+
+@app.command()
+def catalog(
+    repos_file: Path = typer.Option(..., "--repos-file", help="File listing one repository path per line"),
+    out: Path = typer.Option(Path("catalog"), "--out", "-o", help="Output directory"),
+    format: str = typer.Option("md", "--format", "-f", help="Catalog format: md|html"),
+    sort: str = typer.Option("name", "--sort", help="Sort repositories by: name|lines|stacks"),
+) -> None:
+    """Merge the scans of many built repositories into one catalog page."""
+    try:
+        repos = read_repos_file(repos_file.expanduser().resolve())
+        report = build_catalog(repos, out.expanduser().resolve(), fmt=format.lower().strip(), sort=sort)
+    except Exception as exc:
+        _handle_error(exc)
+        return
+
+    for path in report.outputs:
+        typer.echo(f"Written: {path}")
+    typer.echo(
+        f"{len(report.entries)} repos ({report.reread} read, {report.reused} unchanged), "
+        f"{len(report.missing)} without generated docs"
+    )
+
+
+@app.command()
+def check(
+    repo: Optional[Path] = typer.Option(None, "--repo", "-r", help="Repository path"),
+    config: Optional[Path] = typer.Option(None, "--config", "-c", help="Config file path"),
+    fail_fast: bool = typer.Option(False, "--fail-fast", help="Stop at the first stale section"),
+) -> None:
+    """Check that generated documentation is up to date (never writes)."""
+    try:
+        repo_path = resolve_repo_path(repo)
+        config_data = _resolve_config(repo_path, config)
+
+        report = check_docs(repo_path, config_data, fail_fast=fail_fast)
+    except Exception as exc:
+        _handle_error(exc)
+        return
+
+    if report.up_to_date:
+        typer.echo("Documentation is up to date.")
+        return
+
+    typer.echo("Stale documentation:")
+    for item in report.stale:
+        try:
+            label = item.target.relative_to(repo_path).as_posix()
+        except ValueError:
+            label = item.target.as_posix()
+        if item.section:
+            typer.echo(f"- {label}: {item.section} ({item.reason})")
+        else:
+            typer.echo(f"- {label} ({item.reason})")
+    typer.echo("Run `docgen build` to update.")
+    raise typer.Exit(code=ExitCode.STALE)
@@ -15,6 +15,11 @@ DEFAULT_EXCLUDE = [".git/", "node_modules/", "dist/", "build/"]
 DEFAULT_README_TARGET = "output"
 DEFAULT_ENABLE_GITHUB_PAGES = True
 DEFAULT_ENABLE_DOXYGEN_BLOCK: str | bool = "auto"
+DEFAULT_MODULE_PAGES = False
+DEFAULT_DOXYGEN_TIMEOUT = 0
+DEFAULT_DOXYGEN_API_INDEX = False
+DEFAULT_WORKSPACE = False
+DEFAULT_GIT_INCREMENTAL = False
 
 
 @dataclass(frozen=True)
@@ -24,6 +29,11 @@ class DocGenConfig:
     readme_target: str = DEFAULT_README_TARGET
     enable_github_pages: bool = DEFAULT_ENABLE_GITHUB_PAGES
     enable_doxygen_block: str | bool = DEFAULT_ENABLE_DOXYGEN_BLOCK
+    module_pages: bool = DEFAULT_MODULE_PAGES
+    doxygen_timeout: float = DEFAULT_DOXYGEN_TIMEOUT
+    doxygen_api_index: bool = DEFAULT_DOXYGEN_API_INDEX
+    workspace: bool = DEFAULT_WORKSPACE
+    git_incremental: bool = DEFAULT_GIT_INCREMENTAL
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -32,6 +42,11 @@ class DocGenConfig:
             "readme_target": self.readme_target,
             "enable_github_pages": self.enable_github_pages,
             "enable_doxygen_block": self.enable_doxygen_block,
+            "module_pages": self.module_pages,
+            "doxygen_timeout": self.doxygen_timeout,
+            "doxygen_api_index": self.doxygen_api_index,
+            "workspace": self.workspace,
+            "git_incremental": self.git_incremental,
         }
 
 
@@ -73,6 +88,11 @@ def validate_config(data: dict[str, Any]) -> DocGenConfig:
         "readme_target",
         "enable_github_pages",
         "enable_doxygen_block",
+        "module_pages",
+        "doxygen_timeout",
+        "doxygen_api_index",
+        "workspace",
+        "git_incremental",
     }
     unknown = set(data.keys()) - allowed_keys
     if unknown:
@@ -103,12 +123,37 @@ def validate_config(data: dict[str, Any]) -> DocGenConfig:
     elif not isinstance(enable_doxygen_block, bool):
         raise ConfigError("enable_doxygen_block must be 'auto', true, or false")
 
+    module_pages = data.get("module_pages", DEFAULT_MODULE_PAGES)
+    if not isinstance(module_pages, bool):
+        raise ConfigError("module_pages must be a boolean")
+
+    doxygen_timeout = data.get("doxygen_timeout", DEFAULT_DOXYGEN_TIMEOUT)
+    if isinstance(doxygen_timeout, bool) or not isinstance(doxygen_timeout, (int, float)) or doxygen_timeout < 0:
+        raise ConfigError("doxygen_timeout must be a number of seconds >= 0 (0 = no limit)")
+
+    doxygen_api_index = data.get("doxygen_api_index", DEFAULT_DOXYGEN_API_INDEX)
+    if not isinstance(doxygen_api_index, bool):
+        raise ConfigError("doxygen_api_index must be a boolean")
+
+    workspace = data.get("workspace", DEFAULT_WORKSPACE)
+    if not isinstance(workspace, bool):
+        raise ConfigError("workspace must be a boolean")
+
+    git_incremental = data.get("git_incremental", DEFAULT_GIT_INCREMENTAL)
+    if not isinstance(git_incremental, bool):
+        raise ConfigError("git_incremental must be a boolean")
+
     return DocGenConfig(
         output_dir=output_dir,
         exclude=list(exclude),
         readme_target=readme_target,
         enable_github_pages=enable_github_pages,
         enable_doxygen_block=enable_doxygen_block,
+        module_pages=module_pages,
+        doxygen_timeout=doxygen_timeout,
+        doxygen_api_index=doxygen_api_index,
+        workspace=workspace,
+        git_incremental=git_incremental,
     )
 
 
@@ -8,6 +8,8 @@ class ExitCode:
     IO = 3
     USAGE = 4
     UNEXPECTED = 5
+    STALE = 6
+    BATCH = 7
 
 
 class DocGenError(Exception):
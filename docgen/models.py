@@ -69,6 +69,52 @@ class DocsInfo:
         }
 
 
+@dataclass(frozen=True)
+class PackageInfo:
+    """One package of a workspace (monorepo), scanned on its own."""
+
+    path: str
+    name: str
+    stacks: list[StackInfo]
+    commands: Commands
+    file_count: int = 0
+    package_manager: str | None = None
+    python_tooling: str | None = None
+    warnings: list[str] = field(default_factory=list)
+    # Declared dependencies: names, and directories (repo-relative) of path deps.
+    dependencies: list[str] = field(default_factory=list)
+    path_dependencies: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "path": self.path,
+            "name": self.name,
+            "stacks": [stack.to_dict() for stack in self.stacks],
+            "commands": self.commands.to_dict(),
+            "file_count": self.file_count,
+            "package_manager": self.package_manager,
+            "python_tooling": self.python_tooling,
+            "warnings": list(self.warnings),
+            "dependencies": list(self.dependencies),
+            "path_dependencies": list(self.path_dependencies),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "PackageInfo":
+        return cls(
+            path=data["path"],
+            name=data["name"],
+            stacks=[StackInfo(**stack) for stack in data.get("stacks", [])],
+            commands=Commands(**data.get("commands", {})),
+            file_count=data.get("file_count", 0),
+            package_manager=data.get("package_manager"),
+            python_tooling=data.get("python_tooling"),
+            warnings=list(data.get("warnings", [])),
+            dependencies=list(data.get("dependencies", [])),
+            path_dependencies=list(data.get("path_dependencies", [])),
+        )
+
+
 @dataclass(frozen=True)
 class ProjectInfo:
     project_name: str
@@ -81,6 +127,7 @@ class ProjectInfo:
     package_manager: str | None = None
     python_tooling: str | None = None
     warnings: list[str] = field(default_factory=list)
+    packages: list[PackageInfo] = field(default_factory=list)
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -94,6 +141,7 @@ class ProjectInfo:
             "package_manager": self.package_manager,
             "python_tooling": self.python_tooling,
             "warnings": list(self.warnings),
+            "packages": [package.to_dict() for package in self.packages],
         }
 
     def to_json(self) -> str:
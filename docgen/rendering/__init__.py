@@ -2,18 +2,33 @@
 
 from __future__ import annotations
 
+from collections import ChainMap
+from functools import lru_cache
+import hashlib
+import os
 from pathlib import Path
-from typing import Any
+import secrets
+import stat
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, Mapping
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, select_autoescape
 
 from ..errors import DocGenIOError
+from ..utils.cache import cache_dir
+from ..utils.fingerprint import file_fingerprint, text_fingerprint
 
 
 def _template_dir() -> Path:
     return Path(__file__).parent.parent / "templates"
 
 
+def _bytecode_cache() -> FileSystemBytecodeCache | None:
+    directory = cache_dir("jinja")
+    if directory is None:
+        return None
+    return FileSystemBytecodeCache(str(directory))
+
+
 def create_environment() -> Environment:
     loader = FileSystemLoader(str(_template_dir()))
     return Environment(
@@ -21,13 +36,79 @@ def create_environment() -> Environment:
         autoescape=select_autoescape(enabled_extensions=()),
         trim_blocks=True,
         lstrip_blocks=True,
+        bytecode_cache=_bytecode_cache(),
     )
 
 
-def render_template(name: str, context: dict[str, Any]) -> str:
-    env = create_environment()
-    template = env.get_template(name)
-    return template.render(**context).strip() + "\n"
+@lru_cache(maxsize=1)
+def get_environment() -> Environment:
+    """Return the process-wide environment; compiled templates stay cached on it."""
+    return create_environment()
+
+
+def warm_environment() -> Environment:
+    """Compile every bundled template once (e.g. before forking worker processes)."""
+    environment = get_environment()
+    for path in sorted(_template_dir().glob("*.j2")):
+        environment.get_template(path.name)
+    return environment
+
+
+def template_fingerprints() -> dict[str, str]:
+    """Hash every bundled template so cached builds notice template edits."""
+    return {
+        path.name: text_fingerprint(path.read_text(encoding="utf-8"))
+        for path in sorted(_template_dir().glob("*.j2"))
+    }
+
+
+def render_template(name: str, context: Mapping[str, Any]) -> str:
+    template = get_environment().get_template(name)
+    return render_lazily(template, context).strip() + "\n"
+
+
+def stream_template(name: str, context: Mapping[str, Any]) -> Iterator[str]:
+    """Yield the output of :func:`render_template` chunk by chunk.
+
+    Leading and trailing whitespace is trimmed on the fly (only a run of
+    trailing whitespace is ever held back), so the full document is never
+    built in memory.
+    """
+    template = get_environment().get_template(name)
+    started = False
+    pending = ""
+    for chunk in generate_lazily(template, context):
+        if not started:
+            chunk = chunk.lstrip()
+            if not chunk:
+                continue
+            started = True
+        body = chunk.rstrip()
+        if body:
+            yield pending + body
+            pending = chunk[len(body):]
+        else:
+            pending += chunk
+    yield "\n"
+
+
+def render_lazily(template: Template, context: Mapping[str, Any]) -> str:
+    """Render without copying ``context``, so lazy mappings are only read on use.
+
+    ``Template.render`` builds a dict from its arguments, which would force
+    every value of a lazy mapping up front.
+    """
+    return template.environment.concat(generate_lazily(template, context))  # type: ignore[arg-type]
+
+
+def generate_lazily(template: Template, context: Mapping[str, Any]) -> Iterator[str]:
+    """Like ``Template.generate`` but without copying ``context``."""
+    env = template.environment
+    ctx = template.new_context(ChainMap(context, template.globals), shared=True)  # type: ignore[arg-type]
+    try:
+        yield from template.root_render_func(ctx)
+    except Exception:
+        yield env.handle_exception()
 
 
 def write_text(path: Path, content: str) -> None:
@@ -36,3 +117,91 @@ def write_text(path: Path, content: str) -> None:
         path.write_text(content, encoding="utf-8")
     except OSError as exc:
         raise DocGenIOError(f"Failed to write file: {path}") from exc
+
+
+def content_matches(path: Path, content: str) -> bool:
+    """Return True if ``path`` already holds exactly ``content``."""
+    data = content.encode("utf-8")
+    try:
+        if path.stat().st_size != len(data):
+            return False
+        return path.read_bytes() == data
+    except OSError:
+        return False
+
+
+def write_text_atomic(path: Path, content: str) -> bool:
+    """Write ``content`` via a temp file and ``os.replace``.
+
+    Returns False without touching the file (or its mtime) when the content on
+    disk is already identical.
+    """
+    if content_matches(path, content):
+        return False
+    data = content.encode("utf-8")
+    _replace_atomic(path, lambda handle: handle.write(data))
+    return True
+
+
+def write_stream_atomic(path: Path, chunks: Iterable[str]) -> tuple[bool, str]:
+    """Stream ``chunks`` to a temp file, then ``os.replace`` it over ``path``.
+
+    Returns whether ``path`` was written and the SHA-256 of the content. An
+    identical file on disk is left alone (and keeps its mtime).
+    """
+    digest = hashlib.sha256()
+    size = 0
+
+    def write(handle: BinaryIO) -> None:
+        nonlocal size
+        for chunk in chunks:
+            data = chunk.encode("utf-8")
+            digest.update(data)
+            size += len(data)
+            handle.write(data)
+
+    def unchanged() -> bool:
+        try:
+            return path.stat().st_size == size and file_fingerprint(path) == digest.hexdigest()
+        except OSError:
+            return False
+
+    written = _replace_atomic(path, write, unchanged)
+    return written, digest.hexdigest()
+
+
+def _replace_atomic(
+    path: Path,
+    write: Callable[[BinaryIO], Any],
+    unchanged: Callable[[], bool] | None = None,
+) -> bool:
+    """Fill a temp file next to ``path`` with ``write`` and move it into place.
+
+    When ``unchanged`` returns True once the temp file is complete, it is
+    discarded instead and False is returned.
+    """
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.{secrets.token_hex(4)}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        with os.fdopen(fd, "wb") as handle:
+            write(handle)
+            handle.flush()
+            os.fsync(handle.fileno())
+        if unchanged is not None and unchanged():
+            temp_path.unlink()
+            return False
+        try:
+            os.chmod(temp_path, stat.S_IMODE(path.stat().st_mode))
+        except FileNotFoundError:
+            pass
+        os.replace(temp_path, path)
+    except BaseException as exc:
+        try:
+            temp_path.unlink()
+        except OSError:
+            pass
+        if isinstance(exc, OSError):
+            raise DocGenIOError(f"Failed to write file: {path}") from exc
+        raise
+    return True
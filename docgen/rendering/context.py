@@ -0,0 +1,91 @@
+"""Lazily computed template context."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import threading
+from typing import Any, Callable, Iterable, Iterator, Mapping
+
+
+@dataclass
+class _Facet:
+    name: str
+    keys: tuple[str, ...]
+    loader: Callable[[], dict[str, Any]]
+    token: Callable[[], str] | None = None
+    token_value: str | None = None
+    loaded: bool = False
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class LazyContext(Mapping[str, Any]):
+    """Template context whose expensive facets are computed on first access.
+
+    ``in``, iteration and ``len`` never trigger a facet; only reading a value
+    does. A facet may also provide a cheap ``token`` (e.g. a fingerprint of its
+    input files) so callers can detect changes without computing it.
+    """
+
+    def __init__(self, values: dict[str, Any] | None = None) -> None:
+        self._values: dict[str, Any] = dict(values or {})
+        self._facets: dict[str, _Facet] = {}
+        self._lock = threading.RLock()
+
+    def add_facet(
+        self,
+        name: str,
+        keys: Iterable[str],
+        loader: Callable[[], dict[str, Any]],
+        token: Callable[[], str] | None = None,
+    ) -> None:
+        facet = _Facet(name=name, keys=tuple(keys), loader=loader, token=token)
+        for key in facet.keys:
+            self._facets[key] = facet
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._values:
+            return self._values[key]
+        facet = self._facets.get(key)
+        if facet is None:
+            raise KeyError(key)
+        self._load(facet)
+        return self._values[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._values or key in self._facets
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._values
+        for key in self._facets:
+            if key not in self._values:
+                yield key
+
+    def __len__(self) -> int:
+        return len(self._values.keys() | self._facets.keys())
+
+    def is_loaded(self, name: str) -> bool:
+        """Return True once the facet called ``name`` has been computed."""
+        return any(facet.loaded for facet in self._facets.values() if facet.name == name)
+
+    def input_token(self, key: str) -> Any:
+        """Return a value that changes whenever ``key``'s value may change.
+
+        Uses the facet token when there is one, so the facet isn't computed.
+        """
+        facet = self._facets.get(key)
+        if facet is None or facet.token is None:
+            return self.get(key)
+        with self._lock:
+            if facet.token_value is None:
+                facet.token_value = facet.token()
+        return {"facet": facet.name, "token": facet.token_value}
+
+    def _load(self, facet: _Facet) -> None:
+        # One lock per facet: a slow loader doesn't hold up the others.
+        with facet.lock:
+            if facet.loaded:
+                return
+            values = facet.loader()
+            for key in facet.keys:
+                self._values[key] = values.get(key)
+            facet.loaded = True
@@ -3,18 +3,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+import hashlib
 import re
-from typing import Iterable
+from typing import Iterable, Iterator
 
 from ..errors import UsageError
 
 NAME_PATTERN = r"[a-zA-Z0-9_.-]+"
-START_RE = re.compile(rf"<!--\s*DOCGEN:START\s+({NAME_PATTERN})\s*-->")
-END_RE = re.compile(rf"<!--\s*DOCGEN:END\s+({NAME_PATTERN})\s*-->")
-SECTION_RE = re.compile(
-    rf"(?P<start><!--\s*DOCGEN:START\s+(?P<section>{NAME_PATTERN})\s*-->)"
-    rf"(?P<body>.*?)(?P<end><!--\s*DOCGEN:END\s+(?P=section)\s*-->)",
-    re.DOTALL,
+MARKER_RE = re.compile(
+    rf"<!--\s*DOCGEN:(?P<kind>START|END)\s+(?P<section>{NAME_PATTERN})\s*-->"
 )
 
 
@@ -37,75 +34,348 @@ class UpdateReport:
     unchanged: list[str]
 
 
-def extract_managed_sections(text: str) -> list[SectionBlock]:
-    sections: list[SectionBlock] = []
-    for match in SECTION_RE.finditer(text):
-        name = match.group("section")
-        sections.append(
+@dataclass(frozen=True)
+class ManagedDocument:
+    """A document split into literal text and managed section segments."""
+
+    segments: list[str | SectionBlock]
+    index: dict[str, int]
+
+    def find(self, name: str) -> tuple[int, SectionBlock] | None:
+        """Return the segment index and block of the first section ``name``."""
+        position = self.index.get(name)
+        if position is None:
+            return None
+        segment = self.segments[position]
+        assert isinstance(segment, SectionBlock)
+        return position, segment
+
+    @classmethod
+    def from_sections(cls, sections: Iterable[SectionBlock]) -> "ManagedDocument":
+        segments: list[str | SectionBlock] = []
+        index: dict[str, int] = {}
+        for section in sections:
+            index.setdefault(section.name, len(segments))
+            segments.append(section)
+        return cls(segments=segments, index=index)
+
+    @property
+    def sections(self) -> list[SectionBlock]:
+        return [segment for segment in self.segments if isinstance(segment, SectionBlock)]
+
+    def render(self, bodies: dict[int, str] | None = None) -> str:
+        """Join the segments, swapping in ``bodies`` keyed by segment index."""
+        bodies = bodies or {}
+        parts: list[str] = []
+        for position, segment in enumerate(self.segments):
+            if isinstance(segment, str):
+                parts.append(segment)
+                continue
+            parts.append(segment.start)
+            parts.append(bodies.get(position, segment.body))
+            parts.append(segment.end)
+        return "".join(parts)
+
+
+@dataclass(frozen=True)
+class Marker:
+    kind: str
+    name: str
+    text: str
+    start: int
+    end: int
+    line: int
+    column: int
+
+    @property
+    def location(self) -> str:
+        return f"line {self.line}, column {self.column}"
+
+
+@dataclass(frozen=True)
+class MarkerIssue:
+    line: int
+    column: int
+    message: str
+
+    def __str__(self) -> str:
+        return f"line {self.line}, column {self.column}: {self.message}"
+
+
+def scan_markers(text: str) -> list[Marker]:
+    """Find every START/END marker with its 1-based line and column.
+
+    Line numbers are advanced incrementally with ``str.count`` between
+    consecutive markers, so the whole scan stays linear in ``len(text)``.
+    """
+    markers: list[Marker] = []
+    line = 1
+    line_start = 0
+    offset = 0
+    for match in MARKER_RE.finditer(text):
+        position = match.start()
+        newlines = text.count("\n", offset, position)
+        if newlines:
+            line += newlines
+            line_start = text.rfind("\n", offset, position) + 1
+        offset = position
+        markers.append(
+            Marker(
+                kind=match.group("kind"),
+                name=match.group("section"),
+                text=match.group(0),
+                start=position,
+                end=match.end(),
+                line=line,
+                column=position - line_start + 1,
+            )
+        )
+    return markers
+
+
+def parse_document(text: str, markers: list[Marker] | None = None) -> ManagedDocument:
+    """Split ``text`` into literal and section segments.
+
+    A section runs from a START marker to the next END marker with the same
+    name; anything in between is body. A START without a matching END is
+    left as literal text. Pass ``markers`` from :func:`scan_markers` to reuse
+    an existing scan.
+    """
+    if markers is None:
+        markers = scan_markers(text)
+
+    # Index of the next END with the same name, computed in one backward pass.
+    closing: list[int | None] = [None] * len(markers)
+    next_end: dict[str, int] = {}
+    for position in range(len(markers) - 1, -1, -1):
+        marker = markers[position]
+        if marker.kind == "END":
+            next_end[marker.name] = position
+        else:
+            closing[position] = next_end.get(marker.name)
+
+    segments: list[str | SectionBlock] = []
+    index: dict[str, int] = {}
+    literal_start = 0
+    position = 0
+    while position < len(markers):
+        opened = markers[position]
+        close_at = closing[position]
+        if opened.kind != "START" or close_at is None:
+            position += 1
+            continue
+        closed = markers[close_at]
+        if opened.start > literal_start:
+            segments.append(text[literal_start : opened.start])
+        index.setdefault(opened.name, len(segments))
+        segments.append(
             SectionBlock(
-                name=name,
-                start=match.group("start"),
-                body=match.group("body"),
-                end=match.group("end"),
+                name=opened.name,
+                start=opened.text,
+                body=text[opened.end : closed.start],
+                end=closed.text,
             )
         )
-    return sections
+        literal_start = closed.end
+        position = close_at + 1
 
+    if literal_start < len(text):
+        segments.append(text[literal_start:])
+    return ManagedDocument(segments=segments, index=index)
 
-def validate_markers(text: str) -> None:
-    starts = START_RE.findall(text)
-    ends = END_RE.findall(text)
 
-    for name in set(starts + ends):
-        if starts.count(name) != ends.count(name):
-            raise UsageError(f"Marker mismatch for section: {name}")
-        if starts.count(name) > 1:
-            raise UsageError(f"Duplicate section markers found: {name}")
+def extract_managed_sections(text: str) -> list[SectionBlock]:
+    return parse_document(text).sections
+
+
+def find_marker_issues(markers: list[Marker]) -> list[MarkerIssue]:
+    """Check marker structure in one pass with a stack of open sections.
+
+    Reports unmatched START/END markers, sections nested inside another
+    section, interleaved sections (``A B /A /B``) and duplicate names.
+    """
+    issues: list[MarkerIssue] = []
+    stack: list[Marker] = []
+    first_seen: dict[str, Marker] = {}
+
+    def report(marker: Marker, message: str) -> None:
+        issues.append(MarkerIssue(marker.line, marker.column, message))
+
+    for marker in markers:
+        if marker.kind == "START":
+            previous = first_seen.get(marker.name)
+            if previous is not None:
+                report(
+                    marker,
+                    f"duplicate section '{marker.name}' (first started at {previous.location})",
+                )
+            else:
+                first_seen[marker.name] = marker
+            if stack:
+                report(
+                    marker,
+                    f"section '{marker.name}' is nested inside '{stack[-1].name}' "
+                    f"(started at {stack[-1].location})",
+                )
+            stack.append(marker)
+            continue
+
+        if stack and stack[-1].name == marker.name:
+            stack.pop()
+            continue
+        opened_at = next(
+            (depth for depth in range(len(stack) - 1, -1, -1) if stack[depth].name == marker.name),
+            None,
+        )
+        if opened_at is None:
+            report(marker, f"END for section '{marker.name}' has no matching START")
+            continue
+        report(
+            marker,
+            f"END for section '{marker.name}' interleaves with '{stack[-1].name}' "
+            f"(started at {stack[-1].location})",
+        )
+        del stack[opened_at]
+
+    for marker in stack:
+        report(marker, f"START for section '{marker.name}' is never closed")
+
+    return sorted(issues, key=lambda issue: (issue.line, issue.column))
+
+
+def validate_markers(text: str, markers: list[Marker] | None = None) -> None:
+    if markers is None:
+        markers = scan_markers(text)
+    issues = find_marker_issues(markers)
+    if issues:
+        details = "\n".join(f"- {issue}" for issue in issues)
+        raise UsageError(f"Invalid DOCGEN markers:\n{details}")
+
+
+def load_document(text: str) -> ManagedDocument:
+    """Scan, validate and parse ``text`` using a single marker scan."""
+    markers = scan_markers(text)
+    validate_markers(text, markers)
+    return parse_document(text, markers)
 
 
 def replace_section(text: str, section: SectionBlock) -> tuple[str, str]:
-    escaped = re.escape(section.name)
-    pattern = re.compile(
-        rf"(?P<start><!--\s*DOCGEN:START\s+{escaped}\s*-->)"
-        rf"(?P<body>.*?)(?P<end><!--\s*DOCGEN:END\s+{escaped}\s*-->)",
-        re.DOTALL,
-    )
-
-    match = pattern.search(text)
-    if not match:
+    document = parse_document(text)
+    found = document.find(section.name)
+    if found is None:
         return text, "missing"
-
-    existing_body = match.group("body")
-    new_body = _normalize_body(section.body)
-    if _normalize_body(existing_body) == new_body:
-        return text, "unchanged"
-    replacement = f"{match.group('start')}{new_body}{match.group('end')}"
-    return text[: match.start()] + replacement + text[match.end() :], "replaced"
+    position, existing = found
+    status, body = _merge_body(existing, section)
+    if status == "unchanged":
+        return text, status
+    return document.render({position: body}), status
+
+
+class SectionDigest:
+    """Fingerprint managed section bodies while text streams through.
+
+    Text is handled a line at a time, so markers must not span lines. Each
+    digest equals the SHA-256 of the body normalized by ``normalize_body``.
+    """
+
+    def __init__(self) -> None:
+        self.sections: list[tuple[str, str]] = []
+        self._partial = ""
+        self._name: str | None = None
+        self._hash = hashlib.sha256()
+        self._started = False
+        self._newlines = ""
+
+    def tee(self, chunks: Iterable[str]) -> Iterator[str]:
+        """Yield ``chunks`` unchanged, feeding each one to the digest."""
+        for chunk in chunks:
+            self.feed(chunk)
+            yield chunk
+        self.close()
+
+    def feed(self, chunk: str) -> None:
+        text = self._partial + chunk
+        cut = text.rfind("\n") + 1
+        self._partial = text[cut:]
+        if cut:
+            self._scan(text[:cut])
+
+    def close(self) -> None:
+        if self._partial:
+            self._scan(self._partial)
+            self._partial = ""
+
+    def _scan(self, text: str) -> None:
+        position = 0
+        for match in MARKER_RE.finditer(text):
+            if self._name is not None:
+                self._body(text[position:match.start()])
+            position = match.end()
+            kind, name = match.group("kind"), match.group("section")
+            if kind == "START" and self._name is None:
+                self._open(name)
+            elif kind == "END" and name == self._name:
+                self._hash.update(b"\n")
+                self.sections.append((name, self._hash.hexdigest()))
+                self._name = None
+        if self._name is not None:
+            self._body(text[position:])
+
+    def _open(self, name: str) -> None:
+        self._name = name
+        self._hash = hashlib.sha256(b"\n")
+        self._started = False
+        self._newlines = ""
+
+    def _body(self, text: str) -> None:
+        if not self._started:
+            text = text.lstrip("\n")
+            if not text:
+                return
+            self._started = True
+        core = text.rstrip("\n")
+        if core:
+            self._hash.update((self._newlines + core).encode("utf-8"))
+            self._newlines = text[len(core):]
+        else:
+            self._newlines += text
 
 
 def apply_all_sections(
     existing_text: str,
-    rendered_template: str,
+    rendered_template: str | ManagedDocument,
     file_role: str,
+    document: ManagedDocument | None = None,
 ) -> tuple[str, UpdateReport]:
-    validate_markers(existing_text)
-    template_sections = extract_managed_sections(rendered_template)
+    """Merge the template's sections into ``existing_text``.
+
+    ``document`` may carry an already validated parse of ``existing_text``.
+    """
+    if document is None:
+        document = load_document(existing_text)
+    if isinstance(rendered_template, ManagedDocument):
+        template_sections = rendered_template.sections
+    else:
+        template_sections = extract_managed_sections(rendered_template)
     report = UpdateReport(replaced=[], added=[], unchanged=[])
 
-    updated_text = existing_text
-    existing_names = {section.name for section in extract_managed_sections(existing_text)}
-
+    bodies: dict[int, str] = {}
     missing: list[SectionBlock] = []
     for section in template_sections:
-        if section.name not in existing_names:
+        found = document.find(section.name)
+        if found is None:
             missing.append(section)
             continue
-        updated_text, status = replace_section(updated_text, section)
+        position, existing = found
+        status, body = _merge_body(existing, section)
         if status == "replaced":
+            bodies[position] = body
             report.replaced.append(section.name)
-        elif status == "unchanged":
+        else:
             report.unchanged.append(section.name)
 
+    updated_text = document.render(bodies) if bodies else existing_text
+
     if missing:
         updated_text = _insert_sections(updated_text, missing, file_role)
         report.added.extend([section.name for section in missing])
@@ -113,6 +383,13 @@ def apply_all_sections(
     return updated_text, report
 
 
+def _merge_body(existing: SectionBlock, section: SectionBlock) -> tuple[str, str]:
+    new_body = normalize_body(section.body)
+    if normalize_body(existing.body) == new_body:
+        return "unchanged", existing.body
+    return "replaced", new_body
+
+
 def _insert_sections(text: str, sections: Iterable[SectionBlock], file_role: str) -> str:
     insertion_point = None
     if file_role == "readme":
@@ -149,7 +426,8 @@ def _after_front_matter_or_title(text: str) -> int | None:
     return _after_first_title(text)
 
 
-def _normalize_body(body: str) -> str:
+def normalize_body(body: str) -> str:
+    """Section body with its surrounding blank lines reduced to one newline each side."""
     return "\n" + body.strip("\n") + "\n"
 
 
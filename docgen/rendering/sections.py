@@ -0,0 +1,97 @@
+"""Per-section view of the bundled templates for incremental rendering."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+import re
+from typing import Any, Mapping
+
+from jinja2 import Template, meta
+from jinja2.exceptions import TemplateSyntaxError
+
+from . import get_environment, render_lazily
+from .context import LazyContext
+from .markers import SectionBlock, parse_document
+from ..utils.fingerprint import fingerprint, text_fingerprint
+
+# Optional explicit declaration inside a section: {# docgen:inputs stacks, commands #}
+INPUTS_RE = re.compile(r"\{#-?\s*docgen:inputs\s+(?P<names>[^#]*?)\s*-?#\}")
+
+
+@dataclass(frozen=True)
+class TemplateSection:
+    name: str
+    source: str
+    inputs: frozenset[str] | None
+
+    def fingerprint(self, context: Mapping[str, Any]) -> str:
+        """Fingerprint the section source and the context values it reads."""
+        return fingerprint(self.source, _input_values(self.inputs, context))
+
+
+@dataclass(frozen=True)
+class TemplateLayout:
+    name: str
+    source_hash: str
+    skeleton_inputs: frozenset[str] | None
+    sections: dict[str, TemplateSection]
+
+    def fingerprint(self, context: Mapping[str, Any]) -> str:
+        """Fingerprint the template outside its sections (which sections render)."""
+        return fingerprint(self.source_hash, _input_values(self.skeleton_inputs, context))
+
+
+def template_layout(name: str) -> TemplateLayout:
+    env = get_environment()
+    source, _, _ = env.loader.get_source(env, name)
+    return _layout(name, source)
+
+
+def render_section(section: TemplateSection, context: Mapping[str, Any]) -> SectionBlock:
+    rendered = render_lazily(_compile(section.source), context)
+    return parse_document(rendered).sections[0]
+
+
+def _input_values(keys: frozenset[str] | None, context: Mapping[str, Any]) -> dict[str, Any]:
+    """Collect the values (or cheap change tokens for lazy facets) of ``keys``."""
+    if keys is None:
+        keys = frozenset(context)
+    if isinstance(context, LazyContext):
+        return {key: context.input_token(key) for key in sorted(keys) if key in context}
+    return {key: context.get(key) for key in sorted(keys)}
+
+
+@lru_cache(maxsize=32)
+def _layout(name: str, source: str) -> TemplateLayout:
+    document = parse_document(source)
+    sections: dict[str, TemplateSection] = {}
+    for block in document.sections:
+        sections.setdefault(
+            block.name,
+            TemplateSection(name=block.name, source=block.block, inputs=_inputs(block.block)),
+        )
+    skeleton = "".join(segment for segment in document.segments if isinstance(segment, str))
+    return TemplateLayout(
+        name=name,
+        source_hash=text_fingerprint(source),
+        skeleton_inputs=_inputs(skeleton),
+        sections=sections,
+    )
+
+
+def _inputs(source: str) -> frozenset[str] | None:
+    """Return the context keys ``source`` reads, or None if they can't be inferred."""
+    declared = INPUTS_RE.search(source)
+    if declared:
+        names = re.split(r"[\s,]+", declared.group("names"))
+        return frozenset(name for name in names if name)
+    try:
+        return frozenset(meta.find_undeclared_variables(get_environment().parse(source)))
+    except TemplateSyntaxError:
+        return None
+
+
+@lru_cache(maxsize=128)
+def _compile(source: str) -> Template:
+    return get_environment().from_string(source)
@@ -0,0 +1,161 @@
+"""Compact API index built from Doxygen's XML output."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import re
+from typing import Any, Iterable, Iterator
+from xml.etree import ElementTree
+
+from ..errors import DocGenIOError
+from ..rendering import write_text_atomic
+from ..services.doxygen_service import doxygen_output_dir, doxygen_xml_dirs
+
+API_INDEX_CACHE = ".docgen-api-index.json"
+MAX_API_NAMESPACES = 30
+MAX_API_CLASSES = 20
+
+_CLASS_KINDS = frozenset({"class", "struct", "union", "interface", "protocol", "exception"})
+_NAMESPACE_KINDS = frozenset({"namespace", "package"})
+_SCOPE_RE = re.compile(r"::|\.")
+# Elements that only grow the tree once their compound has been counted.
+_BULKY = frozenset({"sectiondef", "listofallmembers", "programlisting", "inheritancegraph", "collaborationgraph"})
+
+
+def build_api_index(xml_dirs: Iterable[Path]) -> dict[str, Any]:
+    """Summarise namespaces and classes found in Doxygen XML directories.
+
+    Files are stream-parsed with ``iterparse`` and elements are cleared as
+    soon as they are counted, so memory stays bounded on huge outputs. Only
+    the compounds ``index.xml`` lists as classes or namespaces are opened.
+    """
+    namespaces: dict[str, dict[str, Any]] = {}
+    classes: list[dict[str, Any]] = []
+    for xml_dir in xml_dirs:
+        for refid in _compound_refids(xml_dir / "index.xml"):
+            for compound in _compounds(xml_dir / f"{refid}.xml"):
+                if compound["kind"] in _NAMESPACE_KINDS:
+                    entry = namespaces.setdefault(compound["name"], _namespace_entry(compound["name"]))
+                    entry["documented"] += compound["documented"]
+                    entry["undocumented"] += compound["undocumented"]
+                elif compound["kind"] in _CLASS_KINDS:
+                    classes.append(compound)
+
+    for item in classes:
+        scope = _enclosing_namespace(item["name"], namespaces)
+        item["namespace"] = scope
+        entry = namespaces.setdefault(scope, _namespace_entry(scope))
+        entry["classes"] += 1
+        entry["documented"] += item["documented"]
+        entry["undocumented"] += item["undocumented"]
+
+    listed = sorted(namespaces.values(), key=lambda item: (-item["classes"], item["name"]))
+    ranked = sorted(classes, key=lambda item: (-item["undocumented"], item["name"]))
+    return {
+        "namespace_count": len(namespaces),
+        "class_count": len(classes),
+        "documented": sum(item["documented"] for item in namespaces.values()),
+        "undocumented": sum(item["undocumented"] for item in namespaces.values()),
+        "namespaces": sorted(listed[:MAX_API_NAMESPACES], key=lambda item: item["name"]),
+        "classes": [
+            {key: item[key] for key in ("name", "kind", "namespace", "documented", "undocumented")}
+            for item in ranked[:MAX_API_CLASSES]
+        ],
+    }
+
+
+def read_api_index(repo_path: Path) -> tuple[str | None, dict[str, Any] | None]:
+    """Return the cached ``(doxygen fingerprint, index)``, or ``(None, None)``."""
+    path = _cache_path(repo_path)
+    if path is None:
+        return None, None
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None, None
+    if not isinstance(data, dict) or not isinstance(data.get("index"), dict):
+        return None, None
+    key = data.get("fingerprint")
+    return (key if isinstance(key, str) else None), data["index"]
+
+
+def refresh_api_index(repo_path: Path, key: str) -> dict[str, Any]:
+    """Return the index of the Doxygen run ``key``, parsing its XML only if not cached."""
+    cached_key, index = read_api_index(repo_path)
+    if index is not None and cached_key == key:
+        return index
+    index = build_api_index(doxygen_xml_dirs(repo_path))
+    path = _cache_path(repo_path)
+    if path is not None:
+        try:
+            write_text_atomic(path, json.dumps({"fingerprint": key, "index": index}, sort_keys=True) + "\n")
+        except OSError as exc:
+            raise DocGenIOError(f"Failed to write API index cache: {path}") from exc
+    return index
+
+
+def _cache_path(repo_path: Path) -> Path | None:
+    output = doxygen_output_dir(repo_path)
+    return output / API_INDEX_CACHE if output is not None else None
+
+
+def _compound_refids(index_path: Path) -> Iterator[str]:
+    wanted = _CLASS_KINDS | _NAMESPACE_KINDS
+    for event, elem in _iterparse(index_path, ("end",)):
+        if elem.tag == "compound":
+            if elem.get("kind") in wanted and elem.get("refid"):
+                yield elem.get("refid", "")
+            elem.clear()
+
+
+def _compounds(path: Path) -> Iterator[dict[str, Any]]:
+    compound: dict[str, Any] | None = None
+    for event, elem in _iterparse(path, ("start", "end")):
+        if event == "start":
+            if elem.tag == "compounddef":
+                compound = {"kind": elem.get("kind", ""), "name": "", "documented": 0, "undocumented": 0}
+            continue
+        if compound is None:
+            continue
+        if elem.tag == "memberdef":
+            compound["documented" if _described(elem) else "undocumented"] += 1
+            elem.clear()
+        elif elem.tag == "compoundname":
+            compound["name"] = (elem.text or "").strip()
+        elif elem.tag in _BULKY:
+            elem.clear()
+        elif elem.tag == "compounddef":
+            yield compound
+            compound = None
+            elem.clear()
+
+
+def _iterparse(path: Path, events: tuple[str, ...]) -> Iterator[tuple[str, Any]]:
+    try:
+        yield from ElementTree.iterparse(path, events=events)
+    except FileNotFoundError:
+        return
+    except (OSError, ElementTree.ParseError) as exc:
+        raise DocGenIOError(f"Failed to parse Doxygen XML: {path}: {exc}") from exc
+
+
+def _described(elem: Any) -> bool:
+    for tag in ("briefdescription", "detaileddescription"):
+        child = elem.find(tag)
+        if child is not None and "".join(child.itertext()).strip():
+            return True
+    return False
+
+
+def _namespace_entry(name: str) -> dict[str, Any]:
+    return {"name": name, "classes": 0, "documented": 0, "undocumented": 0}
+
+
+def _enclosing_namespace(name: str, namespaces: dict[str, Any]) -> str:
+    """Nearest enclosing namespace (nested classes skip their outer class)."""
+    scopes = [match.start() for match in _SCOPE_RE.finditer(name)]
+    for cut in reversed(scopes):
+        if name[:cut] in namespaces:
+            return name[:cut]
+    return ""
@@ -0,0 +1,193 @@
+"""Build the docs of many repositories through one warm process pool."""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+import json
+import multiprocessing
+from pathlib import Path
+import sys
+import time
+from typing import Any, Callable
+
+from ..config import load_config
+from ..errors import DocGenIOError, UsageError, exit_code_for_exception
+from ..logging import get_logger
+from ..rendering import warm_environment
+from ..utils.paths import resolve_repo_path
+from . import scan_service  # noqa: F401 - detector tables, loaded before forking
+from .build_service import build_docs
+
+REPORT_FORMAT = 1
+
+
+@dataclass(frozen=True)
+class BatchOptions:
+    config_path: Path | None = None
+    dry_run: bool = False
+    force: bool = False
+    doxygen: bool = False
+    doxygen_shards: int = 1
+
+
+@dataclass(frozen=True)
+class RepoResult:
+    repo: str
+    ok: bool
+    seconds: float
+    up_to_date: bool = False
+    files: int = 0
+    doxygen_warnings: int = 0
+    error: str | None = None
+    exit_code: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "repo": self.repo,
+            "ok": self.ok,
+            "seconds": round(self.seconds, 3),
+            "up_to_date": self.up_to_date,
+            "files": self.files,
+            "doxygen_warnings": self.doxygen_warnings,
+            "error": self.error,
+            "exit_code": self.exit_code,
+        }
+
+
+@dataclass(frozen=True)
+class BatchReport:
+    results: list[RepoResult]
+    seconds: float
+    jobs: int
+
+    @property
+    def failed(self) -> list[RepoResult]:
+        return [result for result in self.results if not result.ok]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "format": REPORT_FORMAT,
+            "jobs": self.jobs,
+            "seconds": round(self.seconds, 3),
+            "total": len(self.results),
+            "succeeded": len(self.results) - len(self.failed),
+            "failed": len(self.failed),
+            "up_to_date": sum(result.up_to_date for result in self.results),
+            "repos": [result.to_dict() for result in self.results],
+        }
+
+
+def read_repos_file(path: Path) -> list[Path]:
+    """Repository paths listed one per line (``#`` comments, relative to the file)."""
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except OSError as exc:
+        raise DocGenIOError(f"Failed to read repos file: {path}") from exc
+    repos: list[Path] = []
+    seen: set[Path] = set()
+    for line in lines:
+        entry = line.split("#", 1)[0].strip()
+        if not entry:
+            continue
+        repo = (path.parent / Path(entry).expanduser()).resolve()
+        if repo not in seen:
+            seen.add(repo)
+            repos.append(repo)
+    if not repos:
+        raise UsageError(f"No repositories listed in {path}")
+    return repos
+
+
+def build_all(
+    repos: list[Path],
+    options: BatchOptions,
+    jobs: int = 1,
+    progress: Callable[[RepoResult], None] | None = None,
+) -> BatchReport:
+    """Build every repo, ``jobs`` at a time; a failing repo never stops the others.
+
+    Templates are compiled and the detector tables imported once in this
+    process, before the pool forks, so workers start warm and stay alive for
+    the whole batch instead of paying interpreter startup per repository.
+    """
+    start = time.perf_counter()
+    warm_environment()
+    jobs = max(1, min(jobs, len(repos)))
+    results: dict[Path, RepoResult] = {}
+
+    def record(repo: Path, result: RepoResult) -> None:
+        results[repo] = result
+        if progress is not None:
+            progress(result)
+
+    if jobs == 1:
+        for repo in repos:
+            record(repo, _build_repo(repo, options))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            mp_context=_pool_context(),
+            initializer=warm_environment,
+        ) as executor:
+            futures = {executor.submit(_build_repo, repo, options): repo for repo in repos}
+            for future in as_completed(futures):
+                repo = futures[future]
+                try:
+                    result = future.result()
+                except Exception as exc:  # the worker died (e.g. killed by the OOM killer)
+                    result = _failure(repo, 0.0, exc)
+                record(repo, result)
+    return BatchReport([results[repo] for repo in repos], time.perf_counter() - start, jobs)
+
+
+def write_report(path: Path, report: BatchReport) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report.to_dict(), indent=2) + "\n", encoding="utf-8")
+    except OSError as exc:
+        raise DocGenIOError(f"Failed to write report: {path}") from exc
+
+
+def _build_repo(repo: Path, options: BatchOptions) -> RepoResult:
+    start = time.perf_counter()
+    try:
+        repo_path = resolve_repo_path(repo)
+        config = load_config(repo_path, options.config_path, require_exists=options.config_path is not None)
+        plan = build_docs(
+            repo_path,
+            config,
+            dry_run=options.dry_run,
+            force=options.force,
+            doxygen=options.doxygen,
+            doxygen_shards=options.doxygen_shards,
+        )
+    except Exception as exc:
+        get_logger().debug("build-all: %s failed", repo, exc_info=exc)
+        return _failure(repo, time.perf_counter() - start, exc)
+    return RepoResult(
+        str(repo),
+        True,
+        time.perf_counter() - start,
+        up_to_date=plan.up_to_date,
+        files=len(plan.targets),
+        doxygen_warnings=plan.doxygen_warnings,
+    )
+
+
+def _failure(repo: Path, seconds: float, exc: Exception) -> RepoResult:
+    return RepoResult(
+        str(repo),
+        False,
+        seconds,
+        error=str(exc) or type(exc).__name__,
+        exit_code=exit_code_for_exception(exc),
+    )
+
+
+def _pool_context() -> multiprocessing.context.BaseContext:
+    # Forked workers inherit the compiled templates; elsewhere (fork is
+    # unsafe on macOS) the initializer compiles them once per worker.
+    if sys.platform.startswith("linux"):
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
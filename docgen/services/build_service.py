@@ -2,20 +2,63 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, replace
+import hashlib
 import os
 from pathlib import Path
 from typing import Any
 
 from ..config import DocGenConfig
-from ..models import DetectedFile, ProjectInfo
-from ..errors import ConfigError, DocGenIOError
-from ..rendering import render_template, write_text
-from ..rendering.markers import apply_all_sections, extract_managed_sections
-from ..utils.ignore import build_excluder
-from ..services.scan_service import scan_repo, _build_excludes
-from ..utils.code_inspect import collect_code_overview
-from ..services.doxygen_service import find_doxyfile, run_doxygen
+from ..models import ProjectInfo
+from ..errors import ConfigError, DocGenIOError, UsageError
+from ..rendering import (
+    render_template,
+    stream_template,
+    write_stream_atomic,
+    write_text_atomic,
+)
+from ..rendering.markers import (
+    ManagedDocument,
+    SectionBlock,
+    SectionDigest,
+    apply_all_sections,
+    parse_document,
+)
+from ..rendering.context import LazyContext
+from ..rendering.sections import TemplateLayout, render_section, template_layout
+from ..services.scan_service import scan_repo
+from ..services.context_service import (
+    api_index_token,
+    body_fingerprint,
+    build_fingerprints,
+    file_role,
+    is_up_to_date,
+    load_target,
+    manifest_key,
+    module_pages,
+    prepare_context,
+    template_targets,
+)
+from ..services.doxygen_service import (
+    DoxygenJob,
+    DoxygenRun,
+    ShardedDoxygenJob,
+    doxygen_up_to_date,
+    find_doxyfile,
+    prepare_doxyfile,
+    start_doxygen,
+)
+from ..services.manifest_service import (
+    BuildManifest,
+    load_manifest,
+    manifest_path,
+    project_path,
+    save_manifest,
+    save_project,
+)
+from ..services.module_service import ModulePagesReport, build_module_pages
+from ..utils.fingerprint import file_fingerprint, text_fingerprint
 
 
 @dataclass(frozen=True)
@@ -28,6 +71,11 @@ class BuildPlan:
     doxygen_ran: bool = False
     doxygen_would_run: bool = False
     doxygen_file: Path | None = None
+    doxygen_up_to_date: bool = False
+    doxygen_warnings: int = 0
+    doxygen_parsed_files: int = 0
+    up_to_date: bool = False
+    module_pages: ModulePagesReport | None = None
 
 
 @dataclass(frozen=True)
@@ -37,6 +85,8 @@ class BuildReport:
     replaced: list[str] | None = None
     added: list[str] | None = None
     unchanged: list[str] | None = None
+    skipped: list[str] | None = None
+    untouched: bool = False
 
 
 def build_docs(
@@ -45,233 +95,412 @@ def build_docs(
     dry_run: bool = False,
     force: bool = False,
     doxygen: bool = False,
+    only_sections: list[str] | None = None,
+    doxygen_shards: int = 1,
+    repo_label: str | None = None,
+    user_cache: bool = True,
 ) -> BuildPlan:
+    """Generate the Markdown docs, with Doxygen (if requested) running alongside.
+
+    Doxygen is launched first and the Markdown pipeline runs while it works;
+    the build waits for it at the end (and kills it if the build fails).
+    ``doxygen_shards`` splits the Doxygen run over parallel processes.
+    ``repo_label`` replaces the repository path shown in the docs and in
+    the build fingerprint; ``user_cache=False`` keeps the scan out of the
+    user cache (for throwaway trees).
+    """
     if config.readme_target == "root" and config.output_dir not in {".", "./", ""}:
         raise ConfigError("readme_target='root' requires output_dir='.'")
-    project = scan_repo(repo_path, config)
-    context, sections, template_map = _prepare_context(repo_path, config, project)
+
+    job = None
+    if doxygen and not dry_run:
+        job = start_doxygen(repo_path, config, force=force, shards=doxygen_shards)
+    try:
+        plan = _build_markdown(
+            repo_path, config, dry_run, force, doxygen, only_sections, job, repo_label, user_cache
+        )
+    except BaseException:
+        if isinstance(job, (DoxygenJob, ShardedDoxygenJob)):
+            job.cancel()
+        raise
+    return _doxygen_step(plan, repo_path, config, dry_run, doxygen, force, job, doxygen_shards)
+
+
+def _build_markdown(
+    repo_path: Path,
+    config: DocGenConfig,
+    dry_run: bool,
+    force: bool,
+    doxygen: bool,
+    only_sections: list[str] | None,
+    job: DoxygenJob | ShardedDoxygenJob | DoxygenRun | None = None,
+    repo_label: str | None = None,
+    user_cache: bool = True,
+) -> BuildPlan:
+    template_map = template_targets(repo_path, config)
+    if only_sections:
+        return _build_selected(
+            repo_path, config, template_map, only_sections, dry_run, doxygen, job, repo_label, user_cache
+        )
+
+    manifest_file = manifest_path(repo_path, config.output_dir)
+    previous = load_manifest(manifest_file)
+    targets = list(template_map.values())
+    pages = module_pages(manifest_file, previous)
+    fingerprints = build_fingerprints(
+        repo_path,
+        config,
+        previous,
+        [*targets, manifest_file, *pages],
+        api_index_token(repo_path, config, job),
+        repo_label,
+    )
+    build_key = fingerprints.build
+
+    if not force and is_up_to_date(repo_path, previous, build_key, targets, pages):
+        git = fingerprints.git
+        if not dry_run and git and (git.head, git.dirty) != (previous.git_head, previous.git_dirty):
+            # Nothing to render, but the next build should diff from here.
+            save_manifest(
+                manifest_file,
+                replace(previous, settings=fingerprints.settings, git_head=git.head, git_dirty=git.dirty),
+            )
+        return BuildPlan(
+            targets=targets,
+            sections=list(previous.sections),
+            template_map=template_map,
+            reports={},
+            doxygen_requested=doxygen,
+            up_to_date=True,
+        )
+
+    project = _scan(repo_path, config, repo_label, user_cache, changed=fingerprints.changed)
+    context, sections = prepare_context(repo_path, config, project, job)
     plan = BuildPlan(
-        targets=list(template_map.values()),
+        targets=targets,
         sections=sections,
         template_map=template_map,
         reports={},
         doxygen_requested=doxygen,
     )
 
-    for template_name, target in plan.template_map.items():
-        content = render_template(template_name, context)
-        section_names = [section.name for section in extract_managed_sections(content)]
-        role = _file_role(target.name)
+    states: dict[Path, dict[str, Any]] = {}
+
+    def build_target(template_name: str, target: Path) -> BuildReport:
+        key = manifest_key(repo_path, target)
+        report, states[target] = _build_target(
+            template_name,
+            target,
+            context,
+            dry_run,
+            force,
+            previous.targets.get(key, {}),
+        )
+        return report
+
+    with ThreadPoolExecutor(max_workers=_build_workers(len(plan.targets))) as executor:
+        reports = executor.map(build_target, plan.template_map.keys(), plan.targets)
+        plan.reports.update(zip(plan.targets, reports))
+
+    modules: dict[str, str] = {}
+    if config.module_pages or previous.modules:
+        # With module_pages turned off, the pages of the last build are pruned.
+        module_report, modules = build_module_pages(
+            manifest_file.parent,
+            context["python_modules"] if config.module_pages else [],
+            previous.modules,
+            dry_run=dry_run,
+            force=force,
+        )
+        plan = replace(plan, module_pages=module_report)
+
+    if not dry_run:
+        manifest = BuildManifest(
+            targets={manifest_key(repo_path, target): states[target] for target in plan.targets},
+            build=build_key,
+            sections=sections,
+            modules=modules,
+            settings=fingerprints.settings,
+            git_head=fingerprints.git.head if fingerprints.git else None,
+            git_dirty=fingerprints.git.dirty if fingerprints.git else {},
+        )
+        save_manifest(manifest_file, manifest)
+        save_project(
+            project_path(repo_path, config.output_dir),
+            project,
+            build_key,
+            {"line_count": context["code_line_count"], "languages": context["code_languages"]},
+        )
 
-        if not target.exists():
-            plan.reports[target] = BuildReport(created=True, added=section_names)
-            if not dry_run:
-                write_text(target, content)
-            continue
+    return plan
 
-        if force:
-            plan.reports[target] = BuildReport(overwritten=True, added=section_names)
-            if not dry_run:
-                write_text(target, content)
-            continue
 
+def _build_selected(
+    repo_path: Path,
+    config: DocGenConfig,
+    template_map: dict[str, Path],
+    only_sections: list[str],
+    dry_run: bool,
+    doxygen: bool,
+    job: DoxygenJob | ShardedDoxygenJob | DoxygenRun | None = None,
+    repo_label: str | None = None,
+    user_cache: bool = True,
+) -> BuildPlan:
+    """Re-render only the named ``role.section`` blocks of existing targets.
+
+    Context facets the selected sections don't read are never computed. The
+    manifest is left alone, so the next full build re-checks these sections.
+    """
+    selected = _select_sections(template_map, only_sections)
+    project = _scan(repo_path, config, repo_label, user_cache)
+    context, sections = prepare_context(repo_path, config, project, job)
+    template_map = {name: template_map[name] for name in selected}
+    plan = BuildPlan(
+        targets=list(template_map.values()),
+        sections=sections,
+        template_map=template_map,
+        reports={},
+        doxygen_requested=doxygen,
+    )
+
+    for template_name, target in template_map.items():
+        if not target.exists():
+            raise UsageError(f"{target} does not exist: run a full build first.")
+        layout = template_layout(template_name)
+        blocks = [render_section(layout.sections[name], context) for name in selected[template_name]]
         existing = target.read_text(encoding="utf-8")
-        updated, report = apply_all_sections(existing, content, role)
+        document = load_target(target, existing)
+        updated, report = apply_all_sections(
+            existing, ManagedDocument.from_sections(blocks), file_role(target.name), document
+        )
+        untouched = updated == existing
+        if not dry_run and not untouched:
+            write_text_atomic(target, updated)
         plan.reports[target] = BuildReport(
             replaced=report.replaced,
             added=report.added,
             unchanged=report.unchanged,
+            untouched=untouched,
         )
-        if not dry_run:
-            write_text(target, updated)
-
-    if doxygen:
-        if dry_run:
-            doxyfile = find_doxyfile(repo_path)
-            if not doxyfile:
-                raise DocGenIOError(
-                    "Doxyfile not found (expected Doxyfile or docs/Doxyfile)."
-                )
-            plan = replace(plan, doxygen_would_run=True, doxygen_file=doxyfile)
-        else:
-            doxyfile = run_doxygen(repo_path)
-            plan = replace(plan, doxygen_ran=True, doxygen_file=doxyfile)
 
     return plan
 
 
-def _prepare_context(
+def _select_sections(template_map: dict[str, Path], names: list[str]) -> dict[str, list[str]]:
+    """Map each template to the requested sections, given as ``role.section``."""
+    available = {
+        f"{file_role(target.name)}.{section}": (template_name, section)
+        for template_name, target in template_map.items()
+        for section in template_layout(template_name).sections
+    }
+    selected: dict[str, list[str]] = {}
+    for name in names:
+        if name not in available:
+            raise UsageError(
+                f"Unknown section '{name}'. Available: {', '.join(sorted(available))}"
+            )
+        template_name, section = available[name]
+        if section not in selected.setdefault(template_name, []):
+            selected[template_name].append(section)
+    return selected
+
+
+def _doxygen_step(
+    plan: BuildPlan,
+    repo_path: Path,
+    config: DocGenConfig,
+    dry_run: bool,
+    doxygen: bool,
+    force: bool,
+    job: DoxygenJob | ShardedDoxygenJob | DoxygenRun | None,
+    shards: int = 1,
+) -> BuildPlan:
+    if not doxygen:
+        return plan
+    if dry_run:
+        doxyfile = find_doxyfile(repo_path)
+        if not doxyfile:
+            raise DocGenIOError(
+                "Doxyfile not found (expected Doxyfile or docs/Doxyfile)."
+            )
+        _, rendered = prepare_doxyfile(repo_path, config)
+        if not force and doxygen_up_to_date(repo_path, rendered, shards)[0]:
+            return replace(plan, doxygen_up_to_date=True, doxygen_file=doxyfile)
+        return replace(plan, doxygen_would_run=True, doxygen_file=doxyfile)
+    if job is None:
+        job = start_doxygen(repo_path, config, force=force, shards=shards)
+    run = job if isinstance(job, DoxygenRun) else job.wait()
+    return replace(
+        plan,
+        doxygen_ran=run.ran,
+        doxygen_up_to_date=not run.ran,
+        doxygen_file=run.doxyfile,
+        doxygen_warnings=run.warnings,
+        doxygen_parsed_files=run.parsed_files,
+    )
+
+
+def _scan(
     repo_path: Path,
     config: DocGenConfig,
-    project: ProjectInfo,
-) -> tuple[dict[str, Any], list[str], dict[str, Path]]:
-    output_dir = Path(config.output_dir)
-    readme_target = config.readme_target
-
-    readme_path = (output_dir / "README.md") if readme_target == "output" else Path("README.md")
-    arch_path = output_dir / "ARCHITECTURE.md"
-    index_path = output_dir / "index.md"
-
-    readme_link, architecture_link, index_link = _build_links(output_dir, readme_target)
-
-    enable_github_pages = config.enable_github_pages
-    enable_doxygen_block = _enable_doxygen_block(config.enable_doxygen_block, project)
-
-    key_files = _filter_key_files(project.files_detected)
-    key_files_by_type = _group_files_by_type(key_files)
-    ci_files = _ci_files(project.files_detected)
-    top_level_dirs = _top_level_dirs(repo_path, config)
-    top_level_dirs = _filter_structure_dirs(top_level_dirs)
-    top_level_nodes = [_node_from_name(name) for name in top_level_dirs]
-    stack_nodes = [_node_from_name(stack.name) for stack in project.stacks]
-
-    context = {
-        "project_name": project.project_name,
-        "repo_root": project.repo_root,
-        "stacks": project.stacks,
-        "commands": project.commands,
-        "ci": project.ci,
-        "ci_files": ci_files,
-        "key_files": key_files,
-        "key_files_by_type": key_files_by_type,
-        "files_detected_count": len(key_files),
-        "stacks_count": len(project.stacks),
-        "top_level_dirs": top_level_dirs,
-        "top_level_nodes": top_level_nodes,
-        "stack_nodes": stack_nodes,
-        "enable_github_pages": enable_github_pages,
-        "enable_doxygen_block": enable_doxygen_block,
-        "docker_enabled": any(stack.name == "docker" for stack in project.stacks),
-        "readme_link": readme_link,
-        "architecture_link": architecture_link,
-        "index_link": index_link,
+    repo_label: str | None,
+    user_cache: bool,
+    changed: frozenset[str] | None = None,
+) -> ProjectInfo:
+    project = scan_repo(repo_path, config, changed=changed, user_cache=user_cache)
+    return replace(project, repo_root=repo_label) if repo_label else project
+
+
+def _build_target(
+    template_name: str,
+    target: Path,
+    context: LazyContext,
+    dry_run: bool,
+    force: bool,
+    previous: dict[str, Any],
+) -> tuple[BuildReport, dict[str, Any]]:
+    layout = template_layout(template_name)
+    layout_key = layout.fingerprint(context)
+    inputs = {name: section.fingerprint(context) for name, section in layout.sections.items()}
+
+    if not force and target.exists() and previous.get("layout") == layout_key:
+        entries = previous.get("sections")
+        if isinstance(entries, list) and all(
+            isinstance(entry, dict) and entry.get("name") in layout.sections for entry in entries
+        ):
+            return _update_sections(layout, layout_key, inputs, entries, target, context, dry_run)
+
+    if force or not target.exists():
+        return _stream_target(template_name, target, context, layout_key, inputs, dry_run)
+
+    content = render_template(template_name, context)
+    rendered = parse_document(content)
+    state: dict[str, Any] = {
+        "layout": layout_key,
+        "sections": [_section_state(section, inputs.get(section.name)) for section in rendered.sections],
     }
 
-    context.update(collect_code_overview(repo_path, config))
+    existing = target.read_text(encoding="utf-8")
+    document = load_target(target, existing)
+    updated, report = apply_all_sections(existing, rendered, file_role(target.name), document)
+    state["output"] = text_fingerprint(updated)
+    untouched = updated == existing
+    if not dry_run and not untouched:
+        write_text_atomic(target, updated)
+    return (
+        BuildReport(
+            replaced=report.replaced,
+            added=report.added,
+            unchanged=report.unchanged,
+            untouched=untouched,
+        ),
+        state,
+    )
 
-    sections = ["Summary", "Stacks", "Commands", "Structure", "CI", "Documentation"]
-    if enable_github_pages:
-        sections.append("GitHub Pages")
-    if enable_doxygen_block:
-        sections.append("Doxygen")
 
-    template_map: dict[str, Path] = {
-        "README.md.j2": repo_path / readme_path,
-        "ARCHITECTURE.md.j2": repo_path / arch_path,
-    }
-    if enable_github_pages:
-        template_map["INDEX.md.j2"] = repo_path / index_path
-
-    return context, sections, template_map
-
-
-def _file_role(filename: str) -> str:
-    lower = filename.lower()
-    if lower == "readme.md":
-        return "readme"
-    if lower == "architecture.md":
-        return "architecture"
-    return "index"
-
-
-def _build_links(output_dir: Path, readme_target: str) -> tuple[str, str, str]:
-    output_posix = output_dir.as_posix()
-    if output_posix == ".":
-        output_posix = ""
-
-    if readme_target == "output":
-        readme_link = "README.md"
-        architecture_link = "ARCHITECTURE.md"
-        index_link = "index.md"
-        return readme_link, architecture_link, index_link
-
-    prefix = f"{output_posix}/" if output_posix else ""
-    readme_link = "../README.md" if output_posix else "README.md"
-    architecture_link = f"{prefix}ARCHITECTURE.md"
-    index_link = f"{prefix}index.md"
-    return readme_link, architecture_link, index_link
-
-
-def _enable_doxygen_block(setting: str | bool, project: ProjectInfo) -> bool:
-    if isinstance(setting, bool):
-        return setting
-    has_doxygen = any(item.type == "doxygen" for item in project.files_detected)
-    return has_doxygen
-
-
-def _filter_key_files(files: list[DetectedFile]) -> list[DetectedFile]:
-    filtered = [
-        item
-        for item in files
-        if item.type not in {"readme", "docs_dir"}
-    ]
-    return sorted(filtered, key=lambda item: (item.type, item.path))
-
-
-def _group_files_by_type(files: list[DetectedFile]) -> dict[str, list[str]]:
-    grouped: dict[str, list[str]] = {}
-    for item in files:
-        grouped.setdefault(item.type, []).append(item.path)
-    for items in grouped.values():
-        items.sort()
-    return dict(sorted(grouped.items()))
-
-
-def _ci_files(files: list[DetectedFile]) -> list[str]:
-    ci_types = {"github_actions", "gitlab_ci", "jenkins"}
-    paths = [item.path for item in files if item.type in ci_types]
-    return sorted(paths)
-
-
-def _top_level_dirs(repo_path: Path, config: DocGenConfig) -> list[str]:
-    patterns = _build_excludes(config.exclude, config.output_dir)
-    excluder = build_excluder(patterns)
-
-    names: list[str] = []
-    with os.scandir(repo_path) as it:
-        for entry in it:
-            if not entry.is_dir(follow_symlinks=False):
-                continue
-            rel = entry.name
-            rel_posix = rel.replace("\\", "/")
-            if excluder.is_excluded(rel_posix, is_dir=True):
-                continue
-            names.append(entry.name)
-    return sorted(set(names))
-
-
-def _filter_structure_dirs(names: list[str]) -> list[str]:
-    banned = {"docs", "docgen", "documentation"}
-    names = [name for name in names if name.lower() not in banned]
-    allowlist = {
-        "src",
-        "app",
-        "apps",
-        "packages",
-        "services",
-        "libs",
-        "lib",
-        "tests",
-        "test",
-        "infra",
-        "docker",
-        "scripts",
-        "config",
-        "configs",
-        "backend",
-        "frontend",
-        "client",
-        "server",
-        "api",
+def _stream_target(
+    template_name: str,
+    target: Path,
+    context: LazyContext,
+    layout_key: str,
+    inputs: dict[str, str],
+    dry_run: bool,
+) -> tuple[BuildReport, dict[str, Any]]:
+    """Render straight into the target without holding the whole document.
+
+    Used when nothing on disk needs merging (new target or ``--force``).
+    """
+    created = not target.exists()
+    digest = SectionDigest()
+    chunks = digest.tee(stream_template(template_name, context))
+    if dry_run:
+        output = hashlib.sha256()
+        for chunk in chunks:
+            output.update(chunk.encode("utf-8"))
+        output_key = output.hexdigest()
+        untouched = not created and file_fingerprint(target) == output_key
+    else:
+        written, output_key = write_stream_atomic(target, chunks)
+        untouched = not written
+
+    state: dict[str, Any] = {
+        "layout": layout_key,
+        "sections": [
+            {"name": name, "inputs": inputs.get(name), "body": body}
+            for name, body in digest.sections
+        ],
+        "output": output_key,
     }
-    filtered = [name for name in names if name in allowlist]
-    if filtered:
-        return sorted(filtered)
-    return sorted(names)
+    added = [name for name, _ in digest.sections]
+    if created:
+        return BuildReport(created=True, added=added), state
+    return BuildReport(overwritten=True, added=added, untouched=untouched), state
+
+
+def _update_sections(
+    layout: TemplateLayout,
+    layout_key: str,
+    inputs: dict[str, str],
+    entries: list[dict[str, Any]],
+    target: Path,
+    context: LazyContext,
+    dry_run: bool,
+) -> tuple[BuildReport, dict[str, Any]]:
+    """Re-render only the sections whose inputs or on-disk body changed.
+
+    The set of sections is known to match the previous build because the
+    layout fingerprint (template source plus the keys outside sections)
+    is unchanged.
+    """
+    existing = target.read_text(encoding="utf-8")
+    document = load_target(target, existing)
+
+    states: list[dict[str, Any]] = []
+    stale: list[SectionBlock] = []
+    skipped: list[str] = []
+    for entry in entries:
+        name = entry["name"]
+        found = document.find(name)
+        if (
+            found is not None
+            and entry.get("inputs") == inputs[name]
+            and entry.get("body") == body_fingerprint(found[1].body)
+        ):
+            skipped.append(name)
+            states.append(entry)
+            continue
+        section = render_section(layout.sections[name], context)
+        stale.append(section)
+        states.append(_section_state(section, inputs[name]))
+
+    state: dict[str, Any] = {"layout": layout_key, "sections": states}
+    if not stale:
+        state["output"] = text_fingerprint(existing)
+        return BuildReport(replaced=[], added=[], unchanged=[], skipped=skipped, untouched=True), state
+
+    rendered = ManagedDocument.from_sections(stale)
+    updated, report = apply_all_sections(existing, rendered, file_role(target.name), document)
+    state["output"] = text_fingerprint(updated)
+    untouched = updated == existing
+    if not dry_run and not untouched:
+        write_text_atomic(target, updated)
+    return (
+        BuildReport(
+            replaced=report.replaced,
+            added=report.added,
+            unchanged=report.unchanged,
+            skipped=skipped,
+            untouched=untouched,
+        ),
+        state,
+    )
+
+
+def _section_state(section: SectionBlock, inputs: str | None) -> dict[str, Any]:
+    return {"name": section.name, "inputs": inputs, "body": body_fingerprint(section.body)}
+
+
+def _build_workers(count: int) -> int:
+    return max(1, min(count, os.cpu_count() or 1))
 
 
-def _node_from_name(name: str) -> dict[str, str]:
-    safe = "".join(ch if ch.isalnum() else "_" for ch in name.lower())
-    if not safe:
-        safe = "node"
-    return {"id": safe, "label": f"{name}/"}
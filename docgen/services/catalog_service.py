@@ -0,0 +1,175 @@
+"""Organization-wide catalog merged from the scans kept by each repo's last build."""
+
+from __future__ import annotations
+
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from .. import __version__
+from ..config import load_config
+from ..errors import DocGenError, DocGenIOError, UsageError
+from ..rendering import render_template, write_text_atomic
+from .manifest_service import PROJECT_FORMAT, project_path
+
+CATALOG_FORMAT = 1
+CATALOG_INDEX = "catalog.json"
+CATALOG_FORMATS = {"md": ("CATALOG.md.j2", "catalog.md"), "html": ("CATALOG.html.j2", "catalog.html")}
+SORT_KEYS = {
+    "name": lambda entry: (entry["name"].lower(), entry["repo"]),
+    "lines": lambda entry: (-entry["line_count"], entry["name"].lower()),
+    "stacks": lambda entry: (-len(entry["stacks"]), entry["name"].lower()),
+}
+
+
+@dataclass(frozen=True)
+class CatalogReport:
+    entries: list[dict[str, Any]]
+    missing: list[str]
+    reread: int
+    reused: int
+    outputs: list[Path]
+
+
+def build_catalog(repos: list[Path], out_dir: Path, fmt: str = "md", sort: str = "name") -> CatalogReport:
+    """Merge the ``.docgen-project.json`` of every repo into one catalog page.
+
+    ``catalog.json`` (the prebuilt index) also serves as the cache: a repo
+    whose scan file has the same size and mtime as last time is taken from
+    it with a single ``stat``; only the others are read again.
+    """
+    if fmt not in CATALOG_FORMATS:
+        raise UsageError("--format must be 'md' or 'html'")
+    if sort not in SORT_KEYS:
+        raise UsageError(f"--sort must be one of: {', '.join(SORT_KEYS)}")
+    index_path = out_dir / CATALOG_INDEX
+    previous = _load_index(index_path)
+
+    records: dict[str, dict[str, Any] | None] = {}
+    stale: list[Path] = []
+    for repo in repos:
+        record = _reuse(previous.get(str(repo)))
+        if record is None:
+            stale.append(repo)
+        records[str(repo)] = record
+    reused = len(repos) - len(stale)
+    if stale:
+        with ThreadPoolExecutor(max_workers=max(1, min(len(stale), (os.cpu_count() or 1) * 4))) as executor:
+            records.update(zip(map(str, stale), executor.map(_read_record, stale)))
+
+    entries = sorted((record["entry"] for record in records.values() if record), key=SORT_KEYS[sort])
+    missing = sorted(repo for repo, record in records.items() if record is None)
+    aggregates = _aggregates(entries, missing)
+    template, filename = CATALOG_FORMATS[fmt]
+    page = out_dir / filename
+    for entry in entries:
+        entry["link"] = os.path.relpath(entry["readme"], out_dir) if entry["readme"] else None
+
+    try:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        write_text_atomic(
+            page,
+            render_template(template, {"entries": entries, "missing": missing, "aggregates": aggregates, "sort": sort}),
+        )
+        index = {
+            "format": CATALOG_FORMAT,
+            "docgen_version": __version__,
+            "aggregates": aggregates,
+            "missing": missing,
+            "repos": {repo: record for repo, record in records.items() if record},
+        }
+        write_text_atomic(index_path, json.dumps(index, indent=1, sort_keys=True) + "\n")
+    except OSError as exc:
+        raise DocGenIOError(f"Failed to write catalog: {out_dir}") from exc
+    return CatalogReport(entries, missing, len(stale), reused, [page, index_path])
+
+
+def _load_index(path: Path) -> dict[str, Any]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("format") != CATALOG_FORMAT:
+        return {}
+    if data.get("docgen_version") != __version__:
+        return {}
+    repos = data.get("repos")
+    return repos if isinstance(repos, dict) else {}
+
+
+def _reuse(record: Any) -> dict[str, Any] | None:
+    if not isinstance(record, dict) or not isinstance(record.get("source"), str):
+        return None
+    try:
+        stat = os.stat(record["source"])
+    except OSError:
+        return None
+    return record if record.get("state") == [stat.st_size, stat.st_mtime_ns] else None
+
+
+def _read_record(repo: Path) -> dict[str, Any] | None:
+    try:
+        config = load_config(repo)
+    except DocGenError:
+        return None
+    source = project_path(repo, config.output_dir)
+    try:
+        stat = source.stat()
+        data = json.loads(source.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("format") != PROJECT_FORMAT or not isinstance(data.get("project"), dict):
+        return None
+    readme = source.parent / "README.md"
+    return {
+        "source": source.as_posix(),
+        "state": [stat.st_size, stat.st_mtime_ns],
+        "build": data.get("build"),
+        "entry": _entry(repo, data["project"], data.get("code") or {}, readme if readme.exists() else None),
+    }
+
+
+def _entry(repo: Path, project: dict[str, Any], code: dict[str, Any], readme: Path | None) -> dict[str, Any]:
+    commands = project.get("commands") or {}
+    languages = code.get("languages") or []
+    return {
+        "name": str(project.get("project_name") or repo.name),
+        "repo": repo.as_posix(),
+        "stacks": sorted(str(stack.get("name")) for stack in project.get("stacks") or []),
+        "package_manager": project.get("package_manager"),
+        "python_tooling": project.get("python_tooling"),
+        "commands": {key: commands.get(key) for key in ("run", "test", "lint", "build", "format")},
+        "ci": list(project.get("ci") or []),
+        "line_count": int(code.get("line_count") or 0),
+        "languages": [str(item.get("language")) for item in languages[:3] if isinstance(item, dict)],
+        "packages": len(project.get("packages") or []),
+        "readme": readme.as_posix() if readme else None,
+    }
+
+
+def _aggregates(entries: list[dict[str, Any]], missing: list[str]) -> dict[str, Any]:
+    stacks: Counter[str] = Counter()
+    managers: Counter[str] = Counter()
+    ci: Counter[str] = Counter()
+    for entry in entries:
+        stacks.update(entry["stacks"])
+        managers.update([entry["package_manager"] or entry["python_tooling"] or "-"])
+        ci.update(entry["ci"] or ["-"])
+
+    def ranked(counter: Counter[str]) -> list[dict[str, Any]]:
+        return [{"name": name, "count": count} for name, count in sorted(counter.items(), key=lambda i: (-i[1], i[0]))]
+
+    return {
+        "repos": len(entries),
+        "missing": len(missing),
+        "line_count": sum(entry["line_count"] for entry in entries),
+        "stacks": ranked(stacks),
+        "package_managers": ranked(managers),
+        "ci": ranked(ci),
+        "without_tests": sorted(entry["name"] for entry in entries if not entry["commands"]["test"]),
+        "without_ci": sorted(entry["name"] for entry in entries if not entry["ci"]),
+    }
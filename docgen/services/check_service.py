@@ -0,0 +1,144 @@
+"""Up-to-date verification of generated docs without writing anything."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Mapping
+
+from ..config import DocGenConfig
+from ..errors import ConfigError
+from ..rendering import render_template
+from ..rendering.markers import ManagedDocument, SectionBlock, normalize_body, parse_document
+from ..rendering.sections import render_section, template_layout
+from ..services.context_service import (
+    api_index_token,
+    body_fingerprint,
+    build_fingerprints,
+    is_up_to_date,
+    load_target,
+    manifest_key,
+    module_pages,
+    prepare_context,
+    template_targets,
+)
+from ..services.manifest_service import load_manifest, manifest_path
+from ..services.module_service import MODULES_DIR, page_fingerprints, removed_pages, stale_pages
+from ..services.scan_service import scan_repo
+
+
+@dataclass(frozen=True)
+class StaleSection:
+    target: Path
+    section: str | None
+    reason: str
+
+
+@dataclass
+class CheckReport:
+    targets: list[Path]
+    stale: list[StaleSection] = field(default_factory=list)
+    from_manifest: bool = False
+
+    @property
+    def up_to_date(self) -> bool:
+        return not self.stale
+
+
+def check_docs(repo_path: Path, config: DocGenConfig, fail_fast: bool = False) -> CheckReport:
+    """Compare what ``build`` would produce with the files on disk.
+
+    Uses the build manifest when possible: a matching build fingerprint
+    proves everything is current without scanning, and a matching section
+    fingerprint proves a section is current without rendering it.
+    """
+    if config.readme_target == "root" and config.output_dir not in {".", "./", ""}:
+        raise ConfigError("readme_target='root' requires output_dir='.'")
+
+    manifest_file = manifest_path(repo_path, config.output_dir)
+    previous = load_manifest(manifest_file)
+    template_map = template_targets(repo_path, config)
+    targets = list(template_map.values())
+    report = CheckReport(targets=targets)
+
+    pages = module_pages(manifest_file, previous)
+    fingerprints = build_fingerprints(
+        repo_path, config, previous, [*targets, manifest_file, *pages], api_index_token(repo_path, config, None)
+    )
+    if is_up_to_date(repo_path, previous, fingerprints.build, targets, pages):
+        report.from_manifest = True
+        return report
+
+    project = scan_repo(repo_path, config, changed=fingerprints.changed)
+    context, _ = prepare_context(repo_path, config, project)
+    for template_name, target in template_map.items():
+        state = previous.targets.get(manifest_key(repo_path, target), {})
+        report.stale.extend(_check_target(template_name, target, context, state, fail_fast))
+        if fail_fast and report.stale:
+            return report
+
+    if config.module_pages or previous.modules:
+        pages_dir = manifest_file.parent / MODULES_DIR
+        states = page_fingerprints(context["python_modules"]) if config.module_pages else {}
+        outdated = [(page, "module page outdated") for page in stale_pages(pages_dir, states, previous.modules)]
+        removed = [(page, "module removed") for page in removed_pages(states, previous.modules)]
+        for page, reason in [*outdated, *removed]:
+            report.stale.append(StaleSection(pages_dir / page, None, reason))
+            if fail_fast:
+                break
+    return report
+
+
+def _check_target(
+    template_name: str,
+    target: Path,
+    context: Mapping[str, Any],
+    state: dict[str, Any],
+    fail_fast: bool,
+) -> list[StaleSection]:
+    if not target.exists():
+        return [StaleSection(target, None, "file missing")]
+    document = load_target(target, target.read_text(encoding="utf-8"))
+
+    layout = template_layout(template_name)
+    entries = state.get("sections")
+    if (
+        state.get("layout") == layout.fingerprint(context)
+        and isinstance(entries, list)
+        and all(isinstance(entry, dict) and entry.get("name") in layout.sections for entry in entries)
+    ):
+        stale: list[StaleSection] = []
+        for entry in entries:
+            name = entry["name"]
+            found = document.find(name)
+            section = layout.sections[name]
+            if (
+                found is not None
+                and entry.get("inputs") == section.fingerprint(context)
+                and entry.get("body") == body_fingerprint(found[1].body)
+            ):
+                continue
+            problem = _compare(document, render_section(section, context), target)
+            if problem:
+                stale.append(problem)
+                if fail_fast:
+                    break
+        return stale
+
+    stale = []
+    for section in parse_document(render_template(template_name, context)).sections:
+        problem = _compare(document, section, target)
+        if problem:
+            stale.append(problem)
+            if fail_fast:
+                break
+    return stale
+
+
+def _compare(document: ManagedDocument, section: SectionBlock, target: Path) -> StaleSection | None:
+    found = document.find(section.name)
+    if found is None:
+        return StaleSection(target, section.name, "missing")
+    if normalize_body(found[1].body) != normalize_body(section.body):
+        return StaleSection(target, section.name, "outdated")
+    return None
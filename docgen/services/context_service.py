@@ -0,0 +1,377 @@
+"""What a build reads, shared by ``build`` and ``check``: targets, render context and fingerprints."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import partial
+import os
+from pathlib import Path
+from typing import Any
+
+from .. import __version__
+from ..config import DocGenConfig
+from ..errors import UsageError
+from ..logging import get_logger
+from ..models import DetectedFile, ProjectInfo
+from ..rendering import template_fingerprints
+from ..rendering.context import LazyContext
+from ..rendering.markers import ManagedDocument, normalize_body, load_document
+from ..services.api_index_service import read_api_index, refresh_api_index
+from ..services.doxygen_service import DoxygenJob, DoxygenRun, ShardedDoxygenJob
+from ..services.manifest_service import BuildManifest, project_path
+from ..services.module_service import MODULES_DIR
+from ..services.scan_service import _build_excludes, _normalize_output_dir, package_graph
+from ..utils.code_inspect import CodeInspector
+from ..utils.fingerprint import file_fingerprint, fingerprint, text_fingerprint
+from ..utils.git import GitState, changed_paths, git_state
+from ..utils.ignore import Excluder, build_excluder
+from ..utils.walk import snapshot_repo
+
+
+@dataclass(frozen=True)
+class BuildFingerprints:
+    settings: str
+    build: str
+    git: GitState | None = None
+    # Paths changed since the previous build according to git (None: unknown).
+    changed: frozenset[str] | None = None
+
+
+def _build_fingerprint(repo_path: Path, config: DocGenConfig, outputs: list[Path], settings: str) -> str:
+    """Fingerprint every input of a build without reading file contents.
+
+    Covers the settings (see ``_settings_fingerprint``) plus the repository
+    snapshot (paths, sizes, mtimes) minus DocGen's own outputs.
+    """
+    excluder, skip = _snapshot_filter(repo_path, config, outputs)
+    return fingerprint(settings, snapshot_repo(repo_path, excluder, skip))
+
+
+def build_fingerprints(
+    repo_path: Path,
+    config: DocGenConfig,
+    previous: BuildManifest,
+    outputs: list[Path],
+    api_index: str | None = None,
+    repo_label: str | None = None,
+) -> BuildFingerprints:
+    """Like ``_build_fingerprint``, asking git what changed when ``git_incremental`` is on.
+
+    When the previous build recorded a commit, ``git diff`` and ``git
+    status`` name the paths changed since; if none of them is an input
+    and the settings are unchanged, the previous build fingerprint still
+    holds and the repository is not walked at all. Any failure to resolve
+    the history falls back to the full snapshot. ``repo_label`` stands for
+    the repository instead of its path (a revision's temporary tree).
+    """
+    settings = _settings_fingerprint(repo_label or repo_path.as_posix(), config, api_index)
+    state = git_state(repo_path) if config.git_incremental else None
+    if state is None:
+        return BuildFingerprints(settings, _build_fingerprint(repo_path, config, outputs, settings))
+
+    excluder, skip = _snapshot_filter(repo_path, config, outputs)
+    state = GitState(
+        state.head,
+        {path: stat for path, stat in state.dirty.items() if path not in skip and not excluder.is_excluded(path, False)},
+    )
+    changed = None
+    if previous.git_head and previous.settings == settings and previous.build:
+        changed = changed_paths(repo_path, previous.git_head, previous.git_dirty, state)
+    if changed is not None:
+        changed = frozenset(path for path in changed if path not in skip and not excluder.is_excluded(path, False))
+        if not changed:
+            return BuildFingerprints(settings, previous.build, state, changed)
+    if changed is None:
+        get_logger().debug("git: history unresolved, falling back to a full scan")
+    else:
+        get_logger().debug("git: %d changed paths since %s", len(changed), previous.git_head)
+    build = fingerprint(settings, snapshot_repo(repo_path, excluder, skip))
+    return BuildFingerprints(settings, build, state, changed)
+
+
+def _settings_fingerprint(repo: str, config: DocGenConfig, api_index: str | None) -> str:
+    """The DocGen version, the repository, the config, the bundled templates and the API index run."""
+    return fingerprint(
+        __version__,
+        repo,
+        config.to_dict(),
+        template_fingerprints(),
+        api_index,
+    )
+
+
+def _snapshot_filter(repo_path: Path, config: DocGenConfig, outputs: list[Path]) -> tuple[Excluder, frozenset[str]]:
+    """The excluder and the skipped outputs shared by snapshots and git change sets."""
+    patterns = _build_excludes(config.exclude, _normalize_output_dir(config.output_dir))
+    outputs = [*outputs, project_path(repo_path, config.output_dir)]
+    return build_excluder(patterns), frozenset(manifest_key(repo_path, path) for path in outputs)
+
+
+def is_up_to_date(
+    repo_path: Path,
+    previous: BuildManifest,
+    build_key: str,
+    targets: list[Path],
+    pages: list[Path],
+) -> bool:
+    if previous.build != build_key:
+        return False
+    if not all(page.exists() for page in pages):
+        return False
+    for target in targets:
+        state = previous.targets.get(manifest_key(repo_path, target))
+        if not state or state.get("output") is None:
+            return False
+        if file_fingerprint(target) != state["output"]:
+            return False
+    return True
+
+
+def module_pages(manifest_file: Path, previous: BuildManifest) -> list[Path]:
+    """Module pages recorded by the last build (they sit next to the manifest)."""
+    pages_dir = manifest_file.parent / MODULES_DIR
+    return [pages_dir / page for page in previous.modules]
+
+
+def load_target(target: Path, text: str) -> ManagedDocument:
+    try:
+        return load_document(text)
+    except UsageError as exc:
+        raise UsageError(f"{target}: {exc.message}") from exc
+
+
+def body_fingerprint(body: str) -> str:
+    return text_fingerprint(normalize_body(body))
+
+
+def manifest_key(repo_path: Path, target: Path) -> str:
+    try:
+        return target.relative_to(repo_path).as_posix()
+    except ValueError:
+        return target.as_posix()
+
+
+def prepare_context(
+    repo_path: Path,
+    config: DocGenConfig,
+    project: ProjectInfo,
+    job: DoxygenJob | ShardedDoxygenJob | DoxygenRun | None = None,
+) -> tuple[LazyContext, list[str]]:
+    output_dir = Path(config.output_dir)
+    readme_target = config.readme_target
+
+    readme_link, architecture_link, index_link = _build_links(output_dir, readme_target)
+
+    enable_github_pages = config.enable_github_pages
+    enable_doxygen_block = _enable_doxygen_block(config.enable_doxygen_block, project)
+
+    key_files = _filter_key_files(project.files_detected)
+    key_files_by_type = _group_files_by_type(key_files)
+    ci_files = _ci_files(project.files_detected)
+    top_level_dirs = _top_level_dirs(repo_path, config)
+    top_level_dirs = _filter_structure_dirs(top_level_dirs)
+    top_level_nodes = [_node_from_name(name) for name in top_level_dirs]
+    stack_nodes = [_node_from_name(stack.name) for stack in project.stacks]
+
+    context = LazyContext({
+        "project_name": project.project_name,
+        "repo_root": project.repo_root,
+        "stacks": project.stacks,
+        "commands": project.commands,
+        "ci": project.ci,
+        "ci_files": ci_files,
+        "key_files": key_files,
+        "key_files_by_type": key_files_by_type,
+        "files_detected_count": len(key_files),
+        "stacks_count": len(project.stacks),
+        "top_level_dirs": top_level_dirs,
+        "top_level_nodes": top_level_nodes,
+        "stack_nodes": stack_nodes,
+        "enable_github_pages": enable_github_pages,
+        "enable_doxygen_block": enable_doxygen_block,
+        "docker_enabled": any(stack.name == "docker" for stack in project.stacks),
+        "readme_link": readme_link,
+        "architecture_link": architecture_link,
+        "index_link": index_link,
+        "packages": project.packages,
+        "package_graph": package_graph(project.packages) if len(project.packages) > 1 else None,
+    })
+
+    inspector = CodeInspector(repo_path, config)
+    for name, keys in CodeInspector.FACETS.items():
+        context.add_facet(
+            name,
+            keys,
+            loader=partial(inspector.facet, name),
+            token=partial(inspector.snapshot, name),
+        )
+    if config.doxygen_api_index:
+        # Reading the index waits for a running Doxygen job; other facets
+        # (and targets not using it) go on meanwhile.
+        context.add_facet(
+            "api",
+            ("api_index",),
+            loader=partial(_load_api_index, repo_path, job),
+            token=partial(api_index_token, repo_path, config, job),
+        )
+
+    sections = ["Summary", "Stacks", "Commands", "Structure", "CI", "Documentation"]
+    if project.packages:
+        sections.append("Packages")
+    if enable_github_pages:
+        sections.append("GitHub Pages")
+    if enable_doxygen_block:
+        sections.append("Doxygen")
+
+    return context, sections
+
+
+def _load_api_index(
+    repo_path: Path,
+    job: DoxygenJob | ShardedDoxygenJob | DoxygenRun | None,
+) -> dict[str, Any]:
+    if job is None:
+        return {"api_index": read_api_index(repo_path)[1]}
+    run = job if isinstance(job, DoxygenRun) else job.wait()
+    return {"api_index": refresh_api_index(repo_path, run.fingerprint)}
+
+
+def api_index_token(
+    repo_path: Path,
+    config: DocGenConfig,
+    job: DoxygenJob | ShardedDoxygenJob | DoxygenRun | None,
+) -> str | None:
+    """The Doxygen fingerprint the API index will come from (cached one without a run)."""
+    if not config.doxygen_api_index:
+        return None
+    if job is not None:
+        return job.fingerprint
+    return read_api_index(repo_path)[0]
+
+
+def template_targets(repo_path: Path, config: DocGenConfig) -> dict[str, Path]:
+    output_dir = Path(config.output_dir)
+    if config.readme_target == "output":
+        readme_path = output_dir / "README.md"
+    else:
+        readme_path = Path("README.md")
+
+    template_map: dict[str, Path] = {
+        "README.md.j2": repo_path / readme_path,
+        "ARCHITECTURE.md.j2": repo_path / output_dir / "ARCHITECTURE.md",
+    }
+    if config.enable_github_pages:
+        template_map["INDEX.md.j2"] = repo_path / output_dir / "index.md"
+    return template_map
+
+
+def file_role(filename: str) -> str:
+    lower = filename.lower()
+    if lower == "readme.md":
+        return "readme"
+    if lower == "architecture.md":
+        return "architecture"
+    return "index"
+
+
+def _build_links(output_dir: Path, readme_target: str) -> tuple[str, str, str]:
+    output_posix = output_dir.as_posix()
+    if output_posix == ".":
+        output_posix = ""
+
+    if readme_target == "output":
+        readme_link = "README.md"
+        architecture_link = "ARCHITECTURE.md"
+        index_link = "index.md"
+        return readme_link, architecture_link, index_link
+
+    prefix = f"{output_posix}/" if output_posix else ""
+    readme_link = "../README.md" if output_posix else "README.md"
+    architecture_link = f"{prefix}ARCHITECTURE.md"
+    index_link = f"{prefix}index.md"
+    return readme_link, architecture_link, index_link
+
+
+def _enable_doxygen_block(setting: str | bool, project: ProjectInfo) -> bool:
+    if isinstance(setting, bool):
+        return setting
+    has_doxygen = any(item.type == "doxygen" for item in project.files_detected)
+    return has_doxygen
+
+
+def _filter_key_files(files: list[DetectedFile]) -> list[DetectedFile]:
+    filtered = [
+        item
+        for item in files
+        if item.type not in {"readme", "docs_dir"}
+    ]
+    return sorted(filtered, key=lambda item: (item.type, item.path))
+
+
+def _group_files_by_type(files: list[DetectedFile]) -> dict[str, list[str]]:
+    grouped: dict[str, list[str]] = {}
+    for item in files:
+        grouped.setdefault(item.type, []).append(item.path)
+    for items in grouped.values():
+        items.sort()
+    return dict(sorted(grouped.items()))
+
+
+def _ci_files(files: list[DetectedFile]) -> list[str]:
+    ci_types = {"github_actions", "gitlab_ci", "jenkins"}
+    paths = [item.path for item in files if item.type in ci_types]
+    return sorted(paths)
+
+
+def _top_level_dirs(repo_path: Path, config: DocGenConfig) -> list[str]:
+    patterns = _build_excludes(config.exclude, config.output_dir)
+    excluder = build_excluder(patterns)
+
+    names: list[str] = []
+    with os.scandir(repo_path) as it:
+        for entry in it:
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            rel = entry.name
+            rel_posix = rel.replace("\\", "/")
+            if excluder.is_excluded(rel_posix, is_dir=True):
+                continue
+            names.append(entry.name)
+    return sorted(set(names))
+
+
+def _filter_structure_dirs(names: list[str]) -> list[str]:
+    banned = {"docs", "docgen", "documentation"}
+    names = [name for name in names if name.lower() not in banned]
+    allowlist = {
+        "src",
+        "app",
+        "apps",
+        "packages",
+        "services",
+        "libs",
+        "lib",
+        "tests",
+        "test",
+        "infra",
+        "docker",
+        "scripts",
+        "config",
+        "configs",
+        "backend",
+        "frontend",
+        "client",
+        "server",
+        "api",
+    }
+    filtered = [name for name in names if name in allowlist]
+    if filtered:
+        return sorted(filtered)
+    return sorted(names)
+
+
+def _node_from_name(name: str) -> dict[str, str]:
+    safe = "".join(ch if ch.isalnum() else "_" for ch in name.lower())
+    if not safe:
+        safe = "node"
+    return {"id": safe, "label": f"{name}/"}
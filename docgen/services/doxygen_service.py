@@ -2,15 +2,86 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
+import filecmp
+from fnmatch import fnmatchcase
+from html import escape
+import json
+import os
 from pathlib import Path
+import posixpath
 import re
+import secrets
+import shlex
 import shutil
+import signal
 import subprocess
+import tempfile
+import threading
+import time
+from typing import IO, Iterator
 
+from .. import __version__
+from ..config import DocGenConfig
 from ..errors import DocGenIOError
+from ..logging import get_logger
+from ..rendering import write_text_atomic
+from ..services.scan_service import _build_excludes, _normalize_output_dir
+from ..utils.code_inspect import _is_code_file
+from ..utils.fingerprint import fingerprint
+from ..utils.ignore import build_excluder
+from ..utils.walk import walk_repo
 
-_PROJECT_NAME_RE = re.compile(r"^\s*PROJECT_NAME\s*=\s*(.*)$")
 _OUTPUT_DIR_RE = re.compile(r"^\s*OUTPUT_DIRECTORY\s*=\s*(.*)$")
+_WARNING_RE = re.compile(r"\bwarning:", re.IGNORECASE)
+_ERROR_RE = re.compile(r"\berror:", re.IGNORECASE)
+_SETTING_RE = re.compile(r"^\s*([A-Z_][A-Z0-9_]*)\s*(\+?=)(.*)$")
+
+DOXYGEN_STAMP = ".docgen-doxygen.json"
+# Sibling directories of the output used while a run is staged and swapped in.
+STAGING_SUFFIX = ".staging"
+PREVIOUS_SUFFIX = ".previous"
+# Seconds between SIGTERM and SIGKILL when a run is cancelled or times out.
+KILL_GRACE = 5.0
+# Settings naming extra files or directories Doxygen reads besides INPUT.
+_EXTRA_INPUT_SETTINGS = (
+    "USE_MDFILE_AS_MAINPAGE",
+    "EXAMPLE_PATH",
+    "IMAGE_PATH",
+    "LAYOUT_FILE",
+    "HTML_HEADER",
+    "HTML_FOOTER",
+    "HTML_STYLESHEET",
+    "HTML_EXTRA_STYLESHEET",
+    "HTML_EXTRA_FILES",
+    "CITE_BIB_FILES",
+)
+# Output formats switched off for the tag-file pass of a sharded run.
+_OUTPUT_FORMATS = (
+    "GENERATE_HTML",
+    "GENERATE_LATEX",
+    "GENERATE_RTF",
+    "GENERATE_MAN",
+    "GENERATE_XML",
+    "GENERATE_DOCBOOK",
+)
+
+
+@dataclass(frozen=True)
+class DoxygenShard:
+    name: str
+    components: list[str]
+    inputs: list[str]
+
+
+@dataclass(frozen=True)
+class DoxygenRun:
+    doxyfile: Path
+    ran: bool
+    fingerprint: str
+    warnings: int = 0
+    errors: int = 0
+    parsed_files: int = 0
 
 
 def _template_doxyfile_path() -> Path:
@@ -29,21 +100,90 @@ def find_doxyfile(repo_path: Path) -> Path | None:
     return None
 
 
-def _render_doxyfile(template: str, project_name: str) -> str:
-    replaced = False
+def _render_doxyfile(template: str, overrides: dict[str, list[str]]) -> str:
+    """Return ``template`` with every setting in ``overrides`` replaced.
+
+    Existing assignments of an overridden key (``=`` and ``+=``, including
+    their ``\\`` continuation lines) are dropped; the new values are appended.
+    """
     lines: list[str] = []
+    skipping = False
     for line in template.splitlines():
-        match = _PROJECT_NAME_RE.match(line)
-        if match:
-            lines.append(f'PROJECT_NAME           = "{project_name}"')
-            replaced = True
-        else:
-            lines.append(line)
-    if not replaced:
-        lines.append(f'PROJECT_NAME           = "{project_name}"')
+        if skipping:
+            skipping = line.rstrip().endswith("\\")
+            continue
+        match = _SETTING_RE.match(line)
+        if match and match.group(1) in overrides:
+            skipping = line.rstrip().endswith("\\")
+            continue
+        lines.append(line)
+    lines.append("")
+    lines.append("# Settings generated by DocGen")
+    for key, values in overrides.items():
+        lines.append(_format_setting(key, values))
     return "\n".join(lines) + "\n"
 
 
+def _format_setting(key: str, values: list[str]) -> str:
+    quoted = [_quote(value) for value in values]
+    head = f"{key:<22} ="
+    if len(quoted) <= 1:
+        return f"{head} {quoted[0] if quoted else ''}".rstrip()
+    continuation = " \\\n" + " " * (len(head) + 1)
+    return f"{head} {continuation.join(quoted)}"
+
+
+def _quote(value: str) -> str:
+    if value and not any(ch.isspace() or ch in '"\\#' for ch in value):
+        return value
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def doxygen_overrides(repo_path: Path, template: str, config: DocGenConfig | None) -> dict[str, list[str]]:
+    """Settings DocGen forces on the template Doxyfile.
+
+    With a config, INPUT lists exactly the files DocGen's walk keeps (filtered
+    by the template's FILE_PATTERNS) and EXCLUDE / EXCLUDE_PATTERNS mirror the
+    excluder, so Doxygen never crawls excluded trees itself.
+    """
+    threads = str(os.cpu_count() or 1)
+    overrides: dict[str, list[str]] = {
+        "PROJECT_NAME": [repo_path.name],
+        "NUM_PROC_THREADS": [threads],
+        "DOT_NUM_THREADS": [threads],
+    }
+    if config is None:
+        return overrides
+
+    settings = parse_doxyfile(template)
+    patterns = _build_excludes(config.exclude, _normalize_output_dir(config.output_dir))
+    excluder = build_excluder(patterns)
+    file_patterns = settings.get("FILE_PATTERNS") or []
+    files, _ = walk_repo(repo_path, excluder)
+    inputs = [path.as_posix() for path in files if _is_doxygen_input(path, file_patterns)]
+
+    # Doxygen matches EXCLUDE_PATTERNS against absolute paths: anchor them
+    # on the repo so a parent directory named like an excluded one is safe.
+    root = repo_path.resolve().as_posix()
+    exclude_patterns = list(settings.get("EXCLUDE_PATTERNS") or [])
+    for name in sorted(excluder.dir_names):
+        exclude_patterns.extend([f"{root}/{name}/*", f"{root}/*/{name}/*"])
+    for name in sorted(excluder.file_names):
+        exclude_patterns.extend([f"{root}/{name}", f"{root}/*/{name}"])
+    if config.doxygen_api_index:
+        overrides["GENERATE_XML"] = ["YES"]
+    overrides.update(
+        {
+            "INPUT": inputs,
+            "RECURSIVE": ["NO"],
+            "EXCLUDE": [*excluder.dir_prefixes, *excluder.path_prefixes],
+            "EXCLUDE_PATTERNS": list(dict.fromkeys(exclude_patterns)),
+        }
+    )
+    return overrides
+
+
 def _ensure_output_dir(repo_path: Path, rendered: str) -> None:
     output_dir = None
     for line in rendered.splitlines():
@@ -64,31 +204,666 @@ def _ensure_output_dir(repo_path: Path, rendered: str) -> None:
     output_path.mkdir(parents=True, exist_ok=True)
 
 
-def run_doxygen(repo_path: Path) -> Path:
+def parse_doxyfile(text: str) -> dict[str, list[str]]:
+    """Parse ``KEY = values`` / ``KEY += values`` settings, with ``\\`` continuations."""
+    settings: dict[str, list[str]] = {}
+    pending = ""
+    for raw in text.splitlines():
+        line = pending + raw
+        if line.rstrip().endswith("\\"):
+            pending = line.rstrip()[:-1] + " "
+            continue
+        pending = ""
+        if line.lstrip().startswith("#"):
+            continue
+        match = _SETTING_RE.match(line)
+        if not match:
+            continue
+        key, operator, value = match.groups()
+        try:
+            values = shlex.split(value, comments=False, posix=True)
+        except ValueError:
+            values = value.split()
+        if operator == "+=":
+            settings.setdefault(key, []).extend(values)
+        else:
+            settings[key] = values
+    return settings
+
+
+def doxygen_fingerprint(repo_path: Path, rendered: str) -> str:
+    """Fingerprint a Doxygen run: the rendered Doxyfile, the doxygen binary and
+    the path, size and mtime of every file its INPUT / FILE_PATTERNS select.
+    """
+    settings = parse_doxyfile(rendered)
+    binary = shutil.which("doxygen")
+    binary_state = None
+    if binary:
+        try:
+            stat = Path(binary).stat()
+            binary_state = (binary, stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            binary_state = (binary, None, None)
+    return fingerprint(__version__, rendered, binary_state, list(_doxygen_inputs(repo_path, settings)))
+
+
+def _doxygen_inputs(repo_path: Path, settings: dict[str, list[str]]) -> Iterator[tuple[str, int, int]]:
+    output_dir = _output_path(repo_path, settings)
+    patterns = settings.get("FILE_PATTERNS") or []
+    exclude_patterns = settings.get("EXCLUDE_PATTERNS") or []
+    recursive = (settings.get("RECURSIVE") or ["NO"])[0].upper() == "YES"
+    excluded = {_absolute(repo_path, item) for item in settings.get("EXCLUDE") or []}
+    if output_dir is not None:
+        excluded.add(output_dir)
+    excluded.add(repo_path / ".git")
+
+    def skip(path: Path, is_dir: bool) -> bool:
+        if path in excluded:
+            return True
+        # A trailing slash lets ``*/build/*`` prune the directory itself.
+        text = path.as_posix() + ("/" if is_dir else "")
+        return any(fnmatchcase(text, pattern) for pattern in exclude_patterns)
+
+    def walk(directory: Path, file_patterns: list[str], recurse: bool) -> Iterator[tuple[str, int, int]]:
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            return
+        for entry in entries:
+            path = Path(entry.path)
+            is_dir = entry.is_dir(follow_symlinks=False)
+            if skip(path, is_dir):
+                continue
+            if is_dir:
+                if recurse:
+                    yield from walk(path, file_patterns, recurse)
+                continue
+            if file_patterns and not any(fnmatchcase(entry.name, pattern) for pattern in file_patterns):
+                continue
+            yield _file_state(repo_path, path)
+
+    roots = [(item, patterns, recursive) for item in settings.get("INPUT") or ["."]]
+    for key in _EXTRA_INPUT_SETTINGS:
+        roots.extend((item, [], True) for item in settings.get(key) or [])
+    for item, file_patterns, recurse in roots:
+        path = _absolute(repo_path, item)
+        if path.is_dir():
+            yield from walk(path, file_patterns, recurse)
+        elif path.is_file():
+            yield _file_state(repo_path, path)
+
+
+def _file_state(repo_path: Path, path: Path) -> tuple[str, int, int]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return (path.as_posix(), -1, -1)
+    try:
+        rel = path.relative_to(repo_path).as_posix()
+    except ValueError:
+        rel = path.as_posix()
+    return (rel, stat.st_size, stat.st_mtime_ns)
+
+
+def _absolute(repo_path: Path, value: str) -> Path:
+    path = Path(value)
+    return path if path.is_absolute() else repo_path / path
+
+
+def _output_path(repo_path: Path, settings: dict[str, list[str]]) -> Path | None:
+    values = settings.get("OUTPUT_DIRECTORY")
+    if not values:
+        return None
+    return _absolute(repo_path, values[0])
+
+
+def _read_stamp(path: Path) -> str | None:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    value = data.get("fingerprint") if isinstance(data, dict) else None
+    return value if isinstance(value, str) else None
+
+
+def _write_stamp(path: Path, key: str) -> None:
+    try:
+        path.write_text(json.dumps({"fingerprint": key}) + "\n", encoding="utf-8")
+    except OSError:
+        pass
+
+
+def _is_doxygen_input(path: Path, file_patterns: list[str]) -> bool:
+    if not file_patterns:
+        return _is_code_file(path.as_posix())
+    return any(fnmatchcase(path.name, pattern) for pattern in file_patterns)
+
+
+def prepare_doxyfile(repo_path: Path, config: DocGenConfig | None = None) -> tuple[Path, str]:
+    """Return the Doxyfile template used for ``repo_path`` and its rendered text."""
     template_path = find_doxyfile(repo_path)
     if not template_path:
         raise DocGenIOError(
             "Doxyfile template not found (expected DocGen Doxyfile or repo Doxyfile)."
         )
-    if shutil.which("doxygen") is None:
-        raise DocGenIOError("Doxygen not found in PATH. Install it to use --doxygen.")
-
-    project_name = repo_path.name
     template_text = template_path.read_text(encoding="utf-8", errors="ignore")
-    rendered = _render_doxyfile(template_text, project_name)
-    _ensure_output_dir(repo_path, rendered)
-    temp_path = repo_path / ".docgen.Doxyfile"
+    overrides = doxygen_overrides(repo_path, template_text, config)
+    return template_path, _render_doxyfile(template_text, overrides)
+
+
+def doxygen_output_dir(repo_path: Path) -> Path | None:
+    """OUTPUT_DIRECTORY of the template Doxyfile (DocGen never overrides it)."""
+    return _output_path(repo_path, _template_settings(repo_path))
+
 
+def doxygen_xml_dirs(repo_path: Path) -> list[Path]:
+    """XML output directories of the last run: one, or one per shard."""
+    settings = _template_settings(repo_path)
+    output = _output_path(repo_path, settings)
+    if output is None:
+        return []
+    xml_output = (settings.get("XML_OUTPUT") or ["xml"])[0]
+    candidates = [output / xml_output, *sorted(output.glob(f"shard-*/{xml_output}"))]
+    return [path for path in candidates if (path / "index.xml").is_file()]
+
+
+def _template_settings(repo_path: Path) -> dict[str, list[str]]:
+    template_path = find_doxyfile(repo_path)
+    if template_path is None:
+        return {}
     try:
-        temp_path.write_text(rendered, encoding="utf-8")
-        subprocess.run(["doxygen", str(temp_path)], cwd=repo_path, check=True)
-    except subprocess.CalledProcessError as exc:
-        raise DocGenIOError("Doxygen failed. See output above.") from exc
-    finally:
+        return parse_doxyfile(template_path.read_text(encoding="utf-8", errors="ignore"))
+    except OSError:
+        return {}
+
+
+def doxygen_stamp(repo_path: Path, rendered: str) -> Path:
+    """Where the fingerprint of the last successful run is kept (inside its output)."""
+    output = _output_path(repo_path, parse_doxyfile(rendered)) or repo_path
+    return output / DOXYGEN_STAMP
+
+
+def doxygen_up_to_date(repo_path: Path, rendered: str, shards: int = 1) -> tuple[bool, str]:
+    key = doxygen_fingerprint(repo_path, rendered)
+    if shards > 1:
+        key = fingerprint(key, "shards", shards)
+    return _read_stamp(doxygen_stamp(repo_path, rendered)) == key, key
+
+
+def _stage(repo_path: Path, rendered: str) -> tuple[Path | None, str]:
+    """Point ``rendered`` at an empty staging directory next to its output.
+
+    Returns the staging path (None when the output is the repo itself and
+    can't be swapped) and the Doxyfile text writing there.
+    """
+    settings = parse_doxyfile(rendered)
+    output = _output_path(repo_path, settings)
+    if output is None or output.resolve() == repo_path.resolve():
+        return None, rendered
+    raw = posixpath.normpath(settings["OUTPUT_DIRECTORY"][0])
+    value = posixpath.join(posixpath.dirname(raw), f".{posixpath.basename(raw)}{STAGING_SUFFIX}")
+    staging = _absolute(repo_path, value)
+    _discard(staging)
+    return staging, _render_doxyfile(rendered, {"OUTPUT_DIRECTORY": [value]})
+
+
+def _publish_output(repo_path: Path, rendered: str, staging: Path | None, key: str) -> None:
+    """Swap a finished staging directory in place of the output, then stamp it.
+
+    Files identical to the previous output are hard-linked to it first, so
+    unchanged pages keep their inode and mtime.
+    """
+    output = _output_path(repo_path, parse_doxyfile(rendered))
+    if staging is not None and output is not None:
         try:
-            if temp_path.exists():
-                temp_path.unlink()
+            linked = _link_unchanged(output, staging)
+            _swap_dirs(staging, output)
+        except OSError as exc:
+            raise DocGenIOError(f"Failed to publish Doxygen output to {output}: {exc}") from exc
+        get_logger().debug("doxygen: %d unchanged files hard-linked from the previous output", linked)
+    _write_stamp(doxygen_stamp(repo_path, rendered), key)
+
+
+def _link_unchanged(previous: Path, staging: Path) -> int:
+    if not previous.is_dir():
+        return 0
+    linked = 0
+    for directory, _, names in os.walk(staging):
+        rel = Path(directory).relative_to(staging)
+        for name in names:
+            staged = Path(directory) / name
+            old = previous / rel / name
+            try:
+                if old.stat().st_size != staged.stat().st_size or not filecmp.cmp(old, staged, shallow=False):
+                    continue
+                temp = staged.with_name(f".{name}.{secrets.token_hex(4)}.link")
+                os.link(old, temp)
+            except OSError:
+                continue
+            os.replace(temp, staged)
+            linked += 1
+    return linked
+
+
+def _swap_dirs(staging: Path, output: Path) -> None:
+    """Replace ``output`` with ``staging`` using two renames on one filesystem.
+
+    The previous tree is only deleted once the new one is in place; if the
+    second rename fails it is moved back.
+    """
+    previous = output.with_name(f".{output.name}{PREVIOUS_SUFFIX}")
+    _discard(previous)
+    had_output = output.exists()
+    if had_output:
+        os.replace(output, previous)
+    try:
+        os.replace(staging, output)
+    except OSError:
+        if had_output:
+            os.replace(previous, output)
+        raise
+    _discard(previous)
+
+
+def _discard(path: Path | None) -> None:
+    if path is not None and path.exists():
+        shutil.rmtree(path, ignore_errors=True)
+
+
+class DoxygenJob:
+    """A Doxygen run in its own process group, streaming its output to the logger.
+
+    stdout and stderr are read on background threads: every line is logged at
+    debug level, warnings and parsed files are counted and errors are logged
+    as warnings.
+    ``wait()`` enforces the timeout and kills the whole group when it expires.
+    """
+
+    def __init__(
+        self,
+        repo_path: Path,
+        doxyfile: Path,
+        rendered: str,
+        key: str,
+        timeout: float | None = None,
+        label: str = "",
+        publish: bool = True,
+    ) -> None:
+        self.doxyfile = doxyfile
+        self.fingerprint = key
+        self.timeout = timeout
+        self.warnings = 0
+        self.errors = 0
+        self.parsed_files = 0
+        self._result: DoxygenRun | None = None
+        self._repo_path = repo_path
+        self._rendered = rendered
+        self._key = key
+        self._publish = publish
+        self._prefix = f"doxygen[{label}]" if label else "doxygen"
+        self._lock = threading.Lock()
+        # Outside the repo, so a running job never shows up in its snapshot.
+        self._temp_path: Path | None = None
+        self._staging, staged = _stage(repo_path, rendered) if publish else (None, rendered)
+
+        _ensure_output_dir(repo_path, staged)
+        try:
+            handle, name = tempfile.mkstemp(prefix=f"docgen-{label or 'doxygen'}-", suffix=".Doxyfile")
+            self._temp_path = Path(name)
+            with os.fdopen(handle, "w", encoding="utf-8") as stream:
+                stream.write(staged)
+            self._process = subprocess.Popen(
+                ["doxygen", str(self._temp_path)],
+                cwd=repo_path,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                errors="replace",
+                start_new_session=True,
+            )
+        except OSError as exc:
+            self._cleanup()
+            raise DocGenIOError(f"Failed to start Doxygen: {exc}") from exc
+        self._deadline = time.monotonic() + timeout if timeout else None
+        self._readers = [
+            threading.Thread(target=self._pump, args=(stream,), daemon=True)
+            for stream in (self._process.stdout, self._process.stderr)
+        ]
+        for reader in self._readers:
+            reader.start()
+
+    def wait(self) -> DoxygenRun:
+        if self._result is not None:
+            return self._result
+        try:
+            remaining = None
+            if self._deadline is not None:
+                remaining = max(0.0, self._deadline - time.monotonic())
+            try:
+                code = self._process.wait(timeout=remaining)
+            except subprocess.TimeoutExpired:
+                self._kill()
+                raise DocGenIOError(
+                    f"Doxygen timed out after {self.timeout:g}s; its process group was killed."
+                ) from None
+            for reader in self._readers:
+                reader.join()
+            if code != 0:
+                raise DocGenIOError(
+                    f"Doxygen failed with exit code {code} "
+                    f"({self.errors} errors, {self.warnings} warnings). Run with -v for its output."
+                )
+            if self._publish:
+                _publish_output(self._repo_path, self._rendered, self._staging, self._key)
+            self._result = DoxygenRun(
+                doxyfile=self.doxyfile,
+                ran=True,
+                fingerprint=self._key,
+                warnings=self.warnings,
+                errors=self.errors,
+                parsed_files=self.parsed_files,
+            )
+            return self._result
+        finally:
+            self._cleanup()
+
+    def cancel(self) -> None:
+        self._kill()
+        self._cleanup()
+
+    def _pump(self, stream: IO[str] | None) -> None:
+        if stream is None:
+            return
+        logger = get_logger()
+        with stream:
+            for raw in stream:
+                line = raw.rstrip("\n")
+                if _WARNING_RE.search(line):
+                    with self._lock:
+                        self.warnings += 1
+                    logger.debug("%s: %s", self._prefix, line)
+                elif _ERROR_RE.search(line):
+                    with self._lock:
+                        self.errors += 1
+                    logger.warning("%s: %s", self._prefix, line)
+                else:
+                    if line.startswith("Parsing file"):
+                        with self._lock:
+                            self.parsed_files += 1
+                    logger.debug("%s: %s", self._prefix, line)
+
+    def _kill(self) -> None:
+        process = self._process
+        if process.poll() is not None:
+            return
+        self._signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=KILL_GRACE)
+        except subprocess.TimeoutExpired:
+            self._signal(getattr(signal, "SIGKILL", signal.SIGTERM))
+            process.wait()
+
+    def _signal(self, sig: int) -> None:
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(self._process.pid, sig)
+            else:  # pragma: no cover - no process groups on Windows
+                self._process.send_signal(sig)
+        except ProcessLookupError:
+            pass
+
+    def _cleanup(self) -> None:
+        try:
+            if self._temp_path is not None:
+                self._temp_path.unlink(missing_ok=True)
         except OSError:
             pass
+        _discard(self._staging)
+
+
+def split_shards(inputs: list[str], shards: int) -> list[DoxygenShard]:
+    """Group ``inputs`` by top-level component and spread them over ``shards``.
+
+    Components are never split; the largest go first, each to the shard with
+    the fewest files so far. Empty shards are dropped.
+    """
+    components: dict[str, list[str]] = {}
+    for path in inputs:
+        head, sep, _ = path.partition("/")
+        components.setdefault(head if sep else ".", []).append(path)
+    bins: list[tuple[list[str], list[str]]] = [([], []) for _ in range(max(shards, 1))]
+    for name, files in sorted(components.items(), key=lambda item: (-len(item[1]), item[0])):
+        names, members = min(bins, key=lambda item: len(item[1]))
+        names.append(name)
+        members.extend(files)
+    return [
+        DoxygenShard(name=f"shard-{index}", components=sorted(names), inputs=members)
+        for index, (names, members) in enumerate((item for item in bins if item[1]), start=1)
+    ]
+
+
+def _shard_doxyfiles(
+    repo_path: Path,
+    rendered: str,
+    shards: list[DoxygenShard],
+) -> tuple[list[tuple[str, str]], list[tuple[str, str]]]:
+    """Doxyfiles of both passes of a sharded run, as ``(label, text)`` pairs.
+
+    The tag pass only writes ``<output>/tags/<shard>.tag``; the docs pass
+    renders each shard into ``<output>/<shard>/`` with the other shards' tag
+    files in TAGFILES, linked relative to its own HTML directory.
+    """
+    settings = parse_doxyfile(rendered)
+    base = (settings.get("OUTPUT_DIRECTORY") or ["."])[0]
+    html_output = (settings.get("HTML_OUTPUT") or ["html"])[0]
+    threads = str(max(1, (os.cpu_count() or 1) // len(shards)))
+
+    def output(shard: DoxygenShard) -> str:
+        return posixpath.join(base, shard.name)
+
+    def tag(shard: DoxygenShard) -> str:
+        return posixpath.join(base, "tags", f"{shard.name}.tag")
+
+    def html(shard: DoxygenShard) -> str:
+        return posixpath.normpath(posixpath.join(output(shard), html_output))
+
+    tag_pass: list[tuple[str, str]] = []
+    docs_pass: list[tuple[str, str]] = []
+    for shard in shards:
+        common = {
+            "PROJECT_NAME": [f"{repo_path.name} ({', '.join(shard.components)})"],
+            "INPUT": shard.inputs,
+            "OUTPUT_DIRECTORY": [output(shard)],
+            "NUM_PROC_THREADS": [threads],
+            "DOT_NUM_THREADS": [threads],
+        }
+        tag_only = {key: ["NO"] for key in _OUTPUT_FORMATS}
+        tag_only.update({"HAVE_DOT": ["NO"], "GENERATE_TAGFILE": [tag(shard)], "TAGFILES": []})
+        tag_pass.append((shard.name, _render_doxyfile(rendered, {**common, **tag_only})))
+        links = [
+            f"{tag(other)}={posixpath.relpath(html(other), html(shard))}"
+            for other in shards
+            if other is not shard
+        ]
+        docs_pass.append(
+            (shard.name, _render_doxyfile(rendered, {**common, "GENERATE_TAGFILE": [], "TAGFILES": links}))
+        )
+    return tag_pass, docs_pass
+
+
+class ShardedDoxygenJob:
+    """Parallel Doxygen runs over disjoint components, cross-linked via tag files.
+
+    A first pass runs every shard at once with output disabled, only to write
+    its tag file; the second pass renders all shards in parallel with the
+    other shards' tags so cross-references resolve. Both passes run on a
+    background thread; ``wait()`` joins it and then writes the index page
+    linking the shards and the stamp. Same interface as ``DoxygenJob``.
+    """
+
+    def __init__(
+        self,
+        repo_path: Path,
+        doxyfile: Path,
+        rendered: str,
+        key: str,
+        shards: list[DoxygenShard],
+        timeout: float | None = None,
+    ) -> None:
+        self.doxyfile = doxyfile
+        self.fingerprint = key
+        self.shards = shards
+        self.timeout = timeout
+        self.warnings = 0
+        self.errors = 0
+        self.parsed_files = 0
+        self._result: DoxygenRun | None = None
+        self._repo_path = repo_path
+        self._rendered = rendered
+        self._key = key
+        self._staging, self._staged = _stage(repo_path, rendered)
+        self._passes = _shard_doxyfiles(repo_path, self._staged, shards)
+        self._lock = threading.Lock()
+        self._active: list[DoxygenJob] = []
+        self._cancelled = False
+        self._error: BaseException | None = None
+
+        output = _output_path(repo_path, parse_doxyfile(self._staged)) or repo_path
+        try:
+            (output / "tags").mkdir(parents=True, exist_ok=True)
+        except OSError as exc:
+            _discard(self._staging)
+            raise DocGenIOError(f"Failed to create Doxygen output directory: {output}") from exc
+        self._deadline = time.monotonic() + timeout if timeout else None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def wait(self) -> DoxygenRun:
+        if self._result is not None:
+            return self._result
+        remaining = None
+        if self._deadline is not None:
+            remaining = max(0.0, self._deadline - time.monotonic())
+        self._thread.join(remaining)
+        if self._thread.is_alive():
+            self.cancel()
+            raise DocGenIOError(
+                f"Doxygen timed out after {self.timeout:g}s; its process groups were killed."
+            )
+        try:
+            if self._error is not None:
+                raise self._error
+            self._write_index()
+            _publish_output(self._repo_path, self._rendered, self._staging, self._key)
+        finally:
+            _discard(self._staging)
+        self._result = DoxygenRun(
+            doxyfile=self.doxyfile,
+            ran=True,
+            fingerprint=self._key,
+            warnings=self.warnings,
+            errors=self.errors,
+            parsed_files=self.parsed_files,
+        )
+        return self._result
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._cancelled = True
+            active = list(self._active)
+        for job in active:
+            job.cancel()
+        self._thread.join()
+        _discard(self._staging)
+
+    def _run(self) -> None:
+        tag_pass, docs_pass = self._passes
+        try:
+            self._run_pass(tag_pass, count_warnings=False)
+            self._run_pass(docs_pass, count_warnings=True)
+        except BaseException as exc:  # re-raised by wait()
+            self._error = exc
+
+    def _run_pass(self, doxyfiles: list[tuple[str, str]], count_warnings: bool) -> None:
+        jobs: list[DoxygenJob] = []
+        try:
+            for label, text in doxyfiles:
+                with self._lock:
+                    if self._cancelled:
+                        raise DocGenIOError("Doxygen run cancelled.")
+                    job = DoxygenJob(
+                        self._repo_path, self.doxyfile, text, self._key, label=label, publish=False
+                    )
+                    self._active.append(job)
+                jobs.append(job)
+            for job in jobs:
+                run = job.wait()
+                self.errors += run.errors
+                if count_warnings:
+                    self.warnings += run.warnings
+                    self.parsed_files += run.parsed_files
+        except BaseException:
+            for job in jobs:
+                job.cancel()
+            raise
+        finally:
+            with self._lock:
+                self._active.clear()
+
+    def _write_index(self) -> None:
+        settings = parse_doxyfile(self._staged)
+        if (settings.get("GENERATE_HTML") or ["YES"])[0].upper() != "YES":
+            return
+        output = _output_path(self._repo_path, settings) or self._repo_path
+        html_output = (settings.get("HTML_OUTPUT") or ["html"])[0]
+        items = "\n".join(
+            f'<li><a href="{escape(posixpath.normpath(posixpath.join(shard.name, html_output, "index.html")))}">'
+            f"{escape(', '.join(shard.components))}</a></li>"
+            for shard in self.shards
+        )
+        title = escape(f"{self._repo_path.name} API")
+        page = (
+            f'<!DOCTYPE html>\n<html>\n<head><meta charset="utf-8"><title>{title}</title></head>\n'
+            f"<body>\n<h1>{title}</h1>\n<ul>\n{items}\n</ul>\n</body>\n</html>\n"
+        )
+        try:
+            write_text_atomic(output / "index.html", page)
+        except OSError as exc:
+            raise DocGenIOError(f"Failed to write Doxygen index: {output / 'index.html'}") from exc
+
+
+def start_doxygen(
+    repo_path: Path,
+    config: DocGenConfig | None = None,
+    force: bool = False,
+    shards: int = 1,
+) -> DoxygenJob | ShardedDoxygenJob | DoxygenRun:
+    """Launch Doxygen in the background, or return at once when it is up to date.
+
+    With ``shards > 1`` (and a config, so INPUT is known) the scanned files
+    are split by top-level component over that many parallel runs.
+    """
+    template_path, rendered = prepare_doxyfile(repo_path, config)
+    if shutil.which("doxygen") is None:
+        raise DocGenIOError("Doxygen not found in PATH. Install it to use --doxygen.")
+
+    up_to_date, key = doxygen_up_to_date(repo_path, rendered, shards)
+    if up_to_date and not force:
+        return DoxygenRun(doxyfile=template_path, ran=False, fingerprint=key)
+    timeout = (config.doxygen_timeout if config is not None else 0) or None
+    parts = split_shards(parse_doxyfile(rendered).get("INPUT") or [], shards) if config else []
+    if len(parts) > 1:
+        return ShardedDoxygenJob(repo_path, template_path, rendered, key, parts, timeout=timeout)
+    return DoxygenJob(repo_path, template_path, rendered, key, timeout=timeout)
+
 
-    return template_path
+def run_doxygen(
+    repo_path: Path,
+    config: DocGenConfig | None = None,
+    force: bool = False,
+    shards: int = 1,
+) -> DoxygenRun:
+    """Run Doxygen unless its inputs are unchanged since the last successful run."""
+    job = start_doxygen(repo_path, config, force=force, shards=shards)
+    return job if isinstance(job, DoxygenRun) else job.wait()
@@ -0,0 +1,130 @@
+"""Build manifest persisted next to the generated documentation."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import json
+from pathlib import Path
+from typing import Any
+
+from .. import __version__
+from ..models import ProjectInfo
+from ..rendering import write_text_atomic
+from ..services.scan_service import _normalize_output_dir
+
+MANIFEST_NAME = ".docgen-manifest.json"
+MANIFEST_FORMAT = 1
+PROJECT_NAME = ".docgen-project.json"
+PROJECT_FORMAT = 1
+
+
+@dataclass
+class BuildManifest:
+    """Fingerprints recorded by the last successful build.
+
+    ``targets`` maps a target path (relative to the repo) to its layout
+    fingerprint and an ordered list of its managed sections, each with the
+    fingerprint of the inputs it was rendered from and of the body written,
+    plus the hash of the whole output file. ``build`` fingerprints everything
+    the build depended on (see ``context_service.build_fingerprints``).
+    ``modules`` maps each module page to the fingerprint it was rendered from.
+    With ``git_incremental``, ``settings`` fingerprints the build inputs other
+    than the files, and ``git_head`` / ``git_dirty`` record the commit and the
+    uncommitted paths (with their size and mtime) the build saw.
+    """
+
+    targets: dict[str, dict[str, Any]] = field(default_factory=dict)
+    build: str | None = None
+    sections: list[str] = field(default_factory=list)
+    modules: dict[str, str] = field(default_factory=dict)
+    settings: str | None = None
+    git_head: str | None = None
+    git_dirty: dict[str, tuple[int, int] | None] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "format": MANIFEST_FORMAT,
+            "docgen_version": __version__,
+            "build": self.build,
+            "sections": list(self.sections),
+            "targets": self.targets,
+            "modules": self.modules,
+            "settings": self.settings,
+            "git_head": self.git_head,
+            "git_dirty": {path: list(stat) if stat else None for path, stat in self.git_dirty.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Any) -> "BuildManifest":
+        if not isinstance(data, dict):
+            return cls()
+        if data.get("format") != MANIFEST_FORMAT or data.get("docgen_version") != __version__:
+            return cls()
+        targets = data.get("targets")
+        if not isinstance(targets, dict):
+            return cls()
+        build = data.get("build")
+        sections = data.get("sections")
+        modules = data.get("modules")
+        settings = data.get("settings")
+        git_head = data.get("git_head")
+        git_dirty = data.get("git_dirty")
+        return cls(
+            targets={str(key): value for key, value in targets.items() if isinstance(value, dict)},
+            build=build if isinstance(build, str) else None,
+            sections=[str(item) for item in sections] if isinstance(sections, list) else [],
+            modules=(
+                {str(key): value for key, value in modules.items() if isinstance(value, str)}
+                if isinstance(modules, dict)
+                else {}
+            ),
+            settings=settings if isinstance(settings, str) else None,
+            git_head=git_head if isinstance(git_head, str) else None,
+            git_dirty=_git_dirty(git_dirty),
+        )
+
+
+def _git_dirty(value: Any) -> dict[str, tuple[int, int] | None]:
+    if not isinstance(value, dict):
+        return {}
+    dirty: dict[str, tuple[int, int] | None] = {}
+    for path, stat in value.items():
+        if isinstance(stat, list) and len(stat) == 2 and all(isinstance(item, int) for item in stat):
+            dirty[str(path)] = (stat[0], stat[1])
+        elif stat is None:
+            dirty[str(path)] = None
+    return dirty
+
+
+def manifest_path(repo_path: Path, output_dir: str) -> Path:
+    return repo_path / _normalize_output_dir(output_dir) / MANIFEST_NAME
+
+
+def load_manifest(path: Path) -> BuildManifest:
+    """Load the manifest; a missing, unreadable or outdated file yields an empty one."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return BuildManifest()
+    return BuildManifest.from_dict(data)
+
+
+def save_manifest(path: Path, manifest: BuildManifest) -> None:
+    content = json.dumps(manifest.to_dict(), indent=2, sort_keys=True) + "\n"
+    write_text_atomic(path, content)
+
+
+def project_path(repo_path: Path, output_dir: str) -> Path:
+    return repo_path / _normalize_output_dir(output_dir) / PROJECT_NAME
+
+
+def save_project(path: Path, project: ProjectInfo, build: str, code: dict[str, Any]) -> None:
+    """Keep the scan behind the last build (read by ``docgen catalog``)."""
+    payload = {
+        "format": PROJECT_FORMAT,
+        "docgen_version": __version__,
+        "build": build,
+        "project": project.to_dict(),
+        "code": code,
+    }
+    write_text_atomic(path, json.dumps(payload, indent=2, sort_keys=True) + "\n")
@@ -0,0 +1,91 @@
+"""Per-module documentation pages under ``<output_dir>/modules/``."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+import os
+from pathlib import Path
+from typing import Any
+
+from ..errors import DocGenIOError
+from ..rendering import render_template, template_fingerprints, write_text_atomic
+from ..utils.fingerprint import fingerprint
+
+MODULES_DIR = "modules"
+MODULE_TEMPLATE = "MODULE.md.j2"
+
+
+@dataclass(frozen=True)
+class ModulePagesReport:
+    written: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+
+
+def build_module_pages(
+    output_dir: Path,
+    modules: list[dict[str, Any]],
+    previous: dict[str, str],
+    dry_run: bool = False,
+    force: bool = False,
+) -> tuple[ModulePagesReport, dict[str, str]]:
+    """Render one page per module, rewriting only pages whose inputs changed.
+
+    ``previous`` maps page file names to the fingerprint they were rendered
+    from (as recorded in the build manifest); the updated mapping is returned.
+    Pages of modules that no longer exist are deleted, and so is the pages
+    directory once it is empty. Rendering runs in a thread pool.
+    """
+    pages_dir = output_dir / MODULES_DIR
+    states = page_fingerprints(modules)
+    outdated = set(stale_pages(pages_dir, states, previous))
+    stale = [module for module in modules if force or module["page"] in outdated]
+
+    def render(module: dict[str, Any]) -> None:
+        content = render_template(MODULE_TEMPLATE, {"module": module, "index_link": "../index.md"})
+        write_text_atomic(pages_dir / module["page"], content)
+
+    if not dry_run and stale:
+        workers = max(1, min(len(stale), os.cpu_count() or 1))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(render, stale))
+
+    removed = removed_pages(states, previous)
+    if not dry_run:
+        for page in removed:
+            try:
+                (pages_dir / page).unlink(missing_ok=True)
+            except OSError as exc:
+                raise DocGenIOError(f"Failed to remove stale module page: {pages_dir / page}") from exc
+        if removed and not states:
+            try:
+                pages_dir.rmdir()
+            except OSError:
+                pass  # not empty: files DocGen did not write
+
+    written = sorted(module["page"] for module in stale)
+    report = ModulePagesReport(
+        written=written,
+        unchanged=sorted(set(states) - set(written)),
+        removed=removed,
+    )
+    return report, states
+
+
+def page_fingerprints(modules: list[dict[str, Any]]) -> dict[str, str]:
+    template_key = template_fingerprints()[MODULE_TEMPLATE]
+    return {module["page"]: fingerprint(template_key, module) for module in modules}
+
+
+def stale_pages(pages_dir: Path, states: dict[str, str], previous: dict[str, str]) -> list[str]:
+    """Return the pages that are missing or were rendered from other inputs."""
+    return [
+        page
+        for page, key in states.items()
+        if previous.get(page) != key or not (pages_dir / page).exists()
+    ]
+
+
+def removed_pages(states: dict[str, str], previous: dict[str, str]) -> list[str]:
+    return sorted(page for page in previous if page not in states)
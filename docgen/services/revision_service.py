@@ -0,0 +1,113 @@
+"""Build the docs of a git revision without checking it out."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+import os
+from pathlib import Path
+import tempfile
+
+from ..config import load_config
+from ..errors import DocGenIOError, RepoError
+from ..logging import get_logger
+from ..utils.code_inspect import MAX_FILE_BYTES, _is_code_file
+from ..utils.git import BlobReader, TreeEntry, list_tree, resolve_commit
+from ..utils.ignore import build_excluder
+from .build_service import BuildPlan, build_docs
+from .scan_service import PACKAGE_MANIFESTS, _build_excludes, _normalize_output_dir
+
+# Files whose content the scan reads (besides code files); every other file
+# only needs to exist with the right size.
+READ_FILES = PACKAGE_MANIFESTS | {"requirements.txt", "docgen.yaml"}
+
+
+def build_revision(
+    repo_path: Path,
+    rev: str,
+    out_dir: Path,
+    config_path: Path | None = None,
+    dry_run: bool = False,
+    force: bool = False,
+    only_sections: list[str] | None = None,
+) -> BuildPlan:
+    """Build the docs of ``rev`` into ``out_dir``; the working tree, index and HEAD are untouched.
+
+    The tree is listed with ``git ls-tree -r -l`` and only the blobs the
+    scan reads (manifests and code files) are streamed through one
+    ``git cat-file --batch`` process into a private temporary tree; other
+    files become empty sparse files of the right size, so the usual scan
+    and analysis pipeline sees the revision's layout. (The walk, the
+    manifest parsers, the code analysis and the config loader all read
+    through the filesystem; the private tree is what lets them run
+    unchanged.) The config is the revision's ``docgen.yaml`` unless
+    ``config_path`` is given.
+
+    The build is identified by ``<repo>@<rev> (<commit>)`` rather than by
+    the temporary path, so rebuilding the same commit into ``out_dir`` is
+    up to date, and the scan stays out of the user cache.
+    """
+    resolved = resolve_commit(repo_path, rev)
+    entries = list_tree(repo_path, resolved[0]) if resolved else None
+    if resolved is None or entries is None:
+        raise RepoError(f"Unknown git revision: {rev}")
+    commit, timestamp = resolved
+
+    with tempfile.TemporaryDirectory(prefix="docgen-rev-") as temp:
+        root = Path(temp) / repo_path.name
+        root.mkdir()
+        with BlobReader(repo_path) as reader:
+            # The config decides what is excluded, so it comes first.
+            config_entries = [entry for entry in entries if entry.path == "docgen.yaml" and config_path is None]
+            read = _materialize(root, config_entries, reader, timestamp)
+            config = load_config(root, config_path, require_exists=config_path is not None)
+            config = replace(config, output_dir=out_dir.as_posix(), readme_target="output")
+            excluder = build_excluder(_build_excludes(config.exclude, _normalize_output_dir(config.output_dir)))
+            selected = [
+                entry
+                for entry in entries
+                if entry not in config_entries and not excluder.is_excluded(entry.path, is_dir=False)
+            ]
+            read += _materialize(root, selected, reader, timestamp)
+        get_logger().debug("rev %s: %d files, %d blobs read", commit[:12], len(selected), read)
+        return build_docs(
+            root,
+            config,
+            dry_run=dry_run,
+            force=force,
+            only_sections=only_sections,
+            repo_label=f"{repo_path.as_posix()}@{rev} ({commit[:12]})",
+            user_cache=False,
+        )
+
+
+def _needs_content(entry: TreeEntry) -> bool:
+    name = entry.path.rpartition("/")[2]
+    if name in READ_FILES:
+        return True
+    return _is_code_file(entry.path) and entry.size <= MAX_FILE_BYTES
+
+
+def _materialize(root: Path, entries: list[TreeEntry], reader: BlobReader, timestamp: int) -> int:
+    """Write ``entries`` below ``root``: needed blobs in full, the rest as sparse placeholders.
+
+    Returns the number of blobs read.
+    """
+    paths_by_oid: dict[str, list[Path]] = {}
+    try:
+        for entry in entries:
+            path = root / entry.path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if _needs_content(entry):
+                paths_by_oid.setdefault(entry.oid, []).append(path)
+                continue
+            with open(path, "wb") as handle:
+                handle.truncate(entry.size)
+            os.utime(path, (timestamp, timestamp))
+        for oid, content in reader.read(paths_by_oid):
+            for path in paths_by_oid[oid]:
+                path.write_bytes(content)
+                os.utime(path, (timestamp, timestamp))
+    except OSError as exc:
+        raise DocGenIOError(f"Failed to read the revision's files: {exc}") from exc
+    return len(paths_by_oid)
+
@@ -2,23 +2,65 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 import json
+import os
 from pathlib import Path
+import posixpath
+import re
 from typing import Any
 
-import tomllib
-
+from .. import __version__
 from ..config import DocGenConfig
 from ..errors import DocGenIOError
-from ..models import Commands, DetectedFile, DocsInfo, ProjectInfo, StackInfo
+from ..models import Commands, DetectedFile, DocsInfo, PackageInfo, ProjectInfo, StackInfo
+from ..utils.cache import cache_dir
+from ..utils.fingerprint import fingerprint
+from ..utils.graphs import build_order, cluster_graph
 from ..utils.ignore import build_excluder
+from ..utils.manifest_store import ManifestStore, manifest_store
 from ..utils.walk import walk_repo
 
 COMPOSE_FILES = {"docker-compose.yml", "docker-compose.yaml", "compose.yml", "compose.yaml"}
 NODE_LOCKFILES = ["pnpm-lock.yaml", "yarn.lock", "package-lock.json"]
-
-
-def scan_repo(repo_path: Path, config: DocGenConfig) -> ProjectInfo:
+# Files that make their directory a package root in workspace mode.
+PACKAGE_MANIFESTS = frozenset(
+    {
+        "package.json",
+        "pyproject.toml",
+        "setup.py",
+        "Cargo.toml",
+        "go.mod",
+        "pom.xml",
+        "build.gradle",
+        "build.gradle.kts",
+        "composer.json",
+        "Gemfile",
+    }
+)
+PACKAGES_CACHE_FORMAT = 2
+MAX_PACKAGE_GRAPH_NODES = 40
+MAX_PACKAGE_GRAPH_EDGES = 120
+MAX_BUILD_ORDER_ROWS = 200
+NODE_DEPENDENCY_SECTIONS = ("dependencies", "devDependencies", "peerDependencies", "optionalDependencies")
+CARGO_DEPENDENCY_SECTIONS = ("dependencies", "dev-dependencies", "build-dependencies")
+
+_REQUIREMENT_NAME_RE = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+_NAME_SEPARATORS_RE = re.compile(r"[-_.]+")
+
+
+def scan_repo(
+    repo_path: Path,
+    config: DocGenConfig,
+    changed: frozenset[str] | None = None,
+    user_cache: bool = True,
+) -> ProjectInfo:
+    """Scan ``repo_path``.
+
+    ``changed`` holds the paths touched since the last build when git knows
+    them; workspace packages outside it are reused from the cache unchecked.
+    With ``user_cache=False`` parsed manifests and packages stay in memory.
+    """
     output_dir = _normalize_output_dir(config.output_dir)
     docs = DocsInfo(
         readme_path=f"{output_dir}/README.md",
@@ -39,18 +81,12 @@ def scan_repo(repo_path: Path, config: DocGenConfig) -> ProjectInfo:
     files_detected, ci = _detect_key_files(repo_path, rel_files, output_dir)
 
     warnings: list[str] = []
-    package_manager, node_scripts = _read_node_scripts(repo_path, rel_files, warnings)
-    python_info = _read_python_info(repo_path, rel_files, warnings)
-    docker_info = _read_docker_info(rel_files)
-
-    stacks = _build_stacks(rel_files, package_manager, python_info, docker_info)
-    commands = _build_commands(
-        repo_path=repo_path,
-        node_scripts=node_scripts,
-        package_manager=package_manager,
-        python_info=python_info,
-        docker_info=docker_info,
-    )
+    store = manifest_store(repo_path, persistent=user_cache)
+    package_manager, python_info, stacks, commands = _analyze_files(repo_path, rel_files, warnings, store)
+    packages: list[PackageInfo] = []
+    if config.workspace:
+        packages = scan_packages(repo_path, rel_files, store, package_manager, changed, user_cache)
+    store.save()
 
     if not rel_files:
         warnings.append("Repository appears empty or fully excluded.")
@@ -68,9 +104,346 @@ def scan_repo(repo_path: Path, config: DocGenConfig) -> ProjectInfo:
         package_manager=package_manager,
         python_tooling=python_info.tool,
         warnings=sorted(set(warnings)),
+        packages=packages,
     )
 
 
+def _analyze_files(
+    root: Path,
+    rel_files: list[str],
+    warnings: list[str],
+    store: ManifestStore,
+    default_manager: str | None = None,
+) -> tuple[str | None, "PythonInfo", list[StackInfo], Commands]:
+    """Detect stacks and commands from ``rel_files`` (relative to ``root``)."""
+    package_manager, node_scripts = _read_node_scripts(root, rel_files, warnings, store, default_manager)
+    python_info = _read_python_info(root, rel_files, warnings, store)
+    docker_info = _read_docker_info(rel_files)
+
+    stacks = _build_stacks(rel_files, package_manager, python_info, docker_info)
+    commands = _build_commands(
+        repo_path=root,
+        rel_files=rel_files,
+        node_scripts=node_scripts,
+        package_manager=package_manager,
+        python_info=python_info,
+        docker_info=docker_info,
+        store=store,
+        warnings=warnings,
+    )
+    return package_manager, python_info, stacks, commands
+
+
+def find_package_roots(rel_files: list[str]) -> list[str]:
+    """Directories (below the root) holding a package manifest, in one pass."""
+    roots = {
+        directory
+        for directory, _, name in (path.rpartition("/") for path in rel_files)
+        if directory and name in PACKAGE_MANIFESTS
+    }
+    return sorted(roots)
+
+
+def scan_packages(
+    repo_path: Path,
+    rel_files: list[str],
+    store: ManifestStore,
+    default_manager: str | None = None,
+    changed: frozenset[str] | None = None,
+    user_cache: bool = True,
+) -> list[PackageInfo]:
+    """Scan every package of a workspace in parallel, with its own stacks and commands.
+
+    Each file belongs to its deepest package root. Results are cached per
+    package in the user cache (unless ``user_cache`` is False) and reused
+    while the paths, sizes and mtimes of the package's files are unchanged. With ``changed`` (from git), a
+    package none of whose files changed is reused without a single stat.
+    """
+    roots = find_package_roots(rel_files)
+    if not roots:
+        return []
+    members = _package_members(roots, rel_files)
+    cache_file = _packages_cache_file(repo_path) if user_cache else None
+    cached = _load_packages_cache(cache_file)
+    touched = _package_members(roots, sorted(changed)) if changed is not None else None
+
+    keys: dict[str, str] = {}
+    results: dict[str, PackageInfo] = {}
+    for root in roots:
+        entry = cached.get(root)
+        reusable = isinstance(entry, dict) and entry.get("manager") == default_manager
+        if touched is not None and not touched[root] and reusable:
+            keys[root] = str(entry["key"])
+        else:
+            keys[root] = _package_key(repo_path, root, members[root], default_manager)
+        package = _cached_package(entry, keys[root])
+        if package is not None:
+            results[root] = package
+    stale = [root for root in roots if root not in results]
+
+    def scan(root: str) -> PackageInfo:
+        return _scan_package(repo_path, root, members[root], store, default_manager)
+
+    if stale:
+        with ThreadPoolExecutor(max_workers=max(1, min(len(stale), os.cpu_count() or 1))) as executor:
+            results.update(zip(stale, executor.map(scan, stale)))
+        _save_packages_cache(
+            cache_file,
+            {
+                root: {"key": keys[root], "manager": default_manager, "info": results[root].to_dict()}
+                for root in roots
+            },
+        )
+    return [results[root] for root in roots]
+
+
+def _package_members(roots: list[str], rel_files: list[str]) -> dict[str, list[str]]:
+    """Map each root to its files (relative to it), excluding nested packages."""
+    root_set = set(roots)
+    members: dict[str, list[str]] = {root: [] for root in roots}
+    for path in rel_files:
+        parent = path
+        while "/" in parent:
+            parent = parent.rpartition("/")[0]
+            if parent in root_set:
+                members[parent].append(path[len(parent) + 1:])
+                break
+    return members
+
+
+def _package_key(repo_path: Path, root: str, files: list[str], default_manager: str | None) -> str:
+    states: list[tuple[str, int, int]] = []
+    for rel in files:
+        try:
+            stat = (repo_path / root / rel).stat()
+        except OSError:
+            continue
+        states.append((rel, stat.st_size, stat.st_mtime_ns))
+    return fingerprint(__version__, root, default_manager, states)
+
+
+def _scan_package(
+    repo_path: Path,
+    root: str,
+    files: list[str],
+    store: ManifestStore,
+    default_manager: str | None,
+) -> PackageInfo:
+    package_path = repo_path / root
+    warnings: list[str] = []
+    package_manager, python_info, stacks, commands = _analyze_files(
+        package_path, files, warnings, store, default_manager
+    )
+    dependencies, path_dependencies = _package_dependencies(package_path, root, files, store)
+    return PackageInfo(
+        path=root,
+        name=_package_name(package_path, files, store),
+        stacks=sorted(stacks, key=lambda item: item.name),
+        commands=commands,
+        file_count=len(files),
+        package_manager=package_manager,
+        python_tooling=python_info.tool,
+        warnings=sorted(set(warnings)),
+        dependencies=dependencies,
+        path_dependencies=path_dependencies,
+    )
+
+
+def _package_dependencies(
+    package_path: Path,
+    root: str,
+    files: list[str],
+    store: ManifestStore,
+) -> tuple[list[str], list[str]]:
+    """Dependency names and path dependencies (repo-relative) declared by the manifests."""
+    present = set(files)
+    names: set[str] = set()
+    paths: set[str] = set()
+
+    def add_path(value: Any) -> None:
+        if isinstance(value, str) and value:
+            resolved = posixpath.normpath(posixpath.join(root, value))
+            if resolved != ".." and not resolved.startswith("../"):
+                paths.add(resolved)
+
+    if "package.json" in present:
+        data = store.json(package_path / "package.json")
+        if isinstance(data, dict):
+            for section in NODE_DEPENDENCY_SECTIONS:
+                deps = data.get(section)
+                if not isinstance(deps, dict):
+                    continue
+                for name, spec in deps.items():
+                    names.add(str(name))
+                    if isinstance(spec, str) and spec.startswith(("file:", "link:")):
+                        add_path(spec.partition(":")[2])
+    if "pyproject.toml" in present:
+        data = store.toml(package_path / "pyproject.toml")
+        names.update(
+            match.group(1)
+            for match in map(_REQUIREMENT_NAME_RE.match, _collect_pyproject_deps(data))
+            if match
+        )
+        poetry = (data.get("tool") or {}).get("poetry")
+        if isinstance(poetry, dict):
+            sections = [poetry.get("dependencies"), poetry.get("dev-dependencies")]
+            groups = poetry.get("group")
+            if isinstance(groups, dict):
+                sections.extend(group.get("dependencies") for group in groups.values() if isinstance(group, dict))
+            for deps in sections:
+                if not isinstance(deps, dict):
+                    continue
+                for name, spec in deps.items():
+                    if name != "python":
+                        names.add(str(name))
+                    if isinstance(spec, dict):
+                        add_path(spec.get("path"))
+    if "Cargo.toml" in present:
+        data = store.toml(package_path / "Cargo.toml")
+        for section in CARGO_DEPENDENCY_SECTIONS:
+            deps = data.get(section)
+            if not isinstance(deps, dict):
+                continue
+            for name, spec in deps.items():
+                if isinstance(spec, dict):
+                    names.add(str(spec.get("package") or name))
+                    add_path(spec.get("path"))
+                else:
+                    names.add(str(name))
+    if "pom.xml" in present:
+        pom = store.pom(package_path / "pom.xml")
+        names.update(pom.get("dependencies") or [])
+        if pom.get("parent"):
+            names.add(pom["parent"])
+    paths.discard(root)
+    return sorted(names), sorted(paths)
+
+
+def package_graph(packages: list[PackageInfo]) -> dict[str, Any]:
+    """Inter-package dependency graph of a workspace: diagram, build order, cycles.
+
+    Declared dependencies are matched against package names (normalized
+    like PyPI names) and path dependencies against package roots, through
+    dicts, so building the graph is linear in packages + declarations.
+    """
+    roots = {package.path for package in packages}
+    by_name: dict[str, str] = {}
+    for package in packages:
+        by_name.setdefault(_normalize_package_name(package.name), package.path)
+
+    edges: set[tuple[str, str]] = set()
+    for package in packages:
+        targets = [by_name.get(_normalize_package_name(name)) for name in package.dependencies]
+        targets.extend(path for path in package.path_dependencies if path in roots)
+        edges.update((package.path, target) for target in targets if target and target != package.path)
+
+    order = build_order(roots, edges)
+    names = {package.path: package.name for package in packages}
+    if len(roots) <= MAX_PACKAGE_GRAPH_NODES:
+        nodes = [{"id": _package_node_id(path), "label": names[path]} for path in sorted(roots)]
+        graph_edges = [
+            {"from": _package_node_id(source), "to": _package_node_id(target), "weight": 1}
+            for source, target in sorted(edges)
+        ][:MAX_PACKAGE_GRAPH_EDGES]
+    else:
+        clustered = cluster_graph(roots, edges, MAX_PACKAGE_GRAPH_NODES, MAX_PACKAGE_GRAPH_EDGES, unit="packages")
+        nodes, graph_edges = clustered.nodes, clustered.edges
+
+    dependency_count: dict[str, int] = {path: 0 for path in roots}
+    dependent_count: dict[str, int] = {path: 0 for path in roots}
+    for source, target in edges:
+        dependency_count[source] += 1
+        dependent_count[target] += 1
+    return {
+        "nodes": nodes,
+        "edges": graph_edges,
+        "order": [
+            {
+                "name": names[path],
+                "path": path,
+                "depth": order.depth[path],
+                "dependencies": dependency_count[path],
+                "dependents": dependent_count[path],
+            }
+            for path in order.order[:MAX_BUILD_ORDER_ROWS]
+        ],
+        "omitted": max(0, len(order.order) - MAX_BUILD_ORDER_ROWS),
+        "depth": max(order.depth.values(), default=0),
+        "critical_path": [names[path] for path in reversed(order.critical_path)],
+        "cycles": [[names[path] for path in cycle] for cycle in order.cycles],
+    }
+
+
+def _normalize_package_name(name: str) -> str:
+    return _NAME_SEPARATORS_RE.sub("-", name).lower()
+
+
+def _package_node_id(path: str) -> str:
+    return "pkg_" + "".join(ch if ch.isalnum() else "_" for ch in path.lower())
+
+
+def _package_name(package_path: Path, files: list[str], store: ManifestStore) -> str:
+    present = set(files)
+    if "package.json" in present:
+        data = store.json(package_path / "package.json")
+        if isinstance(data, dict) and isinstance(data.get("name"), str):
+            return data["name"]
+    if "pyproject.toml" in present:
+        data = store.toml(package_path / "pyproject.toml")
+        for section in (data.get("project"), (data.get("tool") or {}).get("poetry")):
+            if isinstance(section, dict) and isinstance(section.get("name"), str):
+                return section["name"]
+    if "Cargo.toml" in present:
+        section = store.toml(package_path / "Cargo.toml").get("package")
+        if isinstance(section, dict) and isinstance(section.get("name"), str):
+            return section["name"]
+    if "pom.xml" in present:
+        artifact_id = store.pom(package_path / "pom.xml").get("artifact_id")
+        if artifact_id:
+            return artifact_id
+    return package_path.name
+
+
+def _packages_cache_file(repo_path: Path) -> Path | None:
+    directory = cache_dir("workspaces")
+    if directory is None:
+        return None
+    return directory / f"{fingerprint(repo_path.resolve().as_posix())[:24]}.json"
+
+
+def _load_packages_cache(path: Path | None) -> dict[str, Any]:
+    if path is None:
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("format") != PACKAGES_CACHE_FORMAT:
+        return {}
+    packages = data.get("packages")
+    return packages if isinstance(packages, dict) else {}
+
+
+def _cached_package(entry: Any, key: str) -> PackageInfo | None:
+    if not isinstance(entry, dict) or entry.get("key") != key:
+        return None
+    try:
+        return PackageInfo.from_dict(entry["info"])
+    except (KeyError, TypeError):
+        return None
+
+
+def _save_packages_cache(path: Path | None, packages: dict[str, Any]) -> None:
+    if path is None:
+        return
+    temp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        temp.write_text(json.dumps({"format": PACKAGES_CACHE_FORMAT, "packages": packages}), encoding="utf-8")
+        os.replace(temp, path)
+    except OSError:
+        temp.unlink(missing_ok=True)
+
+
 def _normalize_output_dir(output_dir: str) -> str:
     normalized = output_dir.strip().replace("\\", "/")
     if not normalized:
@@ -217,6 +590,8 @@ def _read_node_scripts(
     repo_path: Path,
     rel_files: list[str],
     warnings: list[str],
+    store: ManifestStore,
+    default_manager: str | None = None,
 ) -> tuple[str | None, dict[str, str]]:
     by_name = _index_by_name(rel_files)
     package_json_paths = by_name.get("package.json", [])
@@ -224,9 +599,9 @@ def _read_node_scripts(
         return None, {}
 
     package_json_path = _select_primary(package_json_paths)
-    package_manager = _detect_package_manager(by_name)
+    package_manager = _detect_package_manager(by_name, default_manager or "npm")
 
-    payload = _read_json(repo_path / package_json_path, warnings)
+    payload = store.json(repo_path / package_json_path, warnings)
     if not isinstance(payload, dict):
         return package_manager, {}
 
@@ -237,18 +612,21 @@ def _read_node_scripts(
     return package_manager, {str(key): str(value) for key, value in scripts.items() if isinstance(key, str)}
 
 
-def _detect_package_manager(by_name: dict[str, list[str]]) -> str:
+def _detect_package_manager(by_name: dict[str, list[str]], default: str = "npm") -> str:
     if by_name.get("pnpm-lock.yaml"):
         return "pnpm"
     if by_name.get("yarn.lock"):
         return "yarn"
-    return "npm"
+    if by_name.get("package-lock.json"):
+        return "npm"
+    return default
 
 
 def _read_python_info(
     repo_path: Path,
     rel_files: list[str],
     warnings: list[str],
+    store: ManifestStore,
 ) -> "PythonInfo":
     by_name = _index_by_name(rel_files)
     pyproject_paths = by_name.get("pyproject.toml", [])
@@ -265,12 +643,12 @@ def _read_python_info(
     pyproject_data: dict[str, Any] = {}
     if pyproject_paths:
         pyproject_path = _select_primary(pyproject_paths)
-        pyproject_data = _read_toml(repo_path / pyproject_path, warnings)
+        pyproject_data = store.toml(repo_path / pyproject_path, warnings)
 
     requirements_lines: list[str] = []
     if requirements_paths:
         requirements_path = _select_primary(requirements_paths)
-        requirements_lines = _read_requirements(repo_path / requirements_path, warnings)
+        requirements_lines = store.requirements(repo_path / requirements_path, warnings)
 
     return _analyze_python(
         pyproject_data,
@@ -468,15 +846,16 @@ def _collect_evidence(by_name: dict[str, list[str]], names: list[str]) -> list[s
 
 def _build_commands(
     repo_path: Path,
+    rel_files: list[str],
     node_scripts: dict[str, str],
     package_manager: str | None,
     python_info: PythonInfo,
     docker_info: DockerInfo,
+    store: ManifestStore,
+    warnings: list[str],
 ) -> Commands:
     commands = Commands()
-    
-    rel_files = list(repo_path.rglob("*"))
-    by_name = _index_by_name([f.relative_to(repo_path).as_posix() for f in rel_files if f.is_file()])
+    by_name = _index_by_name(rel_files)
 
     node_commands = _node_commands(node_scripts, package_manager)
     commands = _merge_commands(commands, node_commands)
@@ -489,7 +868,11 @@ def _build_commands(
         java_commands = Commands(
             build="mvn package",
             test="mvn test",
-            run="mvn spring-boot:run" if _has_spring_boot(repo_path / by_name["pom.xml"][0]) else "mvn exec:java",
+            run=(
+                "mvn spring-boot:run"
+                if _has_spring_boot(store, repo_path / _select_primary(by_name["pom.xml"]))
+                else "mvn exec:java"
+            ),
         )
         commands = _merge_commands(commands, java_commands)
     elif by_name.get("build.gradle") or by_name.get("build.gradle.kts"):
@@ -523,7 +906,11 @@ def _build_commands(
     # Ruby commands
     if by_name.get("Gemfile"):
         ruby_commands = Commands(
-            test="bundle exec rspec" if _check_ruby_dependency(repo_path, "rspec") else "rake test",
+            test=(
+                "bundle exec rspec"
+                if _check_ruby_dependency(store, repo_path / _select_primary(by_name["Gemfile"]), "rspec", warnings)
+                else "rake test"
+            ),
             run="bundle exec ruby main.rb",
         )
         commands = _merge_commands(commands, ruby_commands)
@@ -534,7 +921,11 @@ def _build_commands(
     # PHP commands
     if by_name.get("composer.json"):
         php_commands = Commands(
-            test="./vendor/bin/phpunit" if _check_php_dependency(repo_path, "phpunit") else "php artisan test",
+            test=(
+                "./vendor/bin/phpunit"
+                if _check_php_dependency(store, repo_path / _select_primary(by_name["composer.json"]), "phpunit", warnings)
+                else "php artisan test"
+            ),
             run="php artisan serve",
         )
         commands = _merge_commands(commands, php_commands)
@@ -554,7 +945,7 @@ def _build_commands(
         commands = _merge_commands(commands, cpp_commands)
     
     # .NET commands
-    dotnet_files = [f for f in rel_files if f.suffix in (".csproj", ".sln")]
+    dotnet_files = [f for f in rel_files if f.endswith((".csproj", ".sln"))]
     if dotnet_files:
         dotnet_commands = Commands(
             build="dotnet build",
@@ -569,34 +960,17 @@ def _build_commands(
     return commands
 
 
-def _has_spring_boot(pom_path: Path) -> bool:
-    try:
-        content = pom_path.read_text(encoding="utf-8")
-        return "spring-boot" in content.lower()
-    except Exception:
-        return False
+def _has_spring_boot(store: ManifestStore, pom_path: Path) -> bool:
+    content = store.text(pom_path)
+    return content is not None and "spring-boot" in content.lower()
 
 
-def _check_ruby_dependency(repo_path: Path, dep_name: str) -> bool:
-    gemfile = repo_path / "Gemfile"
-    if not gemfile.exists():
-        return False
-    try:
-        content = gemfile.read_text(encoding="utf-8")
-        return dep_name in content.lower()
-    except Exception:
-        return False
+def _check_ruby_dependency(store: ManifestStore, gemfile: Path, dep_name: str, warnings: list[str]) -> bool:
+    return any(dep_name in gem.lower() for gem in store.gems(gemfile, warnings))
 
 
-def _check_php_dependency(repo_path: Path, dep_name: str) -> bool:
-    composer = repo_path / "composer.json"
-    if not composer.exists():
-        return False
-    try:
-        content = composer.read_text(encoding="utf-8")
-        return dep_name in content.lower()
-    except Exception:
-        return False
+def _check_php_dependency(store: ManifestStore, composer: Path, dep_name: str, warnings: list[str]) -> bool:
+    return any(dep_name in package.lower() for package in store.composer_packages(composer, warnings))
 
 
 def _node_commands(scripts: dict[str, str], package_manager: str | None) -> Commands:
@@ -666,37 +1040,3 @@ def _merge_commands(base: Commands, incoming: Commands) -> Commands:
 
 def _select_primary(paths: list[str]) -> str:
     return sorted(paths, key=lambda item: (item.count("/"), item))[0]
-
-
-def _read_json(path: Path, warnings: list[str]) -> dict[str, Any] | None:
-    try:
-        content = path.read_text(encoding="utf-8")
-        return json.loads(content)
-    except (OSError, json.JSONDecodeError) as exc:
-        warnings.append(f"Failed to parse JSON: {path}: {exc}")
-        return None
-
-
-def _read_toml(path: Path, warnings: list[str]) -> dict[str, Any]:
-    try:
-        content = path.read_text(encoding="utf-8")
-        return tomllib.loads(content)
-    except (OSError, tomllib.TOMLDecodeError) as exc:
-        warnings.append(f"Failed to parse TOML: {path}: {exc}")
-        return {}
-
-
-def _read_requirements(path: Path, warnings: list[str]) -> list[str]:
-    try:
-        lines = path.read_text(encoding="utf-8").splitlines()
-    except OSError as exc:
-        warnings.append(f"Failed to read requirements: {path}: {exc}")
-        return []
-
-    cleaned: list[str] = []
-    for line in lines:
-        stripped = line.strip()
-        if not stripped or stripped.startswith("#"):
-            continue
-        cleaned.append(stripped)
-    return cleaned
@@ -0,0 +1,31 @@
+"""User-level cache directory for DocGen."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+CACHE_ENV_VAR = "DOCGEN_CACHE_DIR"
+
+
+def cache_dir(*parts: str) -> Path | None:
+    """Return (and create) a DocGen cache directory, or None if unavailable.
+
+    ``DOCGEN_CACHE_DIR`` overrides the location; an empty value disables
+    caching. Otherwise ``$XDG_CACHE_HOME/docgen`` or ``~/.cache/docgen`` is used.
+    """
+    override = os.environ.get(CACHE_ENV_VAR)
+    if override is not None:
+        if not override.strip():
+            return None
+        base = Path(override).expanduser()
+    else:
+        xdg = os.environ.get("XDG_CACHE_HOME")
+        base = Path(xdg).expanduser() if xdg else Path.home() / ".cache"
+        base = base / "docgen"
+    path = base.joinpath(*parts)
+    try:
+        path.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return None
+    return path
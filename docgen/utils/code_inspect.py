@@ -2,13 +2,17 @@
 
 from __future__ import annotations
 
+from functools import cached_property
 from pathlib import Path
 import re
-from typing import Any
+from typing import Any, Callable
 
 from ..config import DocGenConfig
 from ..services.scan_service import _build_excludes
+from ..utils.fingerprint import fingerprint
+from ..utils.graphs import cluster_graph
 from ..utils.ignore import build_excluder
+from ..utils.line_stats import LineStats, count_lines, syntax_for_path
 from ..utils.walk import walk_repo
 
 MAX_FILE_BYTES = 200_000
@@ -18,6 +22,7 @@ MAX_FUNCTIONS = 160
 MAX_LISTED_FILES = 120
 MAX_GRAPH_NODES = 50
 MAX_GRAPH_EDGES = 160
+MAX_DRILLDOWNS = 6
 MAX_MODULE_SUMMARIES = 80
 
 PY_CLASS_RE = re.compile(r"^class\s+([A-Za-z_][A-Za-z0-9_]*)\s*(?:\(([^)]*)\))?:")
@@ -27,109 +32,191 @@ PY_IMPORT_RE = re.compile(r"^\s*(?:from\s+([A-Za-z0-9_.]+)\s+import|import\s+([A
 JS_IMPORT_RE = re.compile(r"""(?:from\s+['"](.+?)['"]|require\(\s*['"](.+?)['"]\s*\))""")
 
 
-class CodeOverview:
-    def __init__(self) -> None:
-        self.code_files_by_ext: list[dict[str, Any]] = []
-        self.python_classes: list[dict[str, Any]] = []
-        self.python_edges: list[dict[str, str]] = []
-        self.python_functions: list[dict[str, Any]] = []
-        self.js_classes: list[dict[str, Any]] = []
-        self.js_edges: list[dict[str, str]] = []
-        self.ts_classes: list[dict[str, Any]] = []
-        self.ts_edges: list[dict[str, str]] = []
-        self.python_file_nodes: list[dict[str, str]] = []
-        self.python_file_edges: list[dict[str, str]] = []
-        self.js_file_nodes: list[dict[str, str]] = []
-        self.js_file_edges: list[dict[str, str]] = []
-        self.ts_file_nodes: list[dict[str, str]] = []
-        self.ts_file_edges: list[dict[str, str]] = []
-        self.python_module_summaries: list[dict[str, Any]] = []
-        self.js_module_summaries: list[dict[str, Any]] = []
-        self.ts_module_summaries: list[dict[str, Any]] = []
-        self.code_entrypoints: list[str] = []
-        self.code_files_sample: list[str] = []
-        self.code_line_count: int = 0
+class CodeInspector:
+    """Computes the code overview in independent facets.
+
+    Each facet (``stats``, ``python``, ``javascript``, ``typescript``) returns
+    its own slice of template context and only reads the files it needs; the
+    repository walk is shared and done at most once.
+    """
+
+    FACETS: dict[str, tuple[str, ...]] = {
+        "stats": (
+            "code_files_by_ext",
+            "code_languages",
+            "code_line_count",
+            "code_entrypoints",
+            "code_files_sample",
+            "code_warnings",
+        ),
+        "python": (
+            "python_classes",
+            "python_edges",
+            "python_functions",
+            "python_file_nodes",
+            "python_file_edges",
+            "python_file_drilldowns",
+            "python_module_summaries",
+        ),
+        "javascript": (
+            "js_classes",
+            "js_edges",
+            "js_file_nodes",
+            "js_file_edges",
+            "js_file_drilldowns",
+            "js_module_summaries",
+        ),
+        "typescript": (
+            "ts_classes",
+            "ts_edges",
+            "ts_file_nodes",
+            "ts_file_edges",
+            "ts_file_drilldowns",
+            "ts_module_summaries",
+        ),
+        "modules": ("python_modules",),
+    }
+
+    def __init__(self, repo_path: Path, config: DocGenConfig) -> None:
+        self.repo_path = repo_path
+        self.config = config
         self.warnings: list[str] = []
 
-    def to_context(self) -> dict[str, Any]:
+    @cached_property
+    def code_files(self) -> list[str]:
+        patterns = _build_excludes(self.config.exclude, self.config.output_dir)
+        excluder = build_excluder(patterns)
+        files, _ = walk_repo(self.repo_path, excluder)
+
+        rel_files = [path.as_posix() for path in files]
+        if len(rel_files) > MAX_CODE_FILES:
+            self.warnings.append("Code scan truncated (too many files).")
+            rel_files = rel_files[:MAX_CODE_FILES]
+        return [path for path in rel_files if _is_code_file(path)]
+
+    def files_for(self, facet: str) -> list[str]:
+        if facet in {"python", "modules"}:
+            return [path for path in self.code_files if path.endswith(".py")]
+        if facet == "javascript":
+            return [path for path in self.code_files if path.endswith(".js")]
+        if facet == "typescript":
+            return [path for path in self.code_files if path.endswith((".ts", ".tsx"))]
+        return self.code_files
+
+    def snapshot(self, facet: str) -> str:
+        """Fingerprint a facet's input files (paths, sizes, mtimes) without reading them."""
+        entries: list[tuple[str, int, int]] = []
+        for rel in self.files_for(facet):
+            try:
+                stat = (self.repo_path / rel).stat()
+            except OSError:
+                continue
+            entries.append((rel, stat.st_size, stat.st_mtime_ns))
+        return fingerprint(facet, entries, self.warnings)
+
+    def facet(self, name: str) -> dict[str, Any]:
+        loader: Callable[[], dict[str, Any]] = getattr(self, f"_{name}")
+        return loader()
+
+    def collect(self) -> dict[str, Any]:
+        context: dict[str, Any] = {}
+        for name in self.FACETS:
+            context.update(self.facet(name))
+        return context
+
+    def _stats(self) -> dict[str, Any]:
+        code_files = self.code_files
+        ext_counts: dict[str, int] = {}
+        language_stats: dict[str, LineStats] = {}
+        total_lines = 0
+        for path in code_files:
+            ext = Path(path).suffix.lower() or "(none)"
+            ext_counts[ext] = ext_counts.get(ext, 0) + 1
+            content = _safe_read(self.repo_path / path)
+            if content is None:
+                continue
+            syntax = syntax_for_path(path)
+            stats = count_lines(content, syntax)
+            language_stats.setdefault(syntax.language, LineStats()).add(stats)
+            total_lines += stats.total
+
         return {
-            "code_files_by_ext": self.code_files_by_ext,
-            "python_classes": self.python_classes,
-            "python_edges": self.python_edges,
-            "python_functions": self.python_functions,
-            "js_classes": self.js_classes,
-            "js_edges": self.js_edges,
-            "ts_classes": self.ts_classes,
-            "ts_edges": self.ts_edges,
-            "python_file_nodes": self.python_file_nodes,
-            "python_file_edges": self.python_file_edges,
-            "js_file_nodes": self.js_file_nodes,
-            "js_file_edges": self.js_file_edges,
-            "ts_file_nodes": self.ts_file_nodes,
-            "ts_file_edges": self.ts_file_edges,
-            "python_module_summaries": self.python_module_summaries,
-            "js_module_summaries": self.js_module_summaries,
-            "ts_module_summaries": self.ts_module_summaries,
-            "code_entrypoints": self.code_entrypoints,
-            "code_files_sample": self.code_files_sample,
-            "code_line_count": self.code_line_count,
-            "code_warnings": self.warnings,
+            "code_files_by_ext": [
+                {"ext": ext, "count": count}
+                for ext, count in sorted(ext_counts.items(), key=lambda item: (-item[1], item[0]))
+            ],
+            "code_languages": _language_rows(language_stats),
+            "code_line_count": total_lines,
+            "code_entrypoints": _detect_entrypoints(code_files),
+            "code_files_sample": code_files[:MAX_LISTED_FILES],
+            "code_warnings": list(self.warnings),
         }
 
+    def _python(self) -> dict[str, Any]:
+        python_files = self.files_for("python")
+        if not python_files:
+            return _empty_facet("python")
+        classes, edges, functions = _extract_python_symbols(self.repo_path, python_files)
+        classes, edges = _class_diagram(classes, edges)
+        file_nodes, file_edges, drilldowns = _python_import_graph(self.repo_path, python_files)
+        return {
+            "python_classes": classes,
+            "python_edges": edges,
+            "python_functions": functions,
+            "python_file_nodes": file_nodes,
+            "python_file_edges": file_edges,
+            "python_file_drilldowns": drilldowns,
+            "python_module_summaries": _python_module_summaries(self.repo_path, python_files),
+        }
 
-def collect_code_overview(repo_path: Path, config: DocGenConfig) -> dict[str, Any]:
-    overview = CodeOverview()
-
-    patterns = _build_excludes(config.exclude, config.output_dir)
-    excluder = build_excluder(patterns)
-    files, _ = walk_repo(repo_path, excluder)
-
-    rel_files = [path.as_posix() for path in files]
-    if len(rel_files) > MAX_CODE_FILES:
-        overview.warnings.append("Code scan truncated (too many files).")
-        rel_files = rel_files[:MAX_CODE_FILES]
-
-    code_files = [path for path in rel_files if _is_code_file(path)]
-    overview.code_files_sample = code_files[:MAX_LISTED_FILES]
-
-    ext_counts: dict[str, int] = {}
-    total_lines = 0
-    for path in code_files:
-        ext = Path(path).suffix.lower() or "(none)"
-        ext_counts[ext] = ext_counts.get(ext, 0) + 1
-        content = _safe_read(repo_path / path)
-        if content is not None:
-            total_lines += len(content.splitlines())
-
-    overview.code_line_count = total_lines
-
-    overview.code_files_by_ext = [
-        {"ext": ext, "count": count}
-        for ext, count in sorted(ext_counts.items(), key=lambda item: (-item[1], item[0]))
-    ]
+    def _modules(self) -> dict[str, Any]:
+        if not self.config.module_pages:
+            return _empty_facet("modules")
+        return {"python_modules": _python_modules(self.repo_path, self.files_for("modules"))}
 
-    python_files = [path for path in code_files if path.endswith(".py")]
-    js_files = [path for path in code_files if path.endswith(".js")]
-    ts_files = [path for path in code_files if path.endswith(".ts") or path.endswith(".tsx")]
+    def _javascript(self) -> dict[str, Any]:
+        return self._js_facet("javascript", "js")
 
-    overview.python_classes, overview.python_edges, overview.python_functions = _extract_python_symbols(
-        repo_path, python_files
-    )
-    overview.js_classes, overview.js_edges = _extract_js_symbols(repo_path, js_files)
-    overview.ts_classes, overview.ts_edges = _extract_js_symbols(repo_path, ts_files)
+    def _typescript(self) -> dict[str, Any]:
+        return self._js_facet("typescript", "ts")
 
-    overview.python_file_nodes, overview.python_file_edges = _python_import_graph(
-        repo_path, python_files
-    )
-    overview.js_file_nodes, overview.js_file_edges = _js_import_graph(repo_path, js_files)
-    overview.ts_file_nodes, overview.ts_file_edges = _js_import_graph(repo_path, ts_files)
+    def _js_facet(self, facet: str, prefix: str) -> dict[str, Any]:
+        rel_paths = self.files_for(facet)
+        if not rel_paths:
+            return _empty_facet(facet)
+        classes, edges = _class_diagram(*_extract_js_symbols(self.repo_path, rel_paths))
+        file_nodes, file_edges, drilldowns = _js_import_graph(self.repo_path, rel_paths)
+        return {
+            f"{prefix}_classes": classes,
+            f"{prefix}_edges": edges,
+            f"{prefix}_file_nodes": file_nodes,
+            f"{prefix}_file_edges": file_edges,
+            f"{prefix}_file_drilldowns": drilldowns,
+            f"{prefix}_module_summaries": _js_module_summaries(self.repo_path, rel_paths),
+        }
+
+
+def collect_code_overview(repo_path: Path, config: DocGenConfig) -> dict[str, Any]:
+    return CodeInspector(repo_path, config).collect()
 
-    overview.python_module_summaries = _python_module_summaries(repo_path, python_files)
-    overview.js_module_summaries = _js_module_summaries(repo_path, js_files)
-    overview.ts_module_summaries = _js_module_summaries(repo_path, ts_files)
-    overview.code_entrypoints = _detect_entrypoints(code_files)
 
-    return overview.to_context()
+def _empty_facet(facet: str) -> dict[str, Any]:
+    return {key: [] for key in CodeInspector.FACETS[facet]}
+
+
+def _language_rows(language_stats: dict[str, LineStats]) -> list[dict[str, Any]]:
+    rows = [
+        {
+            "language": language,
+            "files": stats.files,
+            "code": stats.code,
+            "comment": stats.comment,
+            "blank": stats.blank,
+            "total": stats.total,
+        }
+        for language, stats in language_stats.items()
+    ]
+    return sorted(rows, key=lambda item: (-item["code"], item["language"]))
 
 
 def _is_code_file(path: str) -> bool:
@@ -307,6 +394,75 @@ def _python_module_summaries(repo_path: Path, rel_paths: list[str]) -> list[dict
     return sorted(summaries, key=lambda item: item["file"])
 
 
+def _python_modules(repo_path: Path, rel_paths: list[str]) -> list[dict[str, Any]]:
+    """Describe every Python module for its own page: symbols, imports, importers."""
+    module_map = _python_module_map(rel_paths)
+    root_map = _python_root_map(module_map)
+    file_modules = {rel: module for module, rel in module_map.items()}
+
+    modules: dict[str, dict[str, Any]] = {}
+    for rel in rel_paths:
+        module = file_modules.get(rel)
+        content = _safe_read(repo_path / rel) if module else None
+        if module is None or content is None:
+            continue
+        classes: list[dict[str, Any]] = []
+        functions: list[str] = []
+        imports: set[str] = set()
+        external: set[str] = set()
+        for line in content.splitlines():
+            match = PY_CLASS_RE.match(line)
+            if match:
+                classes.append({"name": match.group(1), "bases": _split_bases(match.group(2))})
+                continue
+            match = PY_DEF_RE.match(line)
+            if match:
+                functions.append(match.group(1))
+                continue
+            match = PY_IMPORT_RE.match(line)
+            if match:
+                name = match.group(1) or match.group(2)
+                if name.startswith("."):
+                    name = _absolute_import(module, rel.endswith("/__init__.py"), name)
+                target = module_map.get(name) or root_map.get(name.split(".", 1)[0])
+                if target is None:
+                    external.add(name)
+                elif target != rel:
+                    imports.add(file_modules[target])
+        modules[module] = {
+            "module": module,
+            "file": rel,
+            "page": f"{module}.md",
+            "doc": _module_docstring(content),
+            "classes": classes,
+            "functions": functions,
+            "imports": sorted(imports),
+            "external_imports": sorted(external),
+            "importers": [],
+        }
+
+    for module, info in modules.items():
+        for target in info["imports"]:
+            if target in modules:
+                modules[target]["importers"].append(module)
+    for info in modules.values():
+        info["imports"] = [name for name in info["imports"] if name in modules]
+        info["importers"].sort()
+    return [modules[name] for name in sorted(modules)]
+
+
+def _absolute_import(module: str, is_package: bool, name: str) -> str:
+    """Resolve a relative import such as ``..config`` against ``module``."""
+    level = len(name) - len(name.lstrip("."))
+    parts = module.split(".")
+    if not is_package:
+        parts = parts[:-1]
+    if level > 1:
+        parts = parts[: len(parts) - (level - 1)]
+    rest = name[level:]
+    return ".".join([*parts, rest] if rest else parts)
+
+
 def _js_module_summaries(repo_path: Path, rel_paths: list[str]) -> list[dict[str, Any]]:
     summaries: list[dict[str, Any]] = []
     for rel in rel_paths:
@@ -361,7 +517,7 @@ def _detect_entrypoints(rel_paths: list[str]) -> list[str]:
 def _python_import_graph(
     repo_path: Path,
     rel_paths: list[str],
-) -> tuple[list[dict[str, str]], list[dict[str, str]]]:
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]]]:
     module_map = _python_module_map(rel_paths)
     root_map = _python_root_map(module_map)
 
@@ -390,7 +546,7 @@ def _python_import_graph(
 def _js_import_graph(
     repo_path: Path,
     rel_paths: list[str],
-) -> tuple[list[dict[str, str]], list[dict[str, str]]]:
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]]]:
     rel_set = set(rel_paths)
     edges: list[tuple[str, str]] = []
 
@@ -416,24 +572,40 @@ def _js_import_graph(
 def _build_file_graph(
     rel_paths: list[str],
     edges: list[tuple[str, str]],
-) -> tuple[list[dict[str, str]], list[dict[str, str]]]:
-    nodes: list[dict[str, str]] = []
-    node_ids: dict[str, str] = {}
-
-    for rel in rel_paths[:MAX_GRAPH_NODES]:
-        node_id = _safe_id(rel)
-        node_ids[rel] = node_id
-        nodes.append({"id": node_id, "label": rel})
-
-    filtered_edges: list[dict[str, str]] = []
-    for source, target in edges:
-        if source not in node_ids or target not in node_ids:
-            continue
-        filtered_edges.append({"from": node_ids[source], "to": node_ids[target]})
-        if len(filtered_edges) >= MAX_GRAPH_EDGES:
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]]]:
+    """Cluster the file graph by directory to fit the Mermaid node budget.
+
+    Directories that had to be collapsed in the overview get their own
+    drill-down diagram (largest first) when they have internal edges.
+    """
+    overview = cluster_graph(rel_paths, edges, MAX_GRAPH_NODES, MAX_GRAPH_EDGES)
+    drilldowns: list[dict[str, Any]] = []
+    for cluster in overview.clusters:
+        if len(drilldowns) >= MAX_DRILLDOWNS:
             break
+        detail = cluster_graph(rel_paths, edges, MAX_GRAPH_NODES, MAX_GRAPH_EDGES, root=cluster)
+        if detail.edges:
+            drilldowns.append({"name": cluster, "nodes": detail.nodes, "edges": detail.edges})
+    return overview.nodes, overview.edges, drilldowns
 
-    return nodes, filtered_edges
+
+def _class_diagram(
+    classes: list[dict[str, Any]],
+    edges: list[dict[str, str]],
+) -> tuple[list[dict[str, Any]], list[dict[str, str]]]:
+    """Keep the most connected classes, up to the Mermaid node budget."""
+    if len(classes) <= MAX_GRAPH_NODES:
+        return classes, edges
+    degree: dict[str, int] = {}
+    for edge in edges:
+        degree[edge["from"]] = degree.get(edge["from"], 0) + 1
+        degree[edge["to"]] = degree.get(edge["to"], 0) + 1
+    ranked = sorted(range(len(classes)), key=lambda index: (-degree.get(classes[index]["id"], 0), index))
+    keep = sorted(ranked[:MAX_GRAPH_NODES])
+    kept_classes = [classes[index] for index in keep]
+    kept_ids = {item["id"] for item in kept_classes}
+    kept_edges = [edge for edge in edges if edge["from"] in kept_ids and edge["to"] in kept_ids]
+    return kept_classes, kept_edges
 
 
 def _python_module_map(rel_paths: list[str]) -> dict[str, str]:
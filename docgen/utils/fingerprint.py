@@ -0,0 +1,42 @@
+"""Stable content fingerprints for incremental builds."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, is_dataclass
+import hashlib
+import json
+from pathlib import Path, PurePath
+from typing import Any
+
+
+def fingerprint(*parts: Any) -> str:
+    """Return a SHA-256 hex digest of ``parts`` serialized as canonical JSON."""
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=_to_json)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def text_fingerprint(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def file_fingerprint(path: Path) -> str | None:
+    """Return the SHA-256 of the file's bytes, or None if it can't be read."""
+    try:
+        with path.open("rb") as handle:
+            return hashlib.file_digest(handle, "sha256").hexdigest()
+    except OSError:
+        return None
+
+
+def _to_json(value: Any) -> Any:
+    to_dict = getattr(value, "to_dict", None)
+    if callable(to_dict):
+        return to_dict()
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    if isinstance(value, PurePath):
+        return value.as_posix()
+    # repr() could embed a memory address and silently make every fingerprint unique.
+    raise TypeError(f"Cannot fingerprint {type(value).__name__} values")
@@ -0,0 +1,193 @@
+"""Local git queries (never touches a remote): HEAD, changed paths, trees and blobs."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import os
+from pathlib import Path
+import subprocess
+import threading
+from typing import IO, Iterable, Iterator
+
+GIT_TIMEOUT = 60
+
+
+@dataclass(frozen=True)
+class GitState:
+    """HEAD of a repository and its uncommitted paths with their (size, mtime_ns).
+
+    Paths are POSIX and relative to the scanned directory (which may be a
+    subdirectory of the work tree); a deleted path has no stat.
+    """
+
+    head: str
+    dirty: dict[str, tuple[int, int] | None] = field(default_factory=dict)
+
+
+def git_state(repo_path: Path) -> GitState | None:
+    """Return the state of ``repo_path``, or None outside a git work tree."""
+    head = _git(repo_path, "rev-parse", "--verify", "--quiet", "HEAD^{commit}")
+    prefix = _git(repo_path, "rev-parse", "--show-prefix")
+    status = _git(repo_path, "status", "--porcelain", "-z", "--untracked-files=all", "--no-renames", "--", ".")
+    if head is None or prefix is None or status is None:
+        return None
+    dirty: dict[str, tuple[int, int] | None] = {}
+    for entry in _split_z(status):
+        rel = _relative(entry[3:], prefix.strip())
+        if rel is None:
+            continue
+        try:
+            stat = os.stat(repo_path / rel, follow_symlinks=False)
+        except OSError:
+            dirty[rel] = None
+            continue
+        dirty[rel] = (stat.st_size, stat.st_mtime_ns)
+    return GitState(head=head.strip(), dirty=dirty)
+
+
+def changed_paths(
+    repo_path: Path,
+    since: str,
+    since_dirty: dict[str, tuple[int, int] | None],
+    current: GitState,
+) -> set[str] | None:
+    """Paths whose content may differ from the build that saw ``since`` and ``since_dirty``.
+
+    That is: paths changed by the commits in between, paths dirty now but
+    not then (or modified again since), and paths dirty then but clean now.
+    Returns None when the history can't be resolved (unknown or pruned
+    commit, shallow clone...), in which case callers must do a full scan.
+    """
+    changed: set[str] = set()
+    if since != current.head:
+        diff = _git(repo_path, "diff", "--name-only", "-z", "--no-renames", "--relative", since, current.head, "--")
+        if diff is None:
+            return None
+        changed.update(_split_z(diff))
+    changed.update(path for path, stat in current.dirty.items() if since_dirty.get(path, False) != stat)
+    changed.update(path for path in since_dirty if path not in current.dirty)
+    return changed
+
+
+@dataclass(frozen=True)
+class TreeEntry:
+    path: str
+    mode: str
+    oid: str
+    size: int
+
+
+def resolve_commit(repo_path: Path, rev: str) -> tuple[str, int] | None:
+    """The commit ``rev`` points to and its committer timestamp (None if unknown)."""
+    output = _git(repo_path, "show", "--no-patch", "--format=%H %ct", f"{rev}^{{commit}}", "--")
+    if output is None:
+        return None
+    try:
+        commit, timestamp = output.split()
+        return commit, int(timestamp)
+    except ValueError:
+        return None
+
+
+def list_tree(repo_path: Path, commit: str) -> list[TreeEntry] | None:
+    """Regular files of ``commit`` below ``repo_path`` (``git ls-tree -r -l``).
+
+    Symlinks and submodules are left out, as the repository walk does.
+    """
+    output = _git(repo_path, "ls-tree", "-r", "-l", "-z", commit)
+    if output is None:
+        return None
+    entries: list[TreeEntry] = []
+    for record in _split_z(output):
+        meta, _, path = record.partition("\t")
+        mode, kind, oid, size = meta.split()
+        if kind == "blob" and mode in {"100644", "100755"}:
+            entries.append(TreeEntry(path=path, mode=mode, oid=oid, size=int(size)))
+    return entries
+
+
+class BlobReader:
+    """One long-lived ``git cat-file --batch`` process serving every blob read."""
+
+    def __init__(self, repo_path: Path) -> None:
+        self._process = subprocess.Popen(
+            ["git", "-C", str(repo_path), "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def read(self, oids: Iterable[str]) -> Iterator[tuple[str, bytes]]:
+        """Yield ``(oid, content)`` in request order; requests are pipelined.
+
+        A thread feeds the object ids while this generator parses the
+        answers, so neither side waits on a full pipe.
+        """
+        wanted = list(oids)
+        stdin, stdout = self._process.stdin, self._process.stdout
+        assert stdin is not None and stdout is not None
+        feeder = threading.Thread(target=_feed, args=(stdin, wanted), daemon=True)
+        feeder.start()
+        try:
+            for oid in wanted:
+                header = stdout.readline().split()
+                if len(header) != 3:
+                    raise OSError(f"git cat-file: no content for {oid}")
+                size = int(header[2])
+                content = stdout.read(size)
+                stdout.read(1)  # trailing newline
+                yield oid, content
+        except BaseException:
+            self._process.kill()  # unblocks the feeder if git stopped reading
+            raise
+        finally:
+            feeder.join()
+
+    def close(self) -> None:
+        if self._process.stdin:
+            self._process.stdin.close()
+        try:
+            self._process.wait(timeout=GIT_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            self._process.wait()
+
+    def __enter__(self) -> "BlobReader":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def _feed(stdin: IO[bytes], oids: list[str]) -> None:
+    try:
+        for oid in oids:
+            stdin.write(f"{oid}\n".encode("ascii"))
+        stdin.flush()
+    except OSError:
+        pass  # git exited; the reader reports the missing answers
+
+
+def _git(repo_path: Path, *args: str) -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(repo_path), *args],
+            capture_output=True,
+            timeout=GIT_TIMEOUT,
+            check=False,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.decode("utf-8", "surrogateescape")
+
+
+def _split_z(output: str) -> list[str]:
+    return [item for item in output.split("\0") if item]
+
+
+def _relative(path: str, prefix: str) -> str | None:
+    if not prefix:
+        return path
+    return path[len(prefix):] if path.startswith(prefix) else None
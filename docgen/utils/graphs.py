@@ -0,0 +1,257 @@
+"""Graph helpers: directory clustering for Mermaid diagrams, build ordering."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+OTHERS_ID = "docgen_others"
+
+
+@dataclass
+class _TreeNode:
+    path: str
+    is_file: bool = False
+    is_others: bool = False
+    files: int = 0
+    children: dict[str, "_TreeNode"] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class ClusteredGraph:
+    nodes: list[dict[str, Any]]
+    edges: list[dict[str, Any]]
+    clusters: list[str]
+
+
+def cluster_graph(
+    paths: Iterable[str],
+    edges: Iterable[tuple[str, str]],
+    node_budget: int,
+    edge_budget: int | None = None,
+    root: str = "",
+    unit: str = "fichiers",
+) -> ClusteredGraph:
+    """Collapse ``paths`` into directory nodes so at most ``node_budget`` remain.
+
+    The directory tree is expanded level by level from the top while the node
+    count stays within budget; if even the top level is too wide, its
+    smallest entries are folded into one "others" node. Edges are
+    re-attached to the visible node of each endpoint and merged with a weight
+    (number of file-level edges); self loops disappear. With ``edge_budget``
+    only the heaviest edges are kept. Runs in linear time (plus sorting).
+    ``unit`` names what the paths are in collapsed labels.
+    """
+    tree = _build_tree(paths, root)
+    visible = _expand(tree, max(node_budget, 1))
+
+    owner: dict[str, str] = {}
+    for node in visible:
+        if node.is_others:
+            owner.update((child.path, OTHERS_ID) for child in node.children.values())
+        else:
+            owner[node.path] = _node_id(node)
+
+    weights: dict[tuple[str, str], int] = {}
+    for source, target in edges:
+        source_id = _owner_of(source, owner)
+        target_id = _owner_of(target, owner)
+        if source_id is None or target_id is None or source_id == target_id:
+            continue
+        weights[(source_id, target_id)] = weights.get((source_id, target_id), 0) + 1
+
+    ranked = sorted(weights.items(), key=lambda item: (-item[1], item[0]))
+    if edge_budget is not None:
+        ranked = ranked[:edge_budget]
+
+    return ClusteredGraph(
+        nodes=[_node_entry(node, root, unit) for node in visible],
+        edges=[{"from": pair[0], "to": pair[1], "weight": weight} for pair, weight in ranked],
+        clusters=[
+            node.path
+            for node in sorted(visible, key=lambda item: (-item.files, item.path))
+            if not node.is_file and not node.is_others
+        ],
+    )
+
+
+@dataclass(frozen=True)
+class BuildOrder:
+    order: list[str]
+    depth: dict[str, int]
+    cycles: list[list[str]]
+    critical_path: list[str]
+
+
+def build_order(nodes: Iterable[str], edges: Iterable[tuple[str, str]]) -> BuildOrder:
+    """Order ``nodes`` so each comes after its dependencies (edge = dependent -> dependency).
+
+    Cycles are collapsed into strongly connected components (Tarjan), whose
+    members share a level. ``depth`` is the length of the longest dependency
+    chain ending at a node (1 for leaves): nodes of the same depth can be
+    built in parallel, and the deepest chain is the critical path (a cycle
+    on it contributes all its members). Runs in O(nodes + edges) plus
+    sorting.
+    """
+    adjacency: dict[str, set[str]] = {node: set() for node in sorted(set(nodes))}
+    for source, target in edges:
+        if source != target and source in adjacency and target in adjacency:
+            adjacency[source].add(target)
+    successors = {node: sorted(targets) for node, targets in adjacency.items()}
+
+    components = [sorted(members) for members in _strongly_connected(successors)]
+    component_of = {member: index for index, members in enumerate(components) for member in members}
+    # Depth and the critical path are computed on the condensation DAG.
+    below = [
+        sorted({component_of[target] for member in members for target in successors[member]} - {index})
+        for index, members in enumerate(components)
+    ]
+    levels: list[int] = []
+    # Tarjan emits a component only after every component it reaches.
+    for index in range(len(components)):
+        levels.append(1 + max((levels[target] for target in below[index]), default=0))
+    depth = {member: levels[index] for index, members in enumerate(components) for member in members}
+
+    critical_path: list[str] = []
+    if components:
+        current = min(range(len(components)), key=lambda index: (-levels[index], components[index][0]))
+        critical_path.extend(components[current])
+        while levels[current] > 1:
+            current = min(
+                (target for target in below[current] if levels[target] == levels[current] - 1),
+                key=lambda index: components[index][0],
+            )
+            critical_path.extend(components[current])
+
+    return BuildOrder(
+        order=sorted(depth, key=lambda node: (depth[node], node)),
+        depth=depth,
+        cycles=sorted(members for members in components if len(members) > 1),
+        critical_path=critical_path,
+    )
+
+
+def _strongly_connected(successors: dict[str, list[str]]) -> list[list[str]]:
+    """Iterative Tarjan: components in reverse topological order."""
+    index: dict[str, int] = {}
+    low: dict[str, int] = {}
+    stack: list[str] = []
+    on_stack: set[str] = set()
+    components: list[list[str]] = []
+
+    def visit(node: str) -> None:
+        index[node] = low[node] = len(index)
+        stack.append(node)
+        on_stack.add(node)
+
+    for start in successors:
+        if start in index:
+            continue
+        visit(start)
+        work = [(start, iter(successors[start]))]
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in index:
+                    visit(child)
+                    work.append((child, iter(successors[child])))
+                    break
+                if child in on_stack:
+                    low[node] = min(low[node], index[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    members: list[str] = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        members.append(member)
+                        if member == node:
+                            break
+                    components.append(members)
+    return components
+
+
+def _build_tree(paths: Iterable[str], root: str) -> _TreeNode:
+    tree = _TreeNode(path=root)
+    prefix = f"{root}/" if root else ""
+    for path in paths:
+        if prefix and not path.startswith(prefix):
+            continue
+        node = tree
+        node.files += 1
+        parts = path[len(prefix):].split("/")
+        last = len(parts) - 1
+        for depth, part in enumerate(parts):
+            child = node.children.get(part)
+            if child is None:
+                child_path = f"{node.path}/{part}" if node.path else part
+                child = _TreeNode(path=child_path, is_file=depth == last)
+                node.children[part] = child
+            child.files += 1
+            node = child
+    return tree
+
+
+def _expand(tree: _TreeNode, budget: int) -> list[_TreeNode]:
+    """Expand the tree one level at a time while the whole level fits.
+
+    Expanding a level all at once keeps the overview at an even granularity;
+    collapsed directories are what drill-down diagrams are for.
+    """
+    top = sorted(tree.children.values(), key=lambda item: (-item.files, item.path))
+    others: list[_TreeNode] = []
+    if len(top) > budget:
+        top, others = top[:budget - 1], top[budget - 1:]
+
+    visible = top
+    while any(node.children for node in visible):
+        expanded: list[_TreeNode] = []
+        for node in visible:
+            expanded.extend(node.children.values() if node.children else (node,))
+        if len(expanded) + bool(others) > budget:
+            break
+        visible = expanded
+
+    visible = sorted(visible, key=lambda item: item.path)
+    if others:
+        # Paths are never empty, so "" can't clash with a real entry.
+        visible.append(
+            _TreeNode(
+                path="",
+                is_others=True,
+                files=sum(item.files for item in others),
+                children={item.path: item for item in others},
+            )
+        )
+    return visible
+
+
+def _owner_of(path: str, owner: dict[str, str]) -> str | None:
+    """Return the id of the visible node containing ``path`` (None if outside)."""
+    candidate = path
+    while True:
+        found = owner.get(candidate)
+        if found is not None:
+            return found
+        cut = candidate.rfind("/")
+        if cut == -1:
+            return None
+        candidate = candidate[:cut]
+
+
+def _node_id(node: _TreeNode) -> str:
+    safe = "".join(ch if ch.isalnum() else "_" for ch in node.path.lower()) or "node"
+    return safe if node.is_file else f"dir_{safe}"
+
+
+def _node_entry(node: _TreeNode, root: str, unit: str) -> dict[str, Any]:
+    if node.is_others:
+        return {"id": OTHERS_ID, "label": f"... ({node.files} {unit})", "files": node.files}
+    label = node.path[len(root) + 1:] if root else node.path
+    if not node.is_file:
+        label = f"{label}/ ({node.files} {unit})"
+    return {"id": _node_id(node), "label": label, "files": node.files}
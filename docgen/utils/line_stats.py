@@ -0,0 +1,250 @@
+"""cloc-style line statistics (code, comment, blank) per language."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+import re
+from typing import Iterable
+
+
+@dataclass(frozen=True)
+class CommentSyntax:
+    """Comment markers of a language, plus its string delimiters.
+
+    Comment markers inside strings are ignored. A block opener that is also a
+    string delimiter (Python docstrings) only opens a comment when it is the
+    first token of its line.
+    """
+
+    language: str
+    line: tuple[str, ...] = ()
+    block: tuple[tuple[str, str], ...] = ()
+    strings: tuple[str, ...] = ()
+
+
+@dataclass
+class LineStats:
+    files: int = 0
+    code: int = 0
+    comment: int = 0
+    blank: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.code + self.comment + self.blank
+
+    def add(self, other: "LineStats") -> None:
+        self.files += other.files
+        self.code += other.code
+        self.comment += other.comment
+        self.blank += other.blank
+
+
+_C_LIKE = (("//",), (("/*", "*/"),), ('"', "'"))
+_HASH = (("#",), (), ('"', "'"))
+
+# Triple quotes and backticks span lines; other strings end at the newline,
+# which also keeps stray quotes (Rust lifetimes, C++14 digit separators)
+# from swallowing the rest of a file.
+_SYNTAX_BY_EXT: dict[str, CommentSyntax] = {
+    ".py": CommentSyntax("Python", ("#",), (('"""', '"""'), ("'''", "'''")), ('"""', "'''", '"', "'")),
+    ".js": CommentSyntax("JavaScript", ("//",), (("/*", "*/"),), ('"', "'", "`")),
+    ".jsx": CommentSyntax("JavaScript", ("//",), (("/*", "*/"),), ('"', "'", "`")),
+    ".ts": CommentSyntax("TypeScript", ("//",), (("/*", "*/"),), ('"', "'", "`")),
+    ".tsx": CommentSyntax("TypeScript", ("//",), (("/*", "*/"),), ('"', "'", "`")),
+    ".java": CommentSyntax("Java", ("//",), (("/*", "*/"),), ('"""', '"', "'")),
+    ".kt": CommentSyntax("Kotlin", ("//",), (("/*", "*/"),), ('"""', '"', "'")),
+    ".go": CommentSyntax("Go", ("//",), (("/*", "*/"),), ('"', "'", "`")),
+    ".rs": CommentSyntax("Rust", ("//",), (("/*", "*/"),), ('"',)),
+    ".rb": CommentSyntax("Ruby", ("#",), (("=begin", "=end"),), ('"', "'")),
+    ".php": CommentSyntax("PHP", ("//", "#"), (("/*", "*/"),), ('"', "'")),
+    ".c": CommentSyntax("C", *_C_LIKE),
+    ".h": CommentSyntax("C/C++ Header", *_C_LIKE),
+    ".cpp": CommentSyntax("C++", *_C_LIKE),
+    ".cc": CommentSyntax("C++", *_C_LIKE),
+    ".cxx": CommentSyntax("C++", *_C_LIKE),
+    ".hpp": CommentSyntax("C/C++ Header", *_C_LIKE),
+    ".cs": CommentSyntax("C#", *_C_LIKE),
+    ".fs": CommentSyntax("F#", ("//",), (("(*", "*)"),), ('"',)),
+    ".vb": CommentSyntax("Visual Basic", ("'",), (), ('"',)),
+    ".swift": CommentSyntax("Swift", ("//",), (("/*", "*/"),), ('"""', '"')),
+    ".m": CommentSyntax("Objective-C", *_C_LIKE),
+    ".scala": CommentSyntax("Scala", ("//",), (("/*", "*/"),), ('"""', '"', "'")),
+    ".r": CommentSyntax("R", *_HASH),
+    ".jl": CommentSyntax("Julia", ("#",), (("#=", "=#"),), ('"""', '"')),
+    ".ex": CommentSyntax("Elixir", ("#",), (), ('"""', '"', "'")),
+    ".exs": CommentSyntax("Elixir", ("#",), (), ('"""', '"', "'")),
+}
+
+_UNKNOWN = CommentSyntax("Other")
+
+
+def syntax_for_path(path: str) -> CommentSyntax:
+    name = path.rsplit("/", 1)[-1]
+    stem, dot, suffix = name.rpartition(".")
+    if not dot or not stem:
+        return _UNKNOWN
+    return _SYNTAX_BY_EXT.get(f".{suffix.lower()}", _UNKNOWN)
+
+
+def count_lines(content: str, syntax: CommentSyntax) -> LineStats:
+    """Classify each line of ``content`` as code, comment or blank.
+
+    One left-to-right scan jumps from token to token (string delimiters and
+    comment markers) with a compiled regex, so openers and closers pair up
+    and comment markers inside strings are ignored; the comment extents it
+    collects are then turned into line counts with ``str.count`` and
+    ``findall`` over ``pos``/``endpos`` windows, with no Python loop per
+    line. A line holding any code outside comments counts as code, like
+    cloc does; blank lines inside a block comment count as comment. Lines
+    are ``\\n``-separated.
+    """
+    stats = LineStats(files=1)
+    if not content:
+        return stats
+    # Ignore the empty "line" after a trailing newline.
+    end = len(content) - 1 if content.endswith("\n") else len(content)
+    total = content.count("\n", 0, end) + 1
+
+    blank_re = _blank_pattern()
+    comment = 0
+    blank_in_comments = 0
+    for start, stop in _merge(content, _comment_spans(content, syntax, end)):
+        line_start = content.rfind("\n", 0, start) + 1
+        line_end = content.find("\n", stop, end)
+        if line_end == -1:
+            line_end = end
+        code_before = not content[line_start:start].isspace() and line_start < start
+        code_after = not content[stop:line_end].isspace() and stop < line_end
+        lines = content.count("\n", start, stop) + 1
+        if lines == 1:
+            comment += 0 if code_before or code_after else 1
+        else:
+            comment += lines - code_before - code_after
+            blank_in_comments += len(blank_re[1].findall(content, start, stop))
+
+    stats.blank = _count(blank_re, content, 0, end) - blank_in_comments
+    stats.comment = comment
+    stats.code = total - stats.blank - comment
+    return stats
+
+
+_LinePattern = tuple[re.Pattern[str], re.Pattern[str]]
+
+
+@lru_cache(maxsize=None)
+def _blank_pattern() -> _LinePattern:
+    """Blank line pattern for the first line of a window and for every later line."""
+    body = r"[ \t\r\f\v]*(?=\n|\Z)"
+    return re.compile(body), re.compile(rf"\n{body}")
+
+
+@lru_cache(maxsize=None)
+def _scan_pattern(syntax: CommentSyntax) -> re.Pattern[str] | None:
+    """Match from a position up to the next comment.
+
+    A possessive prefix skips code and whole string literals, so the scan
+    only returns to Python once per comment: group 1 captures a block
+    opener, group 2 a run of line comments (consecutive lines that only hold
+    one). Docstring delimiters preceded by a space (or at the start of a
+    window) are left to the caller, which decides between docstring and
+    string from the line start.
+    """
+    openers = {opener for opener, _ in syntax.block}
+    markers = {*syntax.line, *openers}
+    if not markers:
+        return None
+    tokens = markers | set(syntax.strings)
+    specials = re.escape("".join(sorted({token[0] for token in tokens})))
+    units = [rf"[^{specials}]++"]
+    for delimiter in _longest_first(syntax.strings):
+        longer = [re.escape(token) for token in tokens if token != delimiter and token.startswith(delimiter)]
+        guard = f"(?!{'|'.join(longer)})" if longer else ""
+        if delimiter in markers:
+            guard = r"(?<=\S)" + guard
+        body = _string_body(delimiter).pattern
+        units.append(f"{guard}{re.escape(delimiter)}{body}(?:{re.escape(delimiter)})?")
+    units.append(f"(?!{_alternation(markers)})[{specials}]")
+    groups = f"({_alternation(openers)})" if openers else "(?!)"
+    if syntax.line:
+        line_marker = f"(?!{_alternation(openers)})" if openers else ""
+        line_marker += f"(?:{_alternation(syntax.line)})"
+        groups += rf"|({line_marker}[^\n]*+(?:\n[ \t]*+{line_marker}[^\n]*+)*+)"
+    return re.compile(f"(?:{'|'.join(units)})*+(?:{groups})", re.DOTALL)
+
+
+def _alternation(tokens: Iterable[str]) -> str:
+    return "|".join(re.escape(token) for token in _longest_first(tokens))
+
+
+def _longest_first(tokens: Iterable[str]) -> list[str]:
+    # ``#=`` must win over ``#`` and ``"""`` over ``"``.
+    return sorted(tokens, key=lambda token: (-len(token), token))
+
+
+@lru_cache(maxsize=None)
+def _string_body(delimiter: str) -> re.Pattern[str]:
+    """Match a string body up to (not including) its closing ``delimiter``.
+
+    Backslash escapes are skipped; single-line delimiters also stop at the
+    newline.
+    """
+    first = re.escape(delimiter[0])
+    if len(delimiter) > 1:
+        return re.compile(rf"(?:[^{first}\\]|\\.|{first}(?!{re.escape(delimiter[1:])}))*+", re.DOTALL)
+    if delimiter == "`":
+        return re.compile(rf"(?:[^{first}\\]|\\.)*+", re.DOTALL)
+    return re.compile(rf"(?:[^{first}\\\n]|\\.)*+", re.DOTALL)
+
+
+def _comment_spans(content: str, syntax: CommentSyntax, end: int) -> list[tuple[int, int]]:
+    """Return the ``(start, stop)`` offsets of every comment, in order."""
+    scan_re = _scan_pattern(syntax)
+    if scan_re is None:
+        return []
+    closers = dict(syntax.block)
+    spans: list[tuple[int, int]] = []
+    pos = 0
+    # ``match``, not ``search``: the possessive prefix never backtracks, so a
+    # failed match means there is no comment left.
+    while (match := scan_re.match(content, pos, end)) is not None:
+        if match.group(2) is not None:
+            spans.append(match.span(2))
+            pos = match.end(2)
+            continue
+        token, start = match.group(1), match.start(1)
+        if token in syntax.strings and not _starts_line(content, start):
+            stop = _string_body(token).match(content, match.end(), end).end()
+            pos = stop + len(token) if content.startswith(token, stop, end) else stop
+            continue
+        close_at = content.find(closers[token], match.end(), end)
+        stop = end if close_at == -1 else close_at + len(closers[token])
+        spans.append((start, stop))
+        pos = stop
+    return spans
+
+
+def _starts_line(content: str, offset: int) -> bool:
+    line_start = content.rfind("\n", 0, offset) + 1
+    return line_start == offset or content[line_start:offset].isspace()
+
+
+def _merge(content: str, spans: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Join comments separated only by spaces on one line (``/* a */ /* b */``)."""
+    merged: list[tuple[int, int]] = []
+    for start, stop in spans:
+        if merged:
+            previous_start, previous_stop = merged[-1]
+            gap = content.find("\n", previous_stop, start) == -1
+            if gap and (previous_stop == start or content[previous_stop:start].isspace()):
+                merged[-1] = (previous_start, stop)
+                continue
+        merged.append((start, stop))
+    return merged
+
+
+def _count(pattern: _LinePattern, content: str, start: int, stop: int) -> int:
+    first, rest = pattern
+    leading = 1 if first.match(content, start, stop) else 0
+    return leading + len(rest.findall(content, start, stop))
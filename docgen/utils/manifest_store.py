@@ -0,0 +1,231 @@
+"""Project manifests (package.json, pyproject.toml, Gemfile...) parsed once.
+
+Every detector reads manifests through a ``ManifestStore``: each file is
+parsed at most once per (path, size, mtime) for the life of the process,
+and the parsed values are persisted in the user cache so the next run
+only re-parses manifests that changed.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import json
+import os
+from pathlib import Path
+import re
+import threading
+from typing import Any, Callable
+import xml.etree.ElementTree as ET
+
+import tomllib
+
+from .cache import cache_dir
+from .fingerprint import fingerprint
+
+STORE_FORMAT = 1
+
+_GEM_RE = re.compile(r"""^\s*gem\s+["']([^"']+)["']""")
+
+
+@dataclass(frozen=True)
+class _Parsed:
+    state: tuple[int, int]
+    value: Any
+    error: str | None = None
+
+
+class ManifestStore:
+    """Memoized, typed access to the manifests of one repository.
+
+    Accessors take an optional ``warnings`` list; a parse failure is
+    reported there on every call (it is memoized like a value).
+    """
+
+    def __init__(self, cache_file: Path | None = None) -> None:
+        self._cache_file = cache_file
+        self._entries: dict[tuple[str, str], _Parsed] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.parsed = 0
+        if cache_file is not None:
+            self._load(cache_file)
+
+    def json(self, path: Path, warnings: list[str] | None = None) -> Any:
+        return self._get(path, "json", _parse_json, "Failed to parse JSON", warnings)
+
+    def toml(self, path: Path, warnings: list[str] | None = None) -> dict[str, Any]:
+        value = self._get(path, "toml", _parse_toml, "Failed to parse TOML", warnings)
+        return value if isinstance(value, dict) else {}
+
+    def text(self, path: Path, warnings: list[str] | None = None) -> str | None:
+        return self._get(path, "text", _read_text, "Failed to read", warnings)
+
+    def requirements(self, path: Path, warnings: list[str] | None = None) -> list[str]:
+        """Non-empty, non-comment lines of a requirements file."""
+        value = self._get(path, "requirements", _parse_requirements, "Failed to read requirements", warnings)
+        return value if isinstance(value, list) else []
+
+    def gems(self, path: Path, warnings: list[str] | None = None) -> list[str]:
+        """Gem names declared in a Gemfile."""
+        value = self._get(path, "gems", _parse_gems, "Failed to read Gemfile", warnings)
+        return value if isinstance(value, list) else []
+
+    def composer_packages(self, path: Path, warnings: list[str] | None = None) -> list[str]:
+        """Package names under ``require`` and ``require-dev`` of a composer.json."""
+        data = self.json(path, warnings)
+        if not isinstance(data, dict):
+            return []
+        packages: list[str] = []
+        for section in ("require", "require-dev"):
+            value = data.get(section)
+            if isinstance(value, dict):
+                packages.extend(str(name) for name in value)
+        return packages
+
+    def pom(self, path: Path, warnings: list[str] | None = None) -> dict[str, Any]:
+        """artifactId, parent artifactId and dependency artifactIds of a pom.xml."""
+        value = self._get(path, "pom", _parse_pom, "Failed to parse pom.xml", warnings)
+        return value if isinstance(value, dict) else {}
+
+    def save(self) -> None:
+        """Persist the parsed manifests (no-op without a cache file or changes)."""
+        if self._cache_file is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = []
+            for (path, kind), parsed in self._entries.items():
+                entry = [path, kind, list(parsed.state), parsed.value, parsed.error]
+                try:
+                    json.dumps(entry)
+                except (TypeError, ValueError):
+                    continue  # e.g. TOML dates: parsed again next run
+                entries.append(entry)
+            self._dirty = False
+        payload = json.dumps({"format": STORE_FORMAT, "entries": entries}, separators=(",", ":"))
+        temp = self._cache_file.with_name(f"{self._cache_file.name}.{os.getpid()}.tmp")
+        try:
+            temp.write_text(payload, encoding="utf-8")
+            os.replace(temp, self._cache_file)
+        except OSError:
+            temp.unlink(missing_ok=True)
+
+    def _get(
+        self,
+        path: Path,
+        kind: str,
+        parse: Callable[[Path], Any],
+        message: str,
+        warnings: list[str] | None,
+    ) -> Any:
+        key = (path.as_posix(), kind)
+        try:
+            stat = path.stat()
+            state = (stat.st_size, stat.st_mtime_ns)
+        except OSError as exc:
+            if warnings is not None:
+                warnings.append(f"{message}: {path}: {exc}")
+            return None
+        with self._lock:
+            parsed = self._entries.get(key)
+        if parsed is None or parsed.state != state:
+            try:
+                parsed = _Parsed(state, parse(path))
+            except (OSError, ValueError) as exc:
+                parsed = _Parsed(state, None, f"{message}: {path}: {exc}")
+            with self._lock:
+                self._entries[key] = parsed
+                self._dirty = True
+                self.parsed += 1
+        if parsed.error is not None and warnings is not None:
+            warnings.append(parsed.error)
+        return parsed.value
+
+    def _load(self, cache_file: Path) -> None:
+        try:
+            data = json.loads(cache_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("format") != STORE_FORMAT:
+            return
+        for entry in data.get("entries") or []:
+            try:
+                path, kind, state, value, error = entry
+                self._entries[(str(path), str(kind))] = _Parsed((int(state[0]), int(state[1])), value, error)
+            except (TypeError, ValueError, IndexError):
+                continue
+
+
+_STORES: dict[str, ManifestStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def manifest_store(repo_path: Path, persistent: bool = True) -> ManifestStore:
+    """Return the process-wide store of ``repo_path`` (loaded from the user cache).
+
+    With ``persistent=False`` a private, memory-only store is returned.
+    """
+    if not persistent:
+        return ManifestStore()
+    root = repo_path.resolve().as_posix()
+    with _STORES_LOCK:
+        store = _STORES.get(root)
+        if store is None:
+            directory = cache_dir("manifests")
+            cache_file = directory / f"{fingerprint(root)[:24]}.json" if directory else None
+            store = _STORES[root] = ManifestStore(cache_file)
+        return store
+
+
+def _read_text(path: Path) -> str:
+    return path.read_text(encoding="utf-8")
+
+
+def _parse_json(path: Path) -> Any:
+    return json.loads(_read_text(path))
+
+
+def _parse_toml(path: Path) -> dict[str, Any]:
+    return tomllib.loads(_read_text(path))
+
+
+def _parse_requirements(path: Path) -> list[str]:
+    cleaned: list[str] = []
+    for line in _read_text(path).splitlines():
+        stripped = line.strip()
+        if stripped and not stripped.startswith("#"):
+            cleaned.append(stripped)
+    return cleaned
+
+
+def _parse_gems(path: Path) -> list[str]:
+    gems: list[str] = []
+    for line in _read_text(path).splitlines():
+        match = _GEM_RE.match(line)
+        if match:
+            gems.append(match.group(1))
+    return gems
+
+
+def _parse_pom(path: Path) -> dict[str, Any]:
+    try:
+        root = ET.fromstring(_read_text(path))
+    except ET.ParseError as exc:
+        raise ValueError(str(exc)) from exc
+    for element in root.iter():
+        element.tag = element.tag.rpartition("}")[2]  # drop the POM namespace
+
+    def text(element: ET.Element | None, tag: str) -> str | None:
+        found = element.find(tag) if element is not None else None
+        return found.text.strip() if found is not None and found.text else None
+
+    return {
+        "artifact_id": text(root, "artifactId"),
+        "parent": text(root.find("parent"), "artifactId"),
+        "dependencies": [
+            name
+            for name in (text(dependency, "artifactId") for dependency in root.findall("dependencies/dependency"))
+            if name
+        ],
+    }
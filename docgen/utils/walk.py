@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import hashlib
 import os
 from pathlib import Path
+from typing import Iterator
 
 from .ignore import Excluder
 
@@ -11,8 +13,36 @@ from .ignore import Excluder
 def walk_repo(repo_path: Path, excluder: Excluder) -> tuple[list[Path], list[Path]]:
     files: list[Path] = []
     dirs: list[Path] = []
+    for rel_path, _, is_dir in _iter_entries(repo_path, excluder):
+        (dirs if is_dir else files).append(rel_path)
+    return files, dirs
+
 
-    def _walk(current: Path, rel: Path) -> None:
+def snapshot_repo(repo_path: Path, excluder: Excluder, skip: frozenset[str] = frozenset()) -> str:
+    """Fingerprint the walked tree from paths, sizes and mtimes only.
+
+    ``skip`` holds repo-relative POSIX paths (e.g. generated outputs) that must
+    not influence the fingerprint. Nothing is read beyond directory entries.
+    """
+    digest = hashlib.sha256()
+    for rel_path, entry, is_dir in _iter_entries(repo_path, excluder):
+        rel_posix = rel_path.as_posix()
+        if rel_posix in skip:
+            continue
+        if is_dir:
+            digest.update(f"d\0{rel_posix}\n".encode("utf-8", "surrogateescape"))
+            continue
+        try:
+            stat = entry.stat(follow_symlinks=False)
+        except OSError:
+            continue
+        record = f"f\0{rel_posix}\0{stat.st_size}\0{stat.st_mtime_ns}\n"
+        digest.update(record.encode("utf-8", "surrogateescape"))
+    return digest.hexdigest()
+
+
+def _iter_entries(repo_path: Path, excluder: Excluder) -> Iterator[tuple[Path, os.DirEntry[str], bool]]:
+    def _walk(current: Path, rel: Path) -> Iterator[tuple[Path, os.DirEntry[str], bool]]:
         try:
             with os.scandir(current) as it:
                 entries = sorted(it, key=lambda entry: entry.name)
@@ -28,14 +58,13 @@ def walk_repo(repo_path: Path, excluder: Excluder) -> tuple[list[Path], list[Pat
                     continue
                 if excluder.is_excluded(rel_posix, is_dir=True):
                     continue
-                dirs.append(rel_path)
-                _walk(Path(entry.path), rel_path)
+                yield rel_path, entry, True
+                yield from _walk(Path(entry.path), rel_path)
                 continue
 
             if entry.is_file(follow_symlinks=False):
                 if excluder.is_excluded(rel_posix, is_dir=False):
                     continue
-                files.append(rel_path)
+                yield rel_path, entry, False
 
-    _walk(repo_path, Path(""))
-    return files, dirs
+    return _walk(repo_path, Path(""))
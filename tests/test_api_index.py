@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import shutil
+
+import pytest
+
+from docgen.config import DocGenConfig
+from docgen.services.api_index_service import API_INDEX_CACHE, build_api_index
+from docgen.services.build_service import build_docs
+from docgen.services.check_service import check_docs
+
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+INDEX_XML = """<?xml version='1.0'?>
+<doxygenindex>
+  <compound refid="namespacenet" kind="namespace"><name>net</name></compound>
+  <compound refid="classnet_1_1Socket" kind="class"><name>net::Socket</name>
+    <member refid="a1" kind="function"><name>open</name></member>
+  </compound>
+  <compound refid="structPoint" kind="struct"><name>Point</name></compound>
+  <compound refid="main_8cpp" kind="file"><name>main.cpp</name></compound>
+</doxygenindex>
+"""
+
+COMPOUNDS = {
+    "namespacenet": """<doxygen><compounddef id="namespacenet" kind="namespace">
+  <compoundname>net</compoundname>
+  <sectiondef kind="func">
+    <memberdef kind="function" id="f1"><name>resolve</name>
+      <briefdescription><para>Resolve a host.</para></briefdescription><detaileddescription/></memberdef>
+  </sectiondef>
+</compounddef></doxygen>""",
+    "classnet_1_1Socket": """<doxygen><compounddef id="classnet_1_1Socket" kind="class">
+  <compoundname>net::Socket</compoundname>
+  <sectiondef kind="public-func">
+    <memberdef kind="function" id="a1"><name>open</name>
+      <briefdescription/><detaileddescription><para>Opens it.</para></detaileddescription></memberdef>
+    <memberdef kind="function" id="a2"><name>close</name>
+      <briefdescription>
+      </briefdescription><detaileddescription/></memberdef>
+    <memberdef kind="variable" id="a3"><name>fd</name><briefdescription/><detaileddescription/></memberdef>
+  </sectiondef>
+</compounddef></doxygen>""",
+    "structPoint": """<doxygen><compounddef id="structPoint" kind="struct">
+  <compoundname>Point</compoundname>
+  <sectiondef kind="public-attrib">
+    <memberdef kind="variable" id="p1"><name>x</name><briefdescription><para>X.</para></briefdescription></memberdef>
+  </sectiondef>
+</compounddef></doxygen>""",
+    "main_8cpp": "<doxygen><not-closed>",
+}
+
+
+def _write_xml(xml_dir: Path) -> None:
+    xml_dir.mkdir(parents=True, exist_ok=True)
+    (xml_dir / "index.xml").write_text(INDEX_XML, encoding="utf-8")
+    for refid, text in COMPOUNDS.items():
+        (xml_dir / f"{refid}.xml").write_text(text, encoding="utf-8")
+
+
+def test_build_api_index_counts_documented_members(tmp_path: Path) -> None:
+    _write_xml(tmp_path / "xml")
+
+    index = build_api_index([tmp_path / "xml"])
+
+    assert index["class_count"] == 2
+    assert index["namespace_count"] == 2
+    assert (index["documented"], index["undocumented"]) == (3, 2)
+    assert index["namespaces"] == [
+        {"name": "", "classes": 1, "documented": 1, "undocumented": 0},
+        {"name": "net", "classes": 1, "documented": 2, "undocumented": 2},
+    ]
+    assert index["classes"][0] == {
+        "name": "net::Socket",
+        "kind": "class",
+        "namespace": "net",
+        "documented": 1,
+        "undocumented": 2,
+    }
+
+
+def test_build_renders_api_section_from_doxygen_xml(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    xml_src = tmp_path / "xml-src"
+    _write_xml(xml_src)
+    log = tmp_path / "doxygen.log"
+    script = bin_dir / "doxygen"
+    script.write_text(
+        "#!/bin/sh\n"
+        f"echo run >> '{log}'\n"
+        "grep -q '^GENERATE_XML *= *YES' \"$1\" || exit 3\n"
+        "out=$(sed -n 's/^OUTPUT_DIRECTORY *= *//p' \"$1\" | tail -n 1)\n"
+        f"cp -r '{xml_src}' \"$out/xml\"\n",
+        encoding="utf-8",
+    )
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+
+    repo_path = tmp_path / "repo"
+    shutil.copytree(FIXTURES / "repo_python", repo_path)
+    config = DocGenConfig(output_dir="DocGen", readme_target="output", doxygen_api_index=True)
+
+    build_docs(repo_path, config, doxygen=True)
+
+    readme = (repo_path / "DocGen" / "README.md").read_text(encoding="utf-8")
+    assert "<!-- DOCGEN:START api -->" in readme
+    assert "| net | 1 | 2 | 2 |" in readme
+    assert "- net::Socket (class): 2 membres non documentes sur 3" in readme
+    assert (repo_path / "DocGen" / "api" / API_INDEX_CACHE).exists()
+
+    shutil.rmtree(xml_src)
+    plan = build_docs(repo_path, config, doxygen=True)
+    assert plan.up_to_date and plan.doxygen_up_to_date
+    assert log.read_text(encoding="utf-8").count("run") == 1
+    assert "| net | 1 | 2 | 2 |" in (repo_path / "DocGen" / "README.md").read_text(encoding="utf-8")
+
+    report = check_docs(repo_path, config)
+    assert report.up_to_date and report.from_manifest
@@ -1,14 +1,20 @@
 from __future__ import annotations
 
+from dataclasses import replace
+import os
 from pathlib import Path
 import shutil
+import subprocess
+import tempfile
 
 import pytest
 
 from docgen.config import DocGenConfig
-from docgen.errors import ConfigError
+from docgen.errors import ConfigError, DocGenIOError, UsageError
+from docgen.services import context_service
 from docgen.services.build_service import build_docs
-from docgen.services.doxygen_service import find_doxyfile
+from docgen.services.doxygen_service import find_doxyfile, parse_doxyfile, prepare_doxyfile
+from docgen.services.manifest_service import MANIFEST_NAME, load_manifest
 
 
 FIXTURES = Path(__file__).parent / "fixtures"
@@ -139,3 +145,321 @@ def test_build_dry_run_doxygen_uses_template(tmp_path: Path) -> None:
     plan = build_docs(repo_path, config, dry_run=True, doxygen=True)
     expected = find_doxyfile(repo_path)
     assert plan.doxygen_file == expected
+
+
+def test_build_skips_identical_content(tmp_path: Path) -> None:
+    repo_path = _copy_fixture(tmp_path, "repo_python")
+    config = DocGenConfig(output_dir="DocGen", readme_target="output")
+
+    build_docs(repo_path, config)
+    readme_path = repo_path / "DocGen" / "README.md"
+    first_mtime = readme_path.stat().st_mtime_ns
+    os.utime(readme_path, ns=(first_mtime - 10_000_000_000, first_mtime - 10_000_000_000))
+    stale_mtime = readme_path.stat().st_mtime_ns
+    # Bump an input's mtime so the build runs instead of short-circuiting.
+    os.utime(repo_path / "pyproject.toml", ns=(first_mtime + 1, first_mtime + 1))
+
+    plan = build_docs(repo_path, config)
+
+    assert plan.reports[readme_path].untouched
+    assert readme_path.stat().st_mtime_ns == stale_mtime
+    assert not list(readme_path.parent.glob(".*.tmp"))
+
+    plan = build_docs(repo_path, config, force=True)
+    assert plan.reports[readme_path].overwritten
+    assert plan.reports[readme_path].untouched
+    assert readme_path.stat().st_mtime_ns == stale_mtime
+
+
+def test_build_rerenders_only_sections_with_changed_inputs(tmp_path: Path) -> None:
+    incremental = _copy_fixture(tmp_path / "a", "repo_node")
+    full = _copy_fixture(tmp_path / "b", "repo_node")
+    config = DocGenConfig(output_dir="DocGen", readme_target="output")
+    for repo_path in (incremental, full):
+        build_docs(repo_path, config)
+        package_json = repo_path / "package.json"
+        package_json.write_text(
+            package_json.read_text(encoding="utf-8").replace('"test"', '"unit"'),
+            encoding="utf-8",
+        )
+    (full / "DocGen" / MANIFEST_NAME).unlink()
+
+    plan = build_docs(incremental, config)
+    build_docs(full, config)
+
+    readme_path = incremental / "DocGen" / "README.md"
+    report = plan.reports[readme_path]
+    assert report.replaced == ["commands"]
+    assert "summary" in (report.skipped or [])
+    assert "commands" not in (report.skipped or [])
+    for name in ("README.md", "ARCHITECTURE.md", "index.md"):
+        expected = (full / "DocGen" / name).read_text(encoding="utf-8")
+        expected = expected.replace(full.as_posix(), incremental.as_posix())
+        assert (incremental / "DocGen" / name).read_text(encoding="utf-8") == expected
+
+
+def test_build_is_noop_when_nothing_changed(tmp_path: Path) -> None:
+    repo_path = _copy_fixture(tmp_path, "repo_python")
+    config = DocGenConfig(output_dir="DocGen", readme_target="output")
+
+    first = build_docs(repo_path, config)
+    assert not first.up_to_date
+
+    second = build_docs(repo_path, config)
+    assert second.up_to_date
+    assert second.reports == {}
+    assert second.targets == first.targets
+
+    readme_path = repo_path / "DocGen" / "README.md"
+    readme_path.write_text("# tampered\n", encoding="utf-8")
+    third = build_docs(repo_path, config)
+    assert not third.up_to_date
+    assert "<!-- DOCGEN:START summary -->" in readme_path.read_text(encoding="utf-8")
+
+    (repo_path / "requirements.txt").write_text("pytest\nruff\n", encoding="utf-8")
+    assert not build_docs(repo_path, config).up_to_date
+    assert build_docs(repo_path, config).up_to_date
+    assert not build_docs(repo_path, config, force=True).up_to_date
+
+
+def test_build_selected_sections_only(tmp_path: Path) -> None:
+    repo_path = _copy_fixture(tmp_path, "repo_python")
+    config = DocGenConfig(output_dir="DocGen", readme_target="output")
+    build_docs(repo_path, config)
+
+    readme_path = repo_path / "DocGen" / "README.md"
+    architecture_path = repo_path / "DocGen" / "ARCHITECTURE.md"
+    architecture = architecture_path.read_text(encoding="utf-8")
+    readme = readme_path.read_text(encoding="utf-8")
+    readme_path.write_text(
+        readme.replace("## Commandes", "## Commandes (stale)").replace("## CI", "## CI (stale)"),
+        encoding="utf-8",
+    )
+
+    plan = build_docs(repo_path, config, only_sections=["readme.commands"])
+
+    content = readme_path.read_text(encoding="utf-8")
+    assert "## Commandes\n" in content
+    assert "## CI (stale)" in content
+    assert plan.targets == [readme_path]
+    assert plan.reports[readme_path].replaced == ["commands"]
+    assert architecture_path.read_text(encoding="utf-8") == architecture
+
+    with pytest.raises(UsageError):
+        build_docs(repo_path, config, only_sections=["readme.nope"])
+
+
+def test_build_module_pages_are_incremental(tmp_path: Path) -> None:
+    repo_path = tmp_path / "repo"
+    (repo_path / "pkg").mkdir(parents=True)
+    (repo_path / "pkg" / "__init__.py").write_text('"""Pkg."""\n', encoding="utf-8")
+    (repo_path / "pkg" / "core.py").write_text("class Base:\n    pass\n", encoding="utf-8")
+    (repo_path / "pkg" / "ext.py").write_text(
+        "from .core import Base\n\nclass Child(Base):\n    pass\n", encoding="utf-8"
+    )
+    config = DocGenConfig(output_dir="DocGen", readme_target="output", module_pages=True)
+
+    plan = build_docs(repo_path, config)
+
+    pages_dir = repo_path / "DocGen" / "modules"
+    assert plan.module_pages is not None
+    assert plan.module_pages.written == ["pkg.core.md", "pkg.ext.md", "pkg.md"]
+    assert "[pkg.ext](pkg.ext.md)" in (pages_dir / "pkg.core.md").read_text(encoding="utf-8")
+    assert "(modules/pkg.core.md)" in (repo_path / "DocGen" / "index.md").read_text(encoding="utf-8")
+
+    (repo_path / "pkg" / "ext.py").unlink()
+    plan = build_docs(repo_path, config)
+
+    assert plan.module_pages is not None
+    assert plan.module_pages.written == ["pkg.core.md"]
+    assert plan.module_pages.unchanged == ["pkg.md"]
+    assert plan.module_pages.removed == ["pkg.ext.md"]
+    assert not (pages_dir / "pkg.ext.md").exists()
+
+    plan = build_docs(repo_path, replace(config, module_pages=False))
+
+    assert plan.module_pages is not None
+    assert plan.module_pages.removed == ["pkg.core.md", "pkg.md"]
+    assert not pages_dir.exists()
+    assert load_manifest(repo_path / "DocGen" / MANIFEST_NAME).modules == {}
+
+
+def test_build_doxygen_skips_run_when_inputs_unchanged(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    log = tmp_path / "doxygen.log"
+    script = bin_dir / "doxygen"
+    script.write_text(
+        f"#!/bin/sh\necho run >> '{log}'\necho 'Parsing file x.cpp...'\necho 'x.cpp:1: warning: undocumented' >&2\n",
+        encoding="utf-8",
+    )
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+
+    repo_path = _copy_fixture(tmp_path, "repo_python")
+    (repo_path / "docs").mkdir(exist_ok=True)
+    source = repo_path / "docs" / "guide.md"
+    source.write_text("# Guide\n", encoding="utf-8")
+    config = DocGenConfig(output_dir="DocGen", readme_target="output")
+
+    plan = build_docs(repo_path, config, doxygen=True)
+    assert plan.doxygen_ran
+    assert plan.doxygen_warnings == 1
+    assert plan.doxygen_parsed_files == 1
+    plan = build_docs(repo_path, config, doxygen=True)
+    assert not plan.doxygen_ran
+    assert plan.doxygen_up_to_date
+    assert build_docs(repo_path, config, dry_run=True, doxygen=True).doxygen_up_to_date
+
+    source.write_text("# Guide v2\n", encoding="utf-8")
+    assert build_docs(repo_path, config, doxygen=True).doxygen_ran
+    assert build_docs(repo_path, config, doxygen=True, force=True).doxygen_ran
+    assert log.read_text(encoding="utf-8").count("run") == 3
+
+
+def test_prepare_doxyfile_lists_scanned_inputs(tmp_path: Path) -> None:
+    repo_path = tmp_path / "repo"
+    (repo_path / "src").mkdir(parents=True)
+    (repo_path / "src" / "main.cpp").write_text("int main() {}\n", encoding="utf-8")
+    (repo_path / "node_modules" / "dep").mkdir(parents=True)
+    (repo_path / "node_modules" / "dep" / "index.js").write_text("", encoding="utf-8")
+    (repo_path / "DocGen").mkdir()
+    (repo_path / "DocGen" / "README.md").write_text("# out\n", encoding="utf-8")
+
+    _, rendered = prepare_doxyfile(repo_path, DocGenConfig())
+    settings = parse_doxyfile(rendered)
+
+    assert settings["INPUT"] == ["src/main.cpp"]
+    assert settings["RECURSIVE"] == ["NO"]
+    assert settings["NUM_PROC_THREADS"] == [str(os.cpu_count() or 1)]
+    assert f"{repo_path.resolve().as_posix()}/*/node_modules/*" in settings["EXCLUDE_PATTERNS"]
+    assert settings["PROJECT_NAME"] == ["repo"]
+
+
+def test_build_doxygen_timeout_kills_process_group(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "doxygen"
+    script.write_text("#!/bin/sh\necho 'a.cpp:1: warning: undocumented' >&2\nsleep 30 &\nwait\n", encoding="utf-8")
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+
+    repo_path = _copy_fixture(tmp_path, "repo_python")
+    config = DocGenConfig(output_dir="DocGen", readme_target="output", doxygen_timeout=0.5)
+
+    with pytest.raises(DocGenIOError, match="timed out"):
+        build_docs(repo_path, config, doxygen=True)
+
+    assert (repo_path / "DocGen" / "README.md").exists()
+    assert not list(Path(tempfile.gettempdir()).glob("docgen-*.Doxyfile"))
+
+
+def test_build_doxygen_shards_cross_link_tag_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    runs = tmp_path / "runs"
+    runs.mkdir()
+    script = bin_dir / "doxygen"
+    script.write_text(f"#!/bin/sh\ncp \"$1\" \"$(mktemp '{runs}/run.XXXXXX')\"\n", encoding="utf-8")
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+
+    repo_path = tmp_path / "repo"
+    for name in ("core", "net", "ui"):
+        (repo_path / name).mkdir(parents=True)
+        (repo_path / name / f"{name}.cpp").write_text("int f() { return 0; }\n", encoding="utf-8")
+    (repo_path / "core" / "extra.cpp").write_text("int g() { return 1; }\n", encoding="utf-8")
+    config = DocGenConfig(output_dir="DocGen", readme_target="output")
+
+    plan = build_docs(repo_path, config, doxygen=True, doxygen_shards=2)
+
+    assert plan.doxygen_ran
+    doxyfiles = [parse_doxyfile(path.read_text(encoding="utf-8")) for path in runs.iterdir()]
+    tag_pass = [item for item in doxyfiles if item.get("GENERATE_TAGFILE")]
+    docs_pass = [item for item in doxyfiles if item.get("TAGFILES")]
+    assert len(tag_pass) == 2 and len(docs_pass) == 2
+    assert sorted(item["INPUT"] for item in docs_pass) == [
+        ["core/core.cpp", "core/extra.cpp"],
+        ["net/net.cpp", "ui/ui.cpp"],
+    ]
+    assert all(item["GENERATE_HTML"] == ["NO"] for item in tag_pass)
+    links = {item["OUTPUT_DIRECTORY"][0]: item["TAGFILES"] for item in docs_pass}
+    assert links["DocGen/.api.staging/shard-1"] == ["DocGen/.api.staging/tags/shard-2.tag=../shard-2"]
+    index = (repo_path / "DocGen" / "api" / "index.html").read_text(encoding="utf-8")
+    assert 'href="shard-1/index.html"' in index
+    assert not list(Path(tempfile.gettempdir()).glob("docgen-*.Doxyfile"))
+    assert not build_docs(repo_path, config, doxygen=True, doxygen_shards=2).doxygen_ran
+
+
+def test_build_doxygen_swaps_staged_output(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "doxygen"
+    script.write_text(
+        "#!/bin/sh\n"
+        "out=$(sed -n 's/^OUTPUT_DIRECTORY *= *//p' \"$1\" | tail -n 1)\n"
+        "[ -f \"$out/../fail\" ] && exit 2\n"
+        "echo same > \"$out/same.html\"\n"
+        "date +%s%N > \"$out/changed.html\"\n",
+        encoding="utf-8",
+    )
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+
+    repo_path = _copy_fixture(tmp_path, "repo_python")
+    api = repo_path / "DocGen" / "api"
+    config = DocGenConfig(output_dir="DocGen", readme_target="output")
+
+    build_docs(repo_path, config, doxygen=True)
+    first = (api / "same.html").stat().st_ino
+    build_docs(repo_path, config, doxygen=True, force=True)
+    assert (api / "same.html").stat().st_ino == first
+    assert (api / "same.html").stat().st_nlink == 1
+
+    previous = (api / "changed.html").read_text(encoding="utf-8")
+    (repo_path / "DocGen" / "fail").write_text("", encoding="utf-8")
+    with pytest.raises(DocGenIOError, match="exit code 2"):
+        build_docs(repo_path, config, doxygen=True, force=True)
+    assert (api / "changed.html").read_text(encoding="utf-8") == previous
+    assert sorted(path.name for path in (repo_path / "DocGen").iterdir() if path.name.startswith(".api")) == []
+
+
+def test_build_git_incremental_skips_the_walk(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    repo_path = _copy_fixture(tmp_path, "repo_python")
+    for role in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{role}_NAME", "DocGen")
+        monkeypatch.setenv(f"GIT_{role}_EMAIL", "docgen@example.com")
+
+    def git(*args: str) -> None:
+        subprocess.run(["git", "-C", str(repo_path), *args], check=True, capture_output=True)
+
+    git("init", "-q")
+    git("add", "-A")
+    git("commit", "-q", "-m", "init")
+    config = DocGenConfig(git_incremental=True)
+    assert not build_docs(repo_path, config).up_to_date
+    manifest = load_manifest(repo_path / "DocGen" / MANIFEST_NAME)
+    assert manifest.git_head and manifest.git_dirty == {}
+
+    walks: list[Path] = []
+    original = context_service.snapshot_repo
+    monkeypatch.setattr(
+        context_service, "snapshot_repo", lambda path, *args: walks.append(path) or original(path, *args)
+    )
+    assert build_docs(repo_path, config).up_to_date
+    assert walks == []
+
+    (repo_path / "requirements.txt").write_text("pytest\nruff\nmypy\n", encoding="utf-8")
+    assert not build_docs(repo_path, config).up_to_date
+    assert build_docs(repo_path, config).up_to_date
+    assert len(walks) == 1
+    git("commit", "-q", "-am", "mypy")
+    assert build_docs(repo_path, config).up_to_date  # committed: in the diff, same snapshot
+    assert build_docs(repo_path, config).up_to_date
+    assert len(walks) == 2
+
+    manifest_file = repo_path / "DocGen" / MANIFEST_NAME
+    content = manifest_file.read_text(encoding="utf-8")
+    manifest_file.write_text(content.replace(load_manifest(manifest_file).git_head, "0" * 40), encoding="utf-8")
+    assert build_docs(repo_path, config).up_to_date  # unknown commit: full walk
+    assert len(walks) == 3
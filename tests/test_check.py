@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from pathlib import Path
+import shutil
+
+from typer.testing import CliRunner
+
+from docgen.cli import app
+from docgen.config import DocGenConfig
+from docgen.errors import ExitCode
+from docgen.services.build_service import build_docs
+from docgen.services.check_service import check_docs
+
+
+FIXTURES = Path(__file__).parent / "fixtures"
+runner = CliRunner()
+
+
+def _copy_fixture(tmp_path: Path, name: str) -> Path:
+    src = FIXTURES / name
+    dest = tmp_path / name
+    shutil.copytree(src, dest)
+    return dest
+
+
+def _snapshot(path: Path) -> dict[str, bytes]:
+    return {item.name: item.read_bytes() for item in path.iterdir() if item.is_file()}
+
+
+def test_check_reports_stale_sections_without_writing(tmp_path: Path) -> None:
+    repo_path = _copy_fixture(tmp_path, "repo_node")
+    config = DocGenConfig(output_dir="DocGen", readme_target="output")
+    build_docs(repo_path, config)
+
+    assert check_docs(repo_path, config).up_to_date
+
+    package_json = repo_path / "package.json"
+    package_json.write_text(
+        package_json.read_text(encoding="utf-8").replace('"lint"', '"check"'),
+        encoding="utf-8",
+    )
+    before = _snapshot(repo_path / "DocGen")
+
+    report = check_docs(repo_path, config)
+
+    stale = {(item.target.name, item.section) for item in report.stale}
+    assert ("README.md", "commands") in stale
+    assert ("index.md", "commands") in stale
+    assert ("README.md", "summary") not in stale
+    assert _snapshot(repo_path / "DocGen") == before
+
+    fast = check_docs(repo_path, config, fail_fast=True)
+    assert len(fast.stale) == 1
+
+
+def test_check_cli_exit_codes(tmp_path: Path) -> None:
+    repo_path = _copy_fixture(tmp_path, "repo_python")
+
+    missing = runner.invoke(app, ["check", "--repo", str(repo_path)])
+    assert missing.exit_code == ExitCode.STALE
+    assert "file missing" in missing.stdout
+    assert not (repo_path / "DocGen").exists()
+
+    assert runner.invoke(app, ["build", "--repo", str(repo_path)]).exit_code == 0
+    current = runner.invoke(app, ["check", "--repo", str(repo_path)])
+    assert current.exit_code == 0
+    assert "up to date" in current.stdout
+
+
+def test_check_fail_fast_stops_at_first_stale_module_page(tmp_path: Path) -> None:
+    repo_path = tmp_path / "repo"
+    (repo_path / "pkg").mkdir(parents=True)
+    (repo_path / "pkg" / "__init__.py").write_text('"""Pkg."""\n', encoding="utf-8")
+    (repo_path / "pkg" / "core.py").write_text("class Base:\n    pass\n", encoding="utf-8")
+    config = DocGenConfig(output_dir="DocGen", readme_target="output", module_pages=True)
+    build_docs(repo_path, config)
+    for page in (repo_path / "DocGen" / "modules").iterdir():
+        page.unlink()
+
+    assert len(check_docs(repo_path, config).stale) == 2
+    fast = check_docs(repo_path, config, fail_fast=True)
+    assert [item.reason for item in fast.stale] == ["module page outdated"]
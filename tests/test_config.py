@@ -1,6 +1,9 @@
 from pathlib import Path
 
+import pytest
+
 from docgen.config import DEFAULT_EXCLUDE, DocGenConfig, load_config
+from docgen.utils.fingerprint import fingerprint
 
 
 def test_load_config_merges_defaults(tmp_path: Path) -> None:
@@ -31,3 +34,10 @@ def test_load_config_overrides_exclude(tmp_path: Path) -> None:
 
     assert config.output_dir == "DocGen"
     assert config.exclude == ["custom/", "vendor/"]
+
+
+def test_config_fingerprint_is_stable() -> None:
+    assert fingerprint(DocGenConfig()) == fingerprint(DocGenConfig())
+    assert fingerprint(DocGenConfig(module_pages=True)) != fingerprint(DocGenConfig())
+    with pytest.raises(TypeError):
+        fingerprint(object())
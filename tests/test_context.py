@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from docgen.rendering.context import LazyContext
+from docgen.rendering.sections import render_section, template_layout
+
+
+def _context(calls: list[str], **values: object) -> LazyContext:
+    context = LazyContext({"name": "demo", **values})
+
+    def load() -> dict[str, object]:
+        calls.append("heavy")
+        return {"heavy_value": 42}
+
+    context.add_facet("heavy", ["heavy_value"], load, token=lambda: "snapshot")
+    return context
+
+
+def test_lazy_context_loads_facets_on_first_read() -> None:
+    calls: list[str] = []
+    context = _context(calls)
+
+    assert "heavy_value" in context
+    assert sorted(context) == ["heavy_value", "name"]
+    assert context.input_token("heavy_value") == {"facet": "heavy", "token": "snapshot"}
+    assert calls == []
+
+    assert context["heavy_value"] == 42
+    assert context["heavy_value"] == 42
+    assert calls == ["heavy"]
+    assert context.is_loaded("heavy")
+
+
+def test_section_render_skips_unused_facets() -> None:
+    calls: list[str] = []
+    context = _context(calls, commands={"run": "make run"})
+
+    section = template_layout("README.md.j2").sections["commands"]
+    block = render_section(section, context)
+
+    assert "make run" in block.body
+    assert calls == []
@@ -2,11 +2,15 @@ from __future__ import annotations
 
 from pathlib import Path
 import json
+import os
 import shutil
+import subprocess
 
 from typer.testing import CliRunner
 
+from docgen import cli
 from docgen.cli import app
+from docgen.services.batch_service import BatchOptions, BatchReport
 
 
 FIXTURES = Path(__file__).parent / "fixtures"
@@ -46,3 +50,119 @@ def test_e2e_scan_build_idempotent(tmp_path: Path) -> None:
 
     second = readme_path.read_text(encoding="utf-8")
     assert first == second
+
+
+def test_e2e_build_all_reports_each_repo(tmp_path: Path) -> None:
+    multi = _copy_fixture(tmp_path, "repo_multi")
+    repos_file = tmp_path / "repos.txt"
+    repos_file.write_text(f"# nightly\n{multi}\nmissing-repo\n\n{multi}\n", encoding="utf-8")
+    report_path = tmp_path / "report.json"
+
+    result = runner.invoke(
+        app,
+        ["build-all", "--repos-file", str(repos_file), "--jobs", "2", "--report", str(report_path)],
+    )
+
+    assert result.exit_code == 7
+    assert (multi / "DocGen" / "README.md").exists()
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    assert (report["total"], report["succeeded"], report["failed"]) == (2, 1, 1)
+    ok, missing = report["repos"]
+    assert ok["repo"] == str(multi) and ok["ok"] and ok["files"] == 3
+    assert missing["repo"] == str(tmp_path / "missing-repo")
+    assert "Repository path not found" in missing["error"] and missing["exit_code"] == 2
+
+    repos_file.write_text(f"{multi}\n", encoding="utf-8")
+    again = runner.invoke(app, ["build-all", "--repos-file", str(repos_file)])
+    assert again.exit_code == 0
+    assert "up to date" in again.stdout
+
+
+def test_e2e_build_all_passes_doxygen_shards(tmp_path: Path, monkeypatch) -> None:
+    repos_file = tmp_path / "repos.txt"
+    repos_file.write_text(f"{_copy_fixture(tmp_path, 'repo_multi')}\n", encoding="utf-8")
+    seen: list[BatchOptions] = []
+    monkeypatch.setattr(cli, "build_all", lambda repos, options, **kwargs: seen.append(options) or BatchReport([], 0.0, 1))
+
+    result = runner.invoke(app, ["build-all", "--repos-file", str(repos_file), "--doxygen", "--doxygen-shards", "3"])
+
+    assert result.exit_code == 0
+    assert seen[0].doxygen and seen[0].doxygen_shards == 3
+    assert runner.invoke(app, ["build-all", "--repos-file", str(repos_file), "--doxygen-shards", "0"]).exit_code != 0
+
+
+def test_e2e_catalog_merges_built_repos_incrementally(tmp_path: Path) -> None:
+    multi = _copy_fixture(tmp_path, "repo_multi")
+    python_repo = _copy_fixture(tmp_path, "repo_python")
+    unbuilt = _copy_fixture(tmp_path, "repo_node")
+    for repo in (multi, python_repo):
+        assert runner.invoke(app, ["build", "--repo", str(repo)]).exit_code == 0
+    repos_file = tmp_path / "repos.txt"
+    repos_file.write_text(f"{multi}\n{python_repo}\n{unbuilt}\n", encoding="utf-8")
+    out = tmp_path / "catalog"
+
+    result = runner.invoke(app, ["catalog", "--repos-file", str(repos_file), "--out", str(out)])
+
+    assert result.exit_code == 0
+    assert "2 repos (3 read, 0 unchanged), 1 without generated docs" in result.stdout
+    page = (out / "catalog.md").read_text(encoding="utf-8")
+    assert "[repo_multi](../repo_multi/DocGen/README.md)" in page
+    assert f"- `{unbuilt}`" in page
+    index = json.loads((out / "catalog.json").read_text(encoding="utf-8"))
+    assert index["aggregates"]["repos"] == 2
+    assert {item["name"] for item in index["aggregates"]["stacks"]} >= {"python"}
+
+    (python_repo / "extra.py").write_text("x = 1\n", encoding="utf-8")
+    assert runner.invoke(app, ["build", "--repo", str(python_repo)]).exit_code == 0
+    again = runner.invoke(
+        app, ["catalog", "--repos-file", str(repos_file), "--out", str(out), "--format", "html", "--sort", "lines"]
+    )
+    assert "2 repos (2 read, 1 unchanged)" in again.stdout
+    assert '<a href="../repo_multi/DocGen/README.md">repo_multi</a>' in (out / "catalog.html").read_text(
+        encoding="utf-8"
+    )
+
+
+def test_e2e_build_revision_without_checkout(tmp_path: Path, monkeypatch) -> None:
+    repo_path = _copy_fixture(tmp_path, "repo_python")
+    for role in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{role}_NAME", "DocGen")
+        monkeypatch.setenv(f"GIT_{role}_EMAIL", "docgen@example.com")
+
+    def git(*args: str) -> str:
+        return subprocess.run(["git", "-C", str(repo_path), *args], check=True, capture_output=True, text=True).stdout
+
+    (repo_path / "src").mkdir()
+    (repo_path / "src" / "old.py").write_text("class Old:\n    pass\n", encoding="utf-8")
+    git("init", "-q")
+    git("add", "-A")
+    git("commit", "-q", "-m", "v1")
+    git("tag", "v1")
+    (repo_path / "src" / "old.py").unlink()
+    (repo_path / "src" / "new.py").write_text("class New:\n    pass\n", encoding="utf-8")
+    git("add", "-A")
+    git("commit", "-q", "-m", "v2")
+    (repo_path / "src" / "wip.py").write_text("x = 1\n", encoding="utf-8")
+    status = git("status", "--porcelain")
+    out = tmp_path / "docs-v1"
+
+    result = runner.invoke(app, ["build", "--repo", str(repo_path), "--rev", "v1", "--out", str(out)])
+
+    assert result.exit_code == 0
+    readme = (out / "README.md").read_text(encoding="utf-8")
+    assert f"`{repo_path.as_posix()}@v1 (" in readme
+    assert "src/old.py" in readme and "src/new.py" not in readme and "wip.py" not in readme
+    assert git("status", "--porcelain") == status
+    assert not (repo_path / "DocGen").exists()
+
+    again = runner.invoke(app, ["build", "--repo", str(repo_path), "--rev", "v1", "--out", str(out)])
+    assert again.exit_code == 0
+    assert "Up to date" in again.output
+    assert (out / "README.md").read_text(encoding="utf-8") == readme
+    # The temporary tree never reaches the user cache.
+    cache = Path(os.environ["DOCGEN_CACHE_DIR"])
+    assert not any((cache / "manifests").glob("*.json")) and not any((cache / "workspaces").glob("*.json"))
+
+    missing = runner.invoke(app, ["build", "--repo", str(repo_path), "--rev", "nope", "--out", str(out)])
+    assert missing.exit_code == 2
+    assert runner.invoke(app, ["build", "--repo", str(repo_path), "--rev", "v1"]).exit_code == 4
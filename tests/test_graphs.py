@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from docgen.utils.graphs import OTHERS_ID, build_order, cluster_graph
+
+
+def test_cluster_graph_collapses_directories_within_budget() -> None:
+    paths = [f"src/pkg{a}/mod{b}.py" for a in range(4) for b in range(5)]
+    edges = [("src/pkg0/mod0.py", "src/pkg1/mod0.py"), ("src/pkg0/mod1.py", "src/pkg1/mod2.py")]
+    edges.append(("src/pkg0/mod0.py", "src/pkg0/mod1.py"))
+
+    graph = cluster_graph(paths, edges, node_budget=10)
+
+    assert [node["label"] for node in graph.nodes] == [
+        f"src/pkg{a}/ (5 fichiers)" for a in range(4)
+    ]
+    assert graph.edges == [{"from": "dir_src_pkg0", "to": "dir_src_pkg1", "weight": 2}]
+    assert graph.clusters == ["src/pkg0", "src/pkg1", "src/pkg2", "src/pkg3"]
+
+    detail = cluster_graph(paths, edges, node_budget=10, root="src/pkg0")
+    assert len(detail.nodes) == 5
+    assert detail.edges == [{"from": "src_pkg0_mod0_py", "to": "src_pkg0_mod1_py", "weight": 1}]
+
+
+def test_cluster_graph_folds_wide_top_level_into_others() -> None:
+    paths = [f"dir{index}/a.py" for index in range(10)] + ["dir0/b.py"]
+
+    graph = cluster_graph(paths, [("dir0/a.py", "dir9/a.py")], node_budget=3)
+
+    assert len(graph.nodes) == 3
+    assert graph.nodes[-1] == {"id": OTHERS_ID, "label": "... (8 fichiers)", "files": 8}
+    assert graph.edges == [{"from": "dir_dir0", "to": OTHERS_ID, "weight": 1}]
+
+
+def test_build_order_levels_cycles_and_critical_path() -> None:
+    edges = [("app", "lib"), ("lib", "core"), ("cli", "core"), ("a", "b"), ("b", "a"), ("a", "core")]
+
+    order = build_order(["app", "lib", "core", "cli", "a", "b", "solo"], edges + [("app", "missing")])
+
+    assert order.order == ["core", "solo", "a", "b", "cli", "lib", "app"]
+    assert order.depth == {"core": 1, "solo": 1, "a": 2, "b": 2, "cli": 2, "lib": 2, "app": 3}
+    assert order.cycles == [["a", "b"]]
+    assert order.critical_path == ["app", "lib", "core"]
+
+    chain = [(f"n{index}", f"n{index + 1}") for index in range(5000)]
+    assert build_order([f"n{index}" for index in range(5001)], chain).depth["n0"] == 5001
+
+
+def test_build_order_cycle_above_a_dependency() -> None:
+    order = build_order(["A", "B", "C", "D"], [("A", "B"), ("B", "A"), ("B", "C"), ("D", "A")])
+
+    assert order.depth == {"C": 1, "A": 2, "B": 2, "D": 3}
+    assert order.cycles == [["A", "B"]]
+    assert order.critical_path == ["D", "A", "B", "C"]
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from docgen.utils.line_stats import count_lines, syntax_for_path
+
+
+def test_count_lines_python_comments_and_docstrings() -> None:
+    content = (
+        '"""Module doc.\n'
+        "\n"
+        'More doc."""\n'
+        "\n"
+        "# a comment\n"
+        "import os  # trailing comment counts as code\n"
+        "\n"
+        "def main():\n"
+        "    return os.name\n"
+    )
+
+    stats = count_lines(content, syntax_for_path("pkg/main.py"))
+
+    assert stats.comment == 4
+    assert stats.blank == 2
+    assert stats.code == 3
+    assert stats.total == len(content.splitlines())
+
+
+def test_count_lines_c_like_block_comments() -> None:
+    content = "/* header\n * more\n */\nint x = 1; // set\n\n// note\n/* one line */\n"
+
+    stats = count_lines(content, syntax_for_path("src/x.C"))
+
+    assert syntax_for_path("src/x.C").language == "C"
+    assert stats.comment == 5
+    assert stats.code == 1
+    assert stats.blank == 1
+
+
+def test_count_lines_pairs_string_delimiters_before_docstrings() -> None:
+    content = 'q = """\nSELECT\n"""\ndef f(): pass\nx=2\n"""doc"""\n'
+
+    stats = count_lines(content, syntax_for_path("q.py"))
+
+    assert (stats.code, stats.comment, stats.blank) == (5, 1, 0)
+
+
+def test_count_lines_splits_on_newlines_only() -> None:
+    stats = count_lines("x=1\x0c\ny=2\n", syntax_for_path("x.py"))
+
+    assert (stats.code, stats.comment, stats.blank) == (2, 0, 0)
+
+
+def test_count_lines_code_after_a_comment_and_markers_in_strings() -> None:
+    content = '/* a */\n  /* b */ y();\nurl = "http://x"; /* c\n */\n'
+
+    stats = count_lines(content, syntax_for_path("x.js"))
+
+    assert (stats.code, stats.comment, stats.blank) == (2, 2, 0)
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import pytest
+
+from docgen.errors import UsageError
+from docgen.rendering.markers import (
+    apply_all_sections,
+    find_marker_issues,
+    parse_document,
+    scan_markers,
+    validate_markers,
+)
+
+
+def _block(name: str, body: str) -> str:
+    return f"<!-- DOCGEN:START {name} -->\n{body}\n<!-- DOCGEN:END {name} -->"
+
+
+def test_parse_document_round_trips_text() -> None:
+    text = "# Title\n\n" + _block("a", "one") + "\nmanual\n" + _block("b", "two") + "\n"
+
+    document = parse_document(text)
+
+    assert [section.name for section in document.sections] == ["a", "b"]
+    assert document.render() == text
+
+
+def test_parse_document_keeps_unterminated_start_as_text() -> None:
+    text = "<!-- DOCGEN:START lost -->\n" + _block("a", "one") + "\n"
+
+    document = parse_document(text)
+
+    assert [section.name for section in document.sections] == ["a"]
+    assert document.render() == text
+
+
+def test_apply_all_sections_many_blocks_single_merge() -> None:
+    names = [f"s{i}" for i in range(40)]
+    existing = "# Doc\n\n" + "\n\nmanual\n\n".join(_block(name, "old") for name in names) + "\n"
+    rendered = "\n".join(
+        _block(name, "old" if i % 2 else "new") for i, name in enumerate(names)
+    ) + "\n" + _block("extra", "added") + "\n"
+
+    updated, report = apply_all_sections(existing, rendered, "architecture")
+
+    assert report.replaced == names[0::2]
+    assert report.unchanged == names[1::2]
+    assert report.added == ["extra"]
+    assert updated.count("manual") == len(names) - 1
+    assert updated.count("new") == len(names[0::2])
+    assert updated.rstrip().endswith(_block("extra", "added"))
+
+
+def test_apply_all_sections_returns_same_text_when_unchanged() -> None:
+    existing = "# Doc\n\n" + _block("a", "same") + "\n"
+
+    updated, report = apply_all_sections(existing, _block("a", "same"), "readme")
+
+    assert updated == existing
+    assert report.unchanged == ["a"]
+
+
+def test_validate_markers_reports_locations() -> None:
+    text = (
+        "# Doc\n"
+        "<!-- DOCGEN:START a -->\n"
+        "  <!-- DOCGEN:START b -->\n"
+        "<!-- DOCGEN:END a -->\n"
+        "<!-- DOCGEN:END b -->\n"
+        "<!-- DOCGEN:END c -->\n"
+    )
+
+    issues = find_marker_issues(scan_markers(text))
+
+    assert [(issue.line, issue.column) for issue in issues] == [(3, 3), (4, 1), (6, 1)]
+    assert "nested inside 'a'" in issues[0].message
+    assert "interleaves with 'b'" in issues[1].message
+    assert "no matching START" in issues[2].message
+
+    with pytest.raises(UsageError, match="line 3, column 3"):
+        validate_markers(text)
+
+
+def test_validate_markers_reports_duplicates_and_unclosed() -> None:
+    text = _block("a", "x") + "\n" + _block("a", "y") + "\n<!-- DOCGEN:START z -->\n"
+
+    messages = [str(issue) for issue in find_marker_issues(scan_markers(text))]
+
+    assert messages == [
+        "line 4, column 1: duplicate section 'a' (first started at line 1, column 1)",
+        "line 7, column 1: START for section 'z' is never closed",
+    ]
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterator
+
+from jinja2 import FileSystemBytecodeCache
+import pytest
+
+from docgen.rendering import (
+    create_environment,
+    get_environment,
+    render_template,
+    stream_template,
+    write_stream_atomic,
+)
+from docgen.utils.fingerprint import text_fingerprint
+
+
+def test_get_environment_is_shared() -> None:
+    assert get_environment() is get_environment()
+
+
+def test_create_environment_writes_bytecode_cache(_isolated_cache: Path) -> None:
+    env = create_environment()
+    assert isinstance(env.bytecode_cache, FileSystemBytecodeCache)
+
+    env.get_template("INDEX.md.j2")
+
+    assert list((_isolated_cache / "jinja").glob("__jinja2_*.cache"))
+
+
+def test_render_template_output_ends_with_newline() -> None:
+    content = render_template("INDEX.md.j2", {"project_name": "demo", "commands": {}})
+    assert content.startswith("# demo - Documentation")
+    assert content.endswith("\n")
+
+
+def test_stream_template_matches_render_template(tmp_path: Path) -> None:
+    context = {"project_name": "demo", "commands": {}}
+    target = tmp_path / "index.md"
+
+    written, digest = write_stream_atomic(target, stream_template("INDEX.md.j2", context))
+
+    content = render_template("INDEX.md.j2", context)
+    assert written
+    assert target.read_text(encoding="utf-8") == content
+    assert digest == text_fingerprint(content)
+    assert write_stream_atomic(target, stream_template("INDEX.md.j2", context)) == (False, digest)
+
+
+def test_write_stream_atomic_keeps_target_on_error(tmp_path: Path) -> None:
+    target = tmp_path / "out.md"
+    target.write_text("old\n", encoding="utf-8")
+
+    def chunks() -> Iterator[str]:
+        yield "partial"
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        write_stream_atomic(target, chunks())
+
+    assert target.read_text(encoding="utf-8") == "old\n"
+    assert [path.name for path in tmp_path.iterdir()] == ["out.md"]
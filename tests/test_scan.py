@@ -7,7 +7,9 @@ from typer.testing import CliRunner
 
 from docgen.cli import app
 from docgen.config import DocGenConfig
-from docgen.services.scan_service import scan_repo
+from docgen.services import scan_service
+from docgen.services.scan_service import package_graph, scan_repo
+from docgen.utils.manifest_store import ManifestStore, manifest_store
 
 
 FIXTURES = Path(__file__).parent / "fixtures"
@@ -102,3 +104,115 @@ def test_scan_cli_json_output_sorted() -> None:
     assert paths == sorted(paths)
     assert stack_names == sorted(stack_names)
     assert all("\\" not in path for path in paths)
+
+
+def test_scan_reads_the_detected_gemfile(tmp_path: Path) -> None:
+    repo_path = tmp_path / "repo"
+    (repo_path / "app").mkdir(parents=True)
+    (repo_path / "app" / "Gemfile").write_text('source "https://rubygems.org"\ngem "rspec-rails"\n', encoding="utf-8")
+
+    project = scan_repo(repo_path, DocGenConfig())
+
+    assert project.commands.test == "bundle exec rspec"
+
+
+def test_manifest_store_parses_each_manifest_once(tmp_path: Path) -> None:
+    repo_path = tmp_path / "repo"
+    repo_path.mkdir()
+    package_json = repo_path / "package.json"
+    package_json.write_text('{"scripts": {"test": "jest"}}', encoding="utf-8")
+
+    scan_repo(repo_path, DocGenConfig())
+    store = manifest_store(repo_path)
+    parsed = store.parsed
+    scan_repo(repo_path, DocGenConfig())
+    assert store.parsed == parsed
+
+    reloaded = ManifestStore(store._cache_file)
+    assert reloaded.json(package_json) == {"scripts": {"test": "jest"}}
+    assert reloaded.parsed == 0
+    package_json.write_text('{"scripts": {}}', encoding="utf-8")
+    assert reloaded.json(package_json) == {"scripts": {}}
+    assert reloaded.parsed == 1
+
+
+def test_scan_workspace_scans_each_package(tmp_path: Path, monkeypatch) -> None:
+    repo_path = tmp_path / "mono"
+    (repo_path / "packages" / "web" / "src").mkdir(parents=True)
+    (repo_path / "packages" / "api").mkdir(parents=True)
+    (repo_path / "crates" / "core").mkdir(parents=True)
+    (repo_path / "package.json").write_text('{"private": true, "workspaces": ["packages/*"]}', encoding="utf-8")
+    (repo_path / "pnpm-lock.yaml").write_text("", encoding="utf-8")
+    (repo_path / "packages" / "web" / "package.json").write_text(
+        '{"name": "@mono/web", "scripts": {"test": "vitest", "build": "vite build"}}', encoding="utf-8"
+    )
+    (repo_path / "packages" / "web" / "src" / "index.ts").write_text("export {}\n", encoding="utf-8")
+    (repo_path / "packages" / "api" / "pyproject.toml").write_text(
+        '[project]\nname = "mono-api"\ndependencies = ["pytest"]\n', encoding="utf-8"
+    )
+    (repo_path / "crates" / "core" / "Cargo.toml").write_text('[package]\nname = "core"\n', encoding="utf-8")
+    config = DocGenConfig(workspace=True)
+
+    project = scan_repo(repo_path, config)
+
+    packages = {package.path: package for package in project.packages}
+    assert list(packages) == ["crates/core", "packages/api", "packages/web"]
+    assert packages["packages/web"].name == "@mono/web"
+    assert packages["packages/web"].commands.test == "pnpm test"
+    assert packages["packages/web"].file_count == 2
+    assert packages["packages/api"].commands.test == "pytest"
+    assert [stack.name for stack in packages["crates/core"].stacks] == ["rust"]
+    assert not scan_repo(repo_path, DocGenConfig()).packages
+
+    scanned: list[str] = []
+    original = scan_service._scan_package
+
+    def spy(repo, root, *args):
+        scanned.append(root)
+        return original(repo, root, *args)
+
+    monkeypatch.setattr(scan_service, "_scan_package", spy)
+    (repo_path / "packages" / "api" / "README.md").write_text("# api\n", encoding="utf-8")
+    rescanned = scan_repo(repo_path, config).packages
+    assert scanned == ["packages/api"]
+    assert [package.file_count for package in rescanned] == [1, 2, 2]
+    assert rescanned[2] == packages["packages/web"]
+
+
+def test_package_graph_orders_workspace_packages(tmp_path: Path) -> None:
+    repo_path = tmp_path / "mono"
+    for directory in ("apps/web", "libs/ui", "libs/py-core", "libs/py-api", "crates/util", "crates/cli", "java/svc"):
+        (repo_path / directory).mkdir(parents=True)
+    (repo_path / "apps/web/package.json").write_text(
+        '{"name": "web", "dependencies": {"@mono/ui": "workspace:*", "react": "^18"}}', encoding="utf-8"
+    )
+    (repo_path / "libs/ui/package.json").write_text('{"name": "@mono/ui"}', encoding="utf-8")
+    (repo_path / "libs/py-core/pyproject.toml").write_text('[project]\nname = "py_core"\n', encoding="utf-8")
+    (repo_path / "libs/py-api/pyproject.toml").write_text(
+        '[tool.poetry]\nname = "py-api"\n[tool.poetry.dependencies]\npython = "^3.11"\n'
+        'core = { path = "../py-core", develop = true }\n',
+        encoding="utf-8",
+    )
+    (repo_path / "crates/util/Cargo.toml").write_text('[package]\nname = "util"\n', encoding="utf-8")
+    (repo_path / "crates/cli/Cargo.toml").write_text(
+        '[package]\nname = "cli"\n[dependencies]\nutil = { path = "../util" }\nserde = "1"\n', encoding="utf-8"
+    )
+    (repo_path / "java/svc/pom.xml").write_text(
+        '<project xmlns="http://maven.apache.org/POM/4.0.0"><artifactId>svc</artifactId>'
+        "<dependencies><dependency><artifactId>py-api</artifactId></dependency></dependencies></project>",
+        encoding="utf-8",
+    )
+
+    packages = scan_repo(repo_path, DocGenConfig(workspace=True)).packages
+    graph = package_graph(packages)
+
+    assert {(edge["from"], edge["to"]) for edge in graph["edges"]} == {
+        ("pkg_apps_web", "pkg_libs_ui"),
+        ("pkg_crates_cli", "pkg_crates_util"),
+        ("pkg_libs_py_api", "pkg_libs_py_core"),
+        ("pkg_java_svc", "pkg_libs_py_api"),
+    }
+    assert [item["name"] for item in graph["order"]] == ["util", "py_core", "@mono/ui", "web", "cli", "py-api", "svc"]
+    assert graph["depth"] == 3
+    assert graph["critical_path"] == ["py_core", "py-api", "svc"]
+    assert graph["cycles"] == []